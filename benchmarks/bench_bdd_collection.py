@@ -0,0 +1,36 @@
+# benchmarks/bench_bdd_collection.py
+# NOTE: Wall time of `pytest --collect-only` and of a full run, with the
+#       pytest-bdd cache plugin (plugins/bdd_cache.py) off and warm.
+#       Usage: python benchmarks/bench_bdd_collection.py [repeats] [pytest args...]
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(args, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "pytest", *args], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    repeats = int(argv[1]) if len(argv) > 1 else 3
+    extra = argv[2:]
+    print(f"repeats={repeats} (best of) args={extra}")
+    for label, args in (("collect", ["--collect-only", *extra]), ("run", extra)):
+        off = timed(["--no-bdd-cache", *args], repeats)
+        # One run to fill the cache, then timed warm runs
+        timed(args, 1)
+        warm = timed(args, repeats)
+        print(f"{label:8s} cache off {off:6.2f} s   cache warm {warm:6.2f} s   saved {off - warm:+.2f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
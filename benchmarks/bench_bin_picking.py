@@ -0,0 +1,65 @@
+# benchmarks/bench_bin_picking.py
+# NOTE: Picks/sec from a bin of many parts: RobotSim's spatial-hash object
+#       registry against scanning every part for the nearest one in reach.
+#       Usage: python benchmarks/bench_bin_picking.py [parts] [picks]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.robot_sim import RobotSim
+
+
+def scan_nearest(parts, point, reach):
+    best, best_d2 = None, reach * reach
+    px, py, pz = point
+    for key, (x, y, z) in parts.items():
+        d2 = (x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2
+        if d2 <= best_d2:
+            best, best_d2 = key, d2
+    return best
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100_000
+    picks = int(argv[2]) if len(argv) > 2 else 200
+    rng = np.random.default_rng(0)
+    positions = rng.uniform((0, 0, 0), (5, 5, 1), size=(count, 3)).tolist()
+    grips = rng.uniform((0, 0, 0), (5, 5, 1), size=(picks, 3)).tolist()
+
+    sim = RobotSim()
+    start = time.perf_counter()
+    sim.objects.add_many(positions)
+    load_time = time.perf_counter() - start
+
+    parts = dict(enumerate(map(tuple, positions)))
+    start = time.perf_counter()
+    expected = []
+    for grip in grips:
+        key = scan_nearest(parts, grip, sim.gripper_reach)
+        if key is not None:
+            del parts[key]
+        expected.append(key)
+    scan_rate = picks / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    picked = []
+    for grip in grips:
+        sim.set_position(*grip)
+        picked.append(sim.held_object if sim.pick_object() else None)
+        sim.held_object = None
+        sim.holding_object = False
+    registry_rate = picks / (time.perf_counter() - start)
+
+    assert picked == expected
+    print(f"parts={count} picks={picks} (registry load {load_time * 1e3:.0f} ms)")
+    print(f"scan every part : {scan_rate:12,.0f} picks/sec")
+    print(f"object registry : {registry_rate:12,.0f} picks/sec")
+    print(f"Speedup         : {registry_rate / scan_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,58 @@
+# benchmarks/bench_collision.py
+# NOTE: Compares the original 50-step interpolated arm sweep against the
+#       analytic, vectorized sweep_stop_point.
+#       Usage: python benchmarks/bench_collision.py [obstacles] [moves]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.collision import sweep_stop_point
+
+
+def interpolated_sweep(start, target, obstacles, step_count=50):
+    """The original robot_move_arm loop."""
+    arm = list(start)
+    for i in range(1, step_count + 1):
+        intermediate = [arm[j] + (target[j] - arm[j]) * i / step_count for j in range(3)]
+        collision = False
+        for obs in obstacles:
+            if all(abs(intermediate[j] - obs[j]) < 0.1 for j in range(3)):
+                collision = True
+                break
+        if collision:
+            break
+        arm = intermediate
+    return arm
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 10_000
+    moves = int(argv[2]) if len(argv) > 2 else 200
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 100, size=(count, 3))
+    obstacles = [tuple(p) for p in centers.tolist()]
+    starts = rng.uniform(0, 100, size=(moves, 3)).tolist()
+    targets = rng.uniform(0, 100, size=(moves, 3)).tolist()
+
+    start = time.perf_counter()
+    for s, t in zip(starts[:10], targets[:10]):
+        interpolated_sweep(s, t, obstacles)
+    loop = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    for s, t in zip(starts, targets):
+        sweep_stop_point(s, t, centers)
+    analytic = (time.perf_counter() - start) / moves
+
+    print(f"obstacles={count}")
+    print(f"50-step interpolation per move : {loop * 1e3:,.2f} ms")
+    print(f"sweep_stop_point per move      : {analytic * 1e3:,.3f} ms")
+    print(f"Speedup                        : {loop / analytic:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
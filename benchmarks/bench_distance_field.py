@@ -0,0 +1,56 @@
+# benchmarks/bench_distance_field.py
+# NOTE: DistanceField build time and memory, and clearance query cost
+#       against an exact ObstacleWorld.nearest() search.
+#       Usage: python benchmarks/bench_distance_field.py [obstacles] [resolution] [queries]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.collision import ARM_CLEARANCE
+from simulation.distance_field import DistanceField
+from simulation.obstacles import ObstacleWorld
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 20_000
+    resolution = float(argv[2]) if len(argv) > 2 else 0.1
+    queries = int(argv[3]) if len(argv) > 3 else 5_000
+    boundary = ((0, 0, 0), (5, 5, 5))
+    rng = np.random.default_rng(0)
+    world = ObstacleWorld(rng.uniform(0, 5, size=(count, 3)))
+    points = rng.uniform(0, 5, size=(queries, 3)).tolist()
+
+    print(f"obstacles={count} resolution={resolution} queries={queries}")
+    print(f"estimated memory     : {DistanceField.estimate_bytes(boundary, resolution) / 2**20:.1f} MiB")
+    field = DistanceField(boundary, resolution)
+    start = time.perf_counter()
+    field.sync(world)
+    print(f"build                : {(time.perf_counter() - start) * 1e3:.0f} ms, shape {field.shape}")
+
+    extra = rng.uniform(0, 5, size=(10, 3))
+    world.extend(extra)
+    start = time.perf_counter()
+    field.sync(world)
+    print(f"add 10 obstacles     : {(time.perf_counter() - start) * 1e3:.1f} ms (incremental)")
+
+    start = time.perf_counter()
+    exact = [world.nearest(p)[1] for p in points]
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bounds = [field.lower_bound(p) for p in points]
+    field_time = time.perf_counter() - start
+
+    decided = sum(b >= ARM_CLEARANCE for b in bounds)
+    assert all(b <= e + 1e-12 for b, e in zip(bounds, exact))
+    print(f"exact nearest()      : {exact_time / queries * 1e6:7.1f} us/query")
+    print(f"field lower_bound()  : {field_time / queries * 1e6:7.1f} us/query")
+    print(f"decided by the field : {decided / queries:.0%} of points proven clear of {ARM_CLEARANCE}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
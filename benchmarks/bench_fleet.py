@@ -0,0 +1,66 @@
+# benchmarks/bench_fleet.py
+# NOTE: Fleet ticks/sec for RobotFleet vs a Python loop over RobotSim instances.
+#       One tick = walk forward, pick, move the object, walk back.
+#       Usage: python benchmarks/bench_fleet.py [robots] [ticks]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.fleet import RobotFleet
+from simulation.robot_sim import RobotSim
+
+
+def tick_sims(sims, targets):
+    for sim, target in zip(sims, targets):
+        sim.move_forward(0.1)
+        sim.pick_object()
+        sim.move_object_to(*target)
+        sim.move_backward(0.1)
+
+
+def tick_fleet(fleet, targets):
+    fleet.move_forward(0.1)
+    fleet.pick_object()
+    fleet.move_object_to(targets)
+    fleet.move_backward(0.1)
+
+
+def main(argv):
+    robots = int(argv[1]) if len(argv) > 1 else 10_000
+    ticks = int(argv[2]) if len(argv) > 2 else 20
+    rng = np.random.default_rng(0)
+    targets = rng.uniform(0, 5, size=(robots, 3))
+    blocked = rng.random(robots) < 0.1
+
+    sims = [RobotSim() for _ in range(robots)]
+    for sim, is_blocked in zip(sims, blocked):
+        if is_blocked:
+            sim.block_gripper()
+    target_list = targets.tolist()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick_sims(sims, target_list)
+    loop_rate = ticks / (time.perf_counter() - start)
+
+    fleet = RobotFleet(robots)
+    fleet.block_gripper(blocked)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick_fleet(fleet, targets)
+    fleet_rate = ticks / (time.perf_counter() - start)
+
+    # Both simulations must agree before their speeds are worth comparing
+    assert np.allclose(fleet.positions, [sim.object_position for sim in sims])
+
+    print(f"robots={robots}")
+    print(f"loop over RobotSim : {loop_rate:,.1f} ticks/sec")
+    print(f"RobotFleet         : {fleet_rate:,.1f} ticks/sec")
+    print(f"Speedup            : {fleet_rate / loop_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
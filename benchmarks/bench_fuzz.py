@@ -0,0 +1,43 @@
+# benchmarks/bench_fuzz.py
+# NOTE: Throughput of the vectorized safety fuzzers (simulation/fuzz.py) by
+#       batch size, against the scalar per-case check the steps run.
+#       Usage: python benchmarks/bench_fuzz.py [cases] [obstacles]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.collision import sweep_stop_point
+from simulation.fuzz import fuzz_arm_stops, fuzz_boundary
+
+BOUNDARY = ((0, 0, 0), (5, 5, 5))
+
+
+def main(argv):
+    cases = int(argv[1]) if len(argv) > 1 else 100_000
+    obstacles = int(argv[2]) if len(argv) > 2 else 16
+    print(f"cases={cases} obstacles per case={obstacles}")
+
+    rng = np.random.default_rng(0)
+    scalar = min(cases, 2000)
+    starts, targets = rng.uniform(0, 5, size=(2, scalar, 3))
+    centers = rng.uniform(0, 5, size=(scalar, obstacles, 3))
+    start = time.perf_counter()
+    for s, t, c in zip(starts, targets, centers):
+        sweep_stop_point(s, t, c)
+    rate = scalar / (time.perf_counter() - start)
+    print(f"scalar sweep_stop_point     : {rate:12,.0f} cases/sec")
+
+    report = fuzz_boundary(BOUNDARY, cases)
+    print(f"boundary fuzz               : {report.cases_per_sec:12,.0f} cases/sec  ok={report.ok}")
+    for batch in (256, 2048, 8192):
+        report = fuzz_arm_stops(BOUNDARY, cases, batch=batch, obstacles=obstacles)
+        print(f"arm stop fuzz, batch {batch:5d}  : {report.cases_per_sec:12,.0f} cases/sec  "
+              f"ok={report.ok}  speedup {report.cases_per_sec / rate:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
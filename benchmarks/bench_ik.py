@@ -0,0 +1,49 @@
+# benchmarks/bench_ik.py
+# NOTE: IK solves/sec for a dense pick-and-place sweep: one target at a time,
+#       one cold batch, and a warm-started batch for the next sweep position.
+#       Usage: python benchmarks/bench_ik.py [grid_side]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.kinematics import ArmChain, IKSolver
+
+
+def sweep_targets(side, shift=0.0):
+    axes = (np.linspace(0.3, 0.7, side), np.linspace(-0.3, 0.3, side), np.linspace(0.1, 0.5, side))
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3) + shift
+
+
+def main(argv):
+    side = int(argv[1]) if len(argv) > 1 else 22
+    chain = ArmChain.default()
+    targets = sweep_targets(side)
+    count = len(targets)
+    print(f"targets={count}")
+
+    solver = IKSolver(chain)
+    sample = targets[:: max(1, count // 500)]
+    start = time.perf_counter()
+    for target in sample:
+        solver.solve(target, warm_start=False)
+    loop_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    cold = solver.solve(targets, warm_start=False)
+    cold_rate = count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    warm = solver.solve(sweep_targets(side, shift=0.005))
+    warm_rate = count / (time.perf_counter() - start)
+
+    print(f"one target per call : {loop_rate:10,.0f} solves/sec")
+    print(f"batch, cold start   : {cold_rate:10,.0f} solves/sec  {cold}")
+    print(f"batch, warm start   : {warm_rate:10,.0f} solves/sec  {warm}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
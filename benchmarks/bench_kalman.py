@@ -0,0 +1,89 @@
+# benchmarks/bench_kalman.py
+# NOTE: Compares scalar KalmanFilter.update against BatchKalmanFilter throughput
+#       times the 3D constant-velocity KalmanFilterND update loop and the
+#       offline replay of a long trace (per-sample update vs KalmanFilter.filter).
+#       Usage: python benchmarks/bench_kalman.py [channels] [samples]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.sensors import KalmanFilter, BatchKalmanFilter, KalmanFilterND
+
+
+def bench_scalar(block):
+    """Run one scalar filter per channel over the block, return samples/sec."""
+    samples, channels = block.shape
+    filters = [KalmanFilter() for _ in range(channels)]
+    rows = block.tolist()
+    start = time.perf_counter()
+    for row in rows:
+        for kf, measurement in zip(filters, row):
+            kf.update(measurement)
+    elapsed = time.perf_counter() - start
+    return samples * channels / elapsed
+
+
+def bench_batch(block):
+    """Run the vectorized batch filter over the block, return samples/sec."""
+    samples, channels = block.shape
+    kf = BatchKalmanFilter(channels)
+    start = time.perf_counter()
+    kf.update_block(block)
+    elapsed = time.perf_counter() - start
+    return samples * channels / elapsed
+
+
+def bench_nd_step(steps=20000, diagonal=True):
+    """Time one KalmanFilterND predict+correct at 1 kHz, return microseconds/step."""
+    kf = KalmanFilterND.constant_velocity(dims=3, dt=1e-3)
+    kf.diagonal_innovation = diagonal
+    measurement = np.array([1.0, 2.0, 3.0])
+    start = time.perf_counter()
+    for _ in range(steps):
+        kf.update(measurement)
+    elapsed = time.perf_counter() - start
+    return elapsed / steps * 1e6
+
+
+def bench_replay(trace):
+    """Replay a trace per-sample and in bulk, return (loop, bulk) samples/sec."""
+    kf = KalmanFilter()
+    values = trace.tolist()
+    start = time.perf_counter()
+    for measurement in values:
+        kf.update(measurement)
+    loop_rate = trace.size / (time.perf_counter() - start)
+
+    kf = KalmanFilter()
+    start = time.perf_counter()
+    kf.filter(trace)
+    bulk_rate = trace.size / (time.perf_counter() - start)
+    return loop_rate, bulk_rate
+
+
+def main(argv):
+    channels = int(argv[1]) if len(argv) > 1 else 1024
+    samples = int(argv[2]) if len(argv) > 2 else 1000
+    rng = np.random.default_rng(0)
+    block = rng.normal(0.0, 0.1, size=(samples, channels))
+
+    scalar_rate = bench_scalar(block)
+    batch_rate = bench_batch(block)
+    print(f"channels={channels} samples/channel={samples}")
+    print(f"KalmanFilter (scalar loop): {scalar_rate:,.0f} samples/sec")
+    print(f"BatchKalmanFilter         : {batch_rate:,.0f} samples/sec")
+    print(f"Speedup                   : {batch_rate / scalar_rate:.1f}x")
+    print(f"KalmanFilterND 3D CV step : {bench_nd_step():.2f} us (diagonal S)")
+    print(f"KalmanFilterND 3D CV step : {bench_nd_step(diagonal=False):.2f} us (full solve)")
+
+    loop_rate, bulk_rate = bench_replay(rng.normal(1.0, 0.1, size=1_000_000))
+    print(f"Replay, update() per sample: {loop_rate:,.0f} samples/sec")
+    print(f"Replay, KalmanFilter.filter: {bulk_rate:,.0f} samples/sec")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
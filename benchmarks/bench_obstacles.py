@@ -0,0 +1,63 @@
+# benchmarks/bench_obstacles.py
+# NOTE: Compares ObstacleWorld's sweep-and-prune queries against scanning the
+#       full obstacle list (nearest distance and arm sweep stop point).
+#       Usage: python benchmarks/bench_obstacles.py [obstacles] [queries]
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.collision import sweep_stop_point
+from simulation.obstacles import ObstacleWorld
+
+
+def timed(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100_000
+    queries = int(argv[2]) if len(argv) > 2 else 200
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 100, size=(count, 3))
+    obstacles = [tuple(p) for p in centers.tolist()]
+
+    start = time.perf_counter()
+    world = ObstacleWorld()
+    for point in obstacles[:10_000]:
+        world.append(point)
+    # The first query pays for indexing the appended obstacles
+    world.nearest(obstacles[0])
+    append_cost = (time.perf_counter() - start) / 10_000
+    world.extend(centers[10_000:])
+
+    points = [(tuple(p),) for p in rng.uniform(0, 100, size=(queries, 3)).tolist()]
+    # Short arm moves, as in a real reach
+    starts = rng.uniform(0, 100, size=(queries, 3))
+    moves = [(tuple(s), tuple(s + d)) for s, d in zip(starts.tolist(), rng.uniform(-1, 1, size=(queries, 3)).tolist())]
+
+    def linear_nearest(p):
+        return min(math.sqrt(sum((a - o) ** 2 for a, o in zip(p, obs))) for obs in obstacles)
+
+    linear_near = timed(linear_nearest, points[:10])
+    world_near = timed(world.nearest, points)
+    full_sweep = timed(lambda s, e: sweep_stop_point(s, e, centers), moves)
+    world_sweep = timed(world.stop_point, moves)
+
+    print(f"obstacles={count}")
+    print(f"ObstacleWorld.append + indexing : {append_cost * 1e6:,.1f} us")
+    print(f"nearest, math.sqrt scan         : {linear_near * 1e3:,.2f} ms")
+    print(f"nearest, ObstacleWorld          : {world_near * 1e3:,.3f} ms")
+    print(f"arm sweep, all obstacles        : {full_sweep * 1e3:,.3f} ms")
+    print(f"arm sweep, ObstacleWorld        : {world_sweep * 1e3:,.3f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
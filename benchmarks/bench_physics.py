@@ -0,0 +1,44 @@
+# benchmarks/bench_physics.py
+# NOTE: Physics scenario setup (fresh world vs. the reused per-process world)
+#       and batched headless stepping, for every installed backend.
+#       Usage: python benchmarks/bench_physics.py [bodies] [ticks]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.physics import BulletWorld, NumpyWorld, available_backends, box, physics_world
+
+
+def main(argv):
+    bodies = int(argv[1]) if len(argv) > 1 else 50
+    ticks = int(argv[2]) if len(argv) > 2 else 480
+    rng = np.random.default_rng(0)
+    drops = rng.uniform((0, 0, 0.2), (5, 5, 2), size=(bodies, 3)).tolist()
+    part = box((0.05, 0.05, 0.05), mass=0.2)
+
+    print(f"bodies={bodies} ticks={ticks} backends={available_backends()}")
+    for backend in available_backends():
+        start = time.perf_counter()
+        world = BulletWorld() if backend == "pybullet" else NumpyWorld()
+        fresh = time.perf_counter() - start
+        physics_world(backend)
+        start = time.perf_counter()
+        world = physics_world(backend)
+        reused = time.perf_counter() - start
+        for position in drops:
+            world.add_body(part, position)
+
+        start = time.perf_counter()
+        world.step(ticks)
+        elapsed = time.perf_counter() - start
+        resting = np.mean(np.abs(np.asarray(world.positions)[:, 2] - 0.05) < 0.01)
+        print(f"{backend:9s} fresh world {fresh * 1e3:8.2f} ms   reused world {reused * 1e3:6.3f} ms   "
+              f"{ticks / elapsed:9,.0f} ticks/s   {resting:.0%} of parts on the table")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
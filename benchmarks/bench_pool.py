@@ -0,0 +1,49 @@
+# benchmarks/bench_pool.py
+# NOTE: Per-example sim setup: building a prepared world from scratch
+#       against leasing it from a SimPool.
+#       Usage: python benchmarks/bench_pool.py [obstacles] [examples]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.pool import SimPool
+from simulation.robot_sim import RobotSim
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 50_000
+    examples = int(argv[2]) if len(argv) > 2 else 200
+    points = np.random.default_rng(0).uniform(0, 5, size=(count, 3))
+
+    def setup(sim):
+        sim.boundary = ((0, 0, 0), (5, 5, 5))
+        sim.obstacles.extend(points)
+        sim.precompute_distance_field(0.1)
+
+    print(f"obstacles={count} examples={examples}")
+    start = time.perf_counter()
+    for _ in range(min(examples, 5)):
+        setup(RobotSim())
+    fresh = (time.perf_counter() - start) / min(examples, 5)
+    print(f"fresh setup per example : {fresh * 1e3:9.2f} ms")
+
+    start = time.perf_counter()
+    pool = SimPool(setup)
+    print(f"pool creation           : {(time.perf_counter() - start) * 1e3:9.2f} ms")
+    start = time.perf_counter()
+    for i in range(examples):
+        with pool.lease() as sim:
+            # Dirty the world the way a scenario would
+            sim.obstacles.append((i % 5, 1.0, 1.0))
+            sim.set_position(1.0, 2.0, 3.0)
+    leased = (time.perf_counter() - start) / examples
+    print(f"lease + reset + dirty   : {leased * 1e3:9.3f} ms")
+    print(f"{pool!r}  speedup {fresh / leased:,.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,52 @@
+# benchmarks/bench_robot_sim.py
+# NOTE: Reports RobotSim per-instance memory (as built by the conftest fixture)
+#       and the cost of its hot attribute accesses and motions.
+#       Usage: python benchmarks/bench_robot_sim.py [instances]
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.robot_sim import RobotSim
+
+
+def make_sim():
+    """Same setup as the conftest sim fixture."""
+    robot = RobotSim()
+    robot.boundary = ((0, 0, 0), (5, 5, 5))
+    robot.object_position = (0, 0, 0)
+    robot.arm_position = (0, 0, 0)
+    robot.obstacles = []
+    return robot
+
+
+def bytes_per_instance(count):
+    make_sim()  # warm up imports and caches
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sims = [make_sim() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del sims
+    return total / count
+
+
+def ns_per_call(fn, number=200_000):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 10_000
+    sim = make_sim()
+    print(f"RobotSim bytes/instance  : {bytes_per_instance(count):,.0f}")
+    print(f"construct (fixture setup): {ns_per_call(make_sim, 20_000) / 1e3:,.2f} us")
+    print(f"move_forward             : {ns_per_call(lambda: sim.move_forward(1.0)):,.0f} ns")
+    print(f"read holding_object      : {ns_per_call(lambda: sim.holding_object):,.0f} ns")
+    print(f"read object_position     : {ns_per_call(lambda: sim.object_position):,.0f} ns")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,48 @@
+# benchmarks/bench_sensor.py
+# NOTE: Compares Sensor.read per call (global random / pre-drawn buffer) against
+#       the vectorized Sensor.read_many.
+#       Usage: python benchmarks/bench_sensor.py [samples]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.sensors import Sensor
+
+
+def bench_read(sensor, values):
+    """Call Sensor.read once per value, return readings/sec."""
+    read = sensor.read
+    start = time.perf_counter()
+    for value in values:
+        read(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def bench_read_many(sensor, values):
+    """Call Sensor.read_many once over the whole array, return readings/sec."""
+    start = time.perf_counter()
+    sensor.read_many(values)
+    return values.size / (time.perf_counter() - start)
+
+
+def main(argv):
+    samples = int(argv[1]) if len(argv) > 1 else 1_000_000
+    values = np.linspace(0.0, 10.0, samples)
+    as_list = values.tolist()
+
+    per_call = bench_read(Sensor(noise=0.1), as_list)
+    buffered = bench_read(Sensor(noise=0.1, seed=0, buffer_size=65536), as_list)
+    batched = bench_read_many(Sensor(noise=0.1, seed=0), values)
+    print(f"samples={samples}")
+    print(f"Sensor.read (random.gauss) : {per_call:,.0f} readings/sec")
+    print(f"Sensor.read (noise buffer) : {buffered:,.0f} readings/sec")
+    print(f"Sensor.read_many           : {batched:,.0f} readings/sec")
+    print(f"read_many speedup          : {batched / per_call:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,38 @@
+# benchmarks/bench_sim_loop.py
+# NOTE: Achieved ticks/sec and sim-time/wall-time ratio of SimLoop, headless
+#       and real-time paced, for one RobotSim and for a RobotFleet.
+#       Usage: python benchmarks/bench_sim_loop.py [seconds] [robots]
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.fleet import RobotFleet
+from simulation.robot_sim import RobotSim
+from simulation.sim_loop import SimLoop
+
+
+def main(argv):
+    seconds = float(argv[1]) if len(argv) > 1 else 2.0
+    robots = int(argv[2]) if len(argv) > 2 else 10_000
+
+    sim = RobotSim()
+    headless = SimLoop(sim).move((0.0, 1.0, 0.0), seconds)
+    assert abs(sim.object_position[1] - seconds) < 1e-6
+
+    paced = SimLoop(RobotSim(), tick_rate=200.0, realtime=True).move((0.0, 1.0, 0.0), min(seconds, 0.5))
+
+    fleet = RobotFleet(robots)
+    fleet.set_velocity((0.0, 1.0, 0.0))
+    fleet_stats = SimLoop(fleet).run(min(seconds, 0.5))
+
+    print(f"RobotSim headless @1 kHz   : {headless.ticks_per_sec:,.0f} ticks/sec, "
+          f"{headless.realtime_factor:,.1f}x real time")
+    print(f"RobotSim realtime @200 Hz  : {paced.ticks_per_sec:,.0f} ticks/sec, "
+          f"{paced.realtime_factor:.2f}x real time")
+    print(f"RobotFleet({robots}) headless: {fleet_stats.ticks_per_sec:,.0f} ticks/sec, "
+          f"{fleet_stats.ticks_per_sec * robots:,.0f} robot-ticks/sec")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,60 @@
+# benchmarks/bench_snapshot.py
+# NOTE: Cost of forking a prepared RobotSim (snapshot + restore, copy-on-write)
+#       against rebuilding the same setup for every example.
+#       Usage: python benchmarks/bench_snapshot.py [obstacles] [forks]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.robot_sim import RobotSim
+
+BOUNDARY = ((0, 0, 0), (5, 5, 5))
+
+
+def build(points):
+    sim = RobotSim()
+    sim.boundary = BOUNDARY
+    sim.obstacles.extend(points)
+    sim.precompute_distance_field(0.1)
+    sim.attach_arm()
+    for position in points[:200]:
+        sim.place_object(position)
+    return sim
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100_000
+    forks = int(argv[2]) if len(argv) > 2 else 1_000
+    points = np.random.default_rng(0).uniform(0, 5, size=(count, 3))
+
+    print(f"obstacles={count} forks={forks}")
+    start = time.perf_counter()
+    base = build(points)
+    setup = time.perf_counter() - start
+    print(f"build setup          : {setup * 1e3:9.1f} ms")
+
+    start = time.perf_counter()
+    snapshot = base.snapshot()
+    print(f"snapshot()           : {(time.perf_counter() - start) * 1e6:9.1f} us  {snapshot!r}")
+
+    start = time.perf_counter()
+    for _ in range(forks):
+        sim = RobotSim.from_snapshot(snapshot)
+    fork_time = (time.perf_counter() - start) / forks
+    print(f"fork from snapshot   : {fork_time * 1e6:9.1f} us/fork")
+
+    # A fork pays for its private copy only when it first writes
+    start = time.perf_counter()
+    sim.obstacles.append((2.5, 2.5, 2.5))
+    sim.place_object((1.0, 1.0, 1.0))
+    print(f"first write in fork  : {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    assert snapshot.obstacle_count == count and len(sim.obstacles) == count + 1
+    print(f"speedup vs rebuild   : {setup / fork_time:9.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,58 @@
+# benchmarks/bench_spatial.py
+# NOTE: Compares the linear sensor_scan range check against SpatialHash.query_radius.
+#       Usage: python benchmarks/bench_spatial.py [objects] [range]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.spatial import SpatialHash
+
+
+def linear_scan(objects, center, radius):
+    """The original O(N) check with a square root per object."""
+    found = []
+    for obj in objects:
+        dx = obj[0] - center[0]
+        dy = obj[1] - center[1]
+        dz = obj[2] - center[2]
+        if (dx**2 + dy**2 + dz**2) ** 0.5 <= radius:
+            found.append(obj)
+    return found
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 50_000
+    radius = float(argv[2]) if len(argv) > 2 else 2.0
+    rng = np.random.default_rng(0)
+    objects = [tuple(p) for p in rng.uniform(-50, 50, size=(count, 3)).tolist()]
+    centers = [tuple(p) for p in rng.uniform(-50, 50, size=(200, 3)).tolist()]
+
+    start = time.perf_counter()
+    index = SpatialHash(cell_size=radius)
+    for i, obj in enumerate(objects):
+        index.insert(i, obj)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for center in centers:
+        linear_scan(objects, center, radius)
+    linear = (time.perf_counter() - start) / len(centers)
+
+    start = time.perf_counter()
+    for center in centers:
+        index.query_radius(center, radius)
+    indexed = (time.perf_counter() - start) / len(centers)
+
+    print(f"objects={count} range={radius}")
+    print(f"SpatialHash build        : {build * 1e3:.1f} ms")
+    print(f"linear scan per tick     : {linear * 1e6:,.1f} us")
+    print(f"SpatialHash query / tick : {indexed * 1e6:,.1f} us")
+    print(f"Speedup                  : {linear / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
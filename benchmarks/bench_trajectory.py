@@ -0,0 +1,45 @@
+# benchmarks/bench_trajectory.py
+# NOTE: Cost of a long scripted route applied move by move vs one
+#       RobotSim.execute_trajectory() call.
+#       Usage: python benchmarks/bench_trajectory.py [moves]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import trajectory
+from simulation.robot_sim import RobotSim
+
+
+def main(argv):
+    moves = int(argv[1]) if len(argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    deltas = rng.uniform(-0.01, 0.01, size=(moves, 3))
+    deltas[: moves // 2] = trajectory.circle(1.0, segments=moves // 2)
+
+    sim = RobotSim()
+    rows = deltas.tolist()
+    start = time.perf_counter()
+    for dx, dy, dz in rows:
+        x, y, z = sim.object_position
+        sim.set_position(x + dx, y + dy, z + dz)
+    loop_time = time.perf_counter() - start
+
+    batched = RobotSim()
+    start = time.perf_counter()
+    history = batched.execute_trajectory(deltas)
+    batch_time = time.perf_counter() - start
+
+    assert np.allclose(history[-1], sim.object_position)
+
+    print(f"moves={moves}")
+    print(f"one call per move     : {loop_time * 1e3:8.2f} ms")
+    print(f"execute_trajectory()  : {batch_time * 1e3:8.2f} ms (full pose history)")
+    print(f"Speedup               : {loop_time / batch_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,340 @@
+# benchmarks/suite.py
+# NOTE: Regression-gated benchmarks of the simulation and step hot paths,
+#       down to whole scenarios. Each case is timed with timeit (best of
+#       --repeat runs of at least --min-time seconds each), the results are
+#       written as JSON and compared with a saved baseline, and a case slower
+#       than its baseline by more than --threshold fails the run (exit 1), as
+#       does a missing baseline (unless --allow-missing-baseline) or a
+#       selected baseline case the run no longer measures.
+#       Baselines are machine-specific: save one on the machine that gates,
+#       e.g. the nightly runner, with --save-baseline.
+#       Usage: python benchmarks/suite.py [-k SUBSTRING] [--threshold 0.25] [--save-baseline]
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from simulation.fuzz import fuzz_arm_stops, fuzz_boundary
+from simulation.robot_sim import RobotSim
+from simulation.sensors import KalmanFilter, KalmanFilterND, Sensor
+from simulation.spatial import SpatialHash
+
+# Cases by name; each factory takes the collected pytest session, does its
+# setup and returns the zero-argument callable to time
+CASES = {}
+
+# Scenarios timed end to end (fixtures, every step, teardown): first example of each
+SCENARIOS = ("req_nav_01", "req_nav_07", "req_pap_01", "req_pap_07", "req_saf_03", "req_saf_05",
+             "req_sen_01", "req_sen_09", "req_wal_01", "req_wal_05")
+
+
+def case(name):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+def make_sim():
+    """Same setup as the conftest baseline."""
+    robot = RobotSim()
+    robot.boundary = ((0, 0, 0), (5, 5, 5))
+    robot.object_position = (0, 0, 0)
+    robot.arm_position = (0, 0, 0)
+    robot.obstacles = []
+    return robot
+
+
+# -------------------------
+# Simulation
+# -------------------------
+@case("sensors.KalmanFilter.update")
+def kalman_update(session):
+    kf = KalmanFilter()
+    return lambda: kf.update(0.5)
+
+
+@case("sensors.KalmanFilterND.update")
+def kalman_nd_update(session):
+    kf = KalmanFilterND.constant_velocity(dims=3, dt=1e-3)
+    measurement = np.array([1.0, 2.0, 3.0])
+    return lambda: kf.update(measurement)
+
+
+@case("sensors.Sensor.read")
+def sensor_read(session):
+    sensor = Sensor(noise=0.01, seed=0)
+    return lambda: sensor.read(1.0)
+
+
+@case("sensors.Sensor.read buffered")
+def sensor_read_buffered(session):
+    sensor = Sensor(noise=0.01, seed=0, buffer_size=4096)
+    return lambda: sensor.read(1.0)
+
+
+@case("robot_sim.move_forward")
+def sim_move_forward(session):
+    sim = make_sim()
+    return lambda: sim.move_forward(1.0)
+
+
+@case("robot_sim.set_position")
+def sim_set_position(session):
+    sim = make_sim()
+    return lambda: sim.set_position(1.0, 2.0, 3.0)
+
+
+@case("robot_sim.step")
+def sim_step(session):
+    sim = make_sim()
+    sim.set_velocity(0.1, 0.0, 0.0)
+    return sim.step
+
+
+@case("robot_sim.pick_and_move")
+def sim_pick_and_move(session):
+    sim = make_sim()
+    sim.place_object((0.0, 0.0, 0.0))
+
+    def pick_and_move():
+        sim.pick_object()
+        sim.move_object_to(1.0, 1.0, 1.0)
+        sim.move_object_to(0.0, 0.0, 0.0)
+        sim.release_object()
+    return pick_and_move
+
+
+@case("fuzz.fuzz_boundary 4096 cases")
+def fuzz_boundary_batch(session):
+    return lambda: fuzz_boundary(make_sim().boundary, 4096, seed=1)
+
+
+@case("fuzz.fuzz_arm_stops 2048 cases")
+def fuzz_arm_stops_batch(session):
+    return lambda: fuzz_arm_stops(make_sim().boundary, 2048, seed=1)
+
+
+@case("robot_sim.enable_physics")
+def sim_enable_physics(session):
+    # Scenario setup in the reused per-process world, as the physics steps do it
+    sim = make_sim()
+    return lambda: sim.enable_physics("auto")
+
+
+# -------------------------
+# Step functions (importable once pytest-bdd has a config)
+# -------------------------
+@case("steps.robot_move_arm 2000 obstacles")
+def step_move_arm(session):
+    from steps.safety_steps import _scatter, robot_move_arm
+    sim = make_sim()
+    _scatter(sim.obstacles, sim.boundary, 2000, seed=0)
+
+    def move_arm():
+        sim.arm_position = (0, 0, 0)
+        robot_move_arm(sim, 5, 5, 5)
+    return move_arm
+
+
+@case("steps.sensor_scan 1000 objects")
+def step_sensor_scan(session):
+    from steps.sensor_steps import sensor_scan
+    sim = make_sim()
+    sim.sensor_position = (2.5, 2.5, 2.5)
+    sim.sensor_range = 1.0
+    sim.objects_in_environment = np.random.default_rng(0).uniform(0, 5, size=(1000, 3)).tolist()
+    sim.object_index = SpatialHash(cell_size=1.0)
+    for i, point in enumerate(sim.objects_in_environment):
+        sim.object_index.insert(i, point)
+    return lambda: sensor_scan(sim)
+
+
+# -------------------------
+# Whole scenarios
+# -------------------------
+# Failing reports of the scenarios run, fed by BenchmarkPlugin.pytest_runtest_logreport
+FAILED_REPORTS = []
+
+
+def scenario(prefix, session):
+    item = next((i for i in session.items if i.name.startswith(prefix)), None)
+    if item is None:
+        raise LookupError(f"no collected scenario starts with {prefix}")
+    # Another scenario of the same module as nextitem tears the item down after
+    # each run but keeps module and session fixtures (the sim pool) up, as in a
+    # real run. A module with a single scenario rebuilds them every run.
+    sibling = next((i for i in session.items if i.parent is item.parent and i is not item), None)
+    hook = item.ihook.pytest_runtest_protocol
+
+    def run():
+        hook(item=item, nextitem=sibling)
+
+    del FAILED_REPORTS[:]
+    run()
+    if FAILED_REPORTS:
+        raise AssertionError(f"{item.nodeid} fails, not timing it:\n{FAILED_REPORTS[0].longreprtext}")
+    # One last run with no next item tears everything down before the next case
+    run.teardown = lambda: hook(item=item, nextitem=None)
+    return run
+
+
+for _name in SCENARIOS:
+    CASES[f"scenario.{_name}"] = functools.partial(scenario, f"test_{_name}_")
+
+
+# -------------------------
+# Timing, baseline comparison
+# -------------------------
+def measure(fn, repeat, min_time):
+    """Seconds per call of fn: best and median of repeat runs of at least min_time each."""
+    fn()  # warm caches and lazy imports
+    number = 1
+    while True:
+        elapsed = timeit.timeit(fn, number=number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed else number * 10
+    times = [elapsed] + timeit.repeat(fn, number=number, repeat=repeat - 1)
+    return {"seconds": min(times) / number, "median": statistics.median(times) / number,
+            "number": number, "repeat": repeat}
+
+
+def machine():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+            "numpy": np.__version__, "cpus": os.cpu_count()}
+
+
+def compare(results, baseline, threshold, selected=None):
+    """(name, baseline s, current s, ratio, verdict) for each current result.
+
+    Baseline cases that ``selected(name)`` accepts (all of them by default)
+    but that have no current result come last, as "MISSING".
+    """
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, result["seconds"], None, "new"))
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        verdict = ("REGRESSED" if ratio > 1 + threshold
+                   else "improved" if ratio < 1 / (1 + threshold) else "ok")
+        rows.append((name, before["seconds"], result["seconds"], ratio, verdict))
+    for name, before in baseline.items():
+        if name not in results and (selected is None or selected(name)):
+            rows.append((name, before["seconds"], None, None, "MISSING"))
+    return rows
+
+
+def _fmt_time(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+class BenchmarkPlugin:
+    """Runs the selected cases once pytest has collected (and so imported) the step modules."""
+    def __init__(self, names, repeat, min_time):
+        self.names = names
+        self.repeat = repeat
+        self.min_time = min_time
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            FAILED_REPORTS.append(report)
+
+    def pytest_collection_finish(self, session):
+        for name in self.names:
+            fn = CASES[name](session)
+            result = measure(fn, self.repeat, self.min_time)
+            if hasattr(fn, "teardown"):
+                fn.teardown()
+            self.results[name] = result
+            print(f"{name:45s} {_fmt_time(result['seconds']):>10s}/call  (x{result['number']})", flush=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and gate on regressions.")
+    parser.add_argument("-k", dest="match", action="append", default=[],
+                        help="Only run cases whose name contains this (repeatable)")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Seconds per timed run")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "benchmarks", "baseline.json"))
+    parser.add_argument("--threshold", type=float, default=float(os.environ.get("BENCH_THRESHOLD", 0.25)),
+                        help="Allowed slowdown over the baseline as a fraction (default 0.25, env BENCH_THRESHOLD)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the new baseline instead of comparing")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="Pass when there is no baseline to compare with (default: fail)")
+    args = parser.parse_args(argv[1:])
+
+    def selected(name):
+        return not args.match or any(m in name for m in args.match)
+
+    names = [name for name in CASES if selected(name)]
+    if args.list or not names:
+        print("\n".join(names) or "no cases match")
+        return 0
+
+    plugin = BenchmarkPlugin(names, args.repeat, args.min_time)
+    status = pytest.main(["--collect-only", "-s", "-p", "no:terminal", "-o", "addopts=", "-o", "log_cli=false",
+                          "--rootdir", ROOT, "-c", os.path.join(ROOT, "pytest.ini"),
+                          os.path.join(ROOT, "steps")], plugins=[plugin])
+    if status != 0 or len(plugin.results) != len(names):
+        print(f"benchmark run failed (pytest exit status {int(status)})")
+        return int(status) or 1
+
+    report = {"created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+              "machine": machine(), "results": plugin.results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; save one with --save-baseline")
+        return 0 if args.allow_missing_baseline else 1
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != report["machine"]:
+        print(f"warning: baseline was recorded on another machine: {baseline.get('machine')}")
+
+    rows = compare(plugin.results, baseline.get("results", {}), args.threshold, selected)
+    print(f"\n{'case':45s} {'baseline':>10s} {'now':>10s} {'ratio':>7s}  (threshold +{args.threshold:.0%})")
+    for name, before, now, ratio, verdict in rows:
+        shown = f"{ratio:6.2f}x" if ratio is not None else "      -"
+        print(f"{name:45s} {_fmt_time(before):>10s} {_fmt_time(now):>10s} {shown}  {verdict}")
+    regressed = [row[0] for row in rows if row[4] == "REGRESSED"]
+    missing = [row[0] for row in rows if row[4] == "MISSING"]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+    if missing:
+        print(f"\n{len(missing)} baseline case(s) not measured by this run: {', '.join(missing)}")
+    return 1 if regressed or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -9,21 +9,38 @@ import pytest
 # -------------------------
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from simulation.robot_sim import RobotSim
+from simulation.pool import SharedCells, SimPool
+
+# Cached feature parsing and indexed step matching for pytest-bdd; generated stress suites;
+# per-step timings for Allure and --step-timings
+pytest_plugins = ["plugins.bdd_cache", "plugins.scenario_generator", "plugins.step_timing"]
 
 # -------------------------
 # Pytest Fixtures
 # -------------------------
-@pytest.fixture
-def sim():
-    """Fixture to create a RobotSim instance."""
-    robot = RobotSim()
+def _baseline(robot):
+    """State every scenario starts from."""
     # Boundaries ((min_x, min_y, min_z), (max_x, max_y, max_z))
     robot.boundary = ((0, 0, 0), (5, 5, 5))
     robot.object_position = (0, 0, 0)
     robot.arm_position = (0, 0, 0)
     robot.obstacles = []
-    return robot
+
+@pytest.fixture(scope="session")
+def sim_pool():
+    """Pool of pre-initialized RobotSims, one per test process (so one per xdist worker)."""
+    return SimPool(setup=_baseline, name=os.environ.get("PYTEST_XDIST_WORKER", "main"))
+
+@pytest.fixture
+def sim(sim_pool):
+    """A RobotSim leased from the pool, reset to the baseline and returned after the test."""
+    with sim_pool.lease() as robot:
+        yield robot
+
+@pytest.fixture(scope="session")
+def shared_cells():
+    """Snapshots of expensive cell setups, built once per test process and forked per example."""
+    return SharedCells()
 
 # -------------------------
 # Register Custom Markers
@@ -70,3 +70,96 @@ Feature: Robot Navigation
       | direction         |
       | clockwise         |
       | counter-clockwise |
+
+  @arc
+  Scenario Outline: <REQ_NAV_06> Robot follows a sampled arc trajectory
+    Given the robot is at position [<start_x>, <start_y>, <start_z>]
+    When the robot moves along a <direction> arc of radius <radius> through <degrees> degrees
+    Then the robot should be at position [<end_x>, <end_y>, <end_z>]
+    And every recorded pose should lie <radius> units from the arc centre
+
+    Examples:
+      | start_x | start_y | start_z | direction         | radius | degrees | end_x | end_y | end_z |
+      | 0       | 0       | 0       | counter-clockwise | 1      | 90      | -1    | 1     | 0     |
+      | 0       | 0       | 0       | clockwise         | 2      | 90      | 2     | 2     | 0     |
+      | 1       | 1       | 1       | counter-clockwise | 1      | 180     | -1    | 1     | 1     |
+
+  @planning
+  Scenario Outline: <REQ_NAV_07> Robot plans a path around a wall to reach a goal
+    Given the robot is at position [0, 0, 0]
+    And the workspace is bounded by [0, 0, 0] and [4, 4, <max_z>]
+    And a wall of obstacles at x = 2 spanning y 0 to 3 and z 0 to <wall_top>
+    When the robot navigates to [4, 0, 0] using <method>
+    Then the robot should be at position [4, 0, 0]
+    And the planned path should avoid all obstacles
+    And the planned path should cost <cost> units
+
+    Examples:
+      | max_z | wall_top | method | cost   |
+      | 0     | 0        | astar  | 10.828 |
+      | 0     | 0        | jps    | 10.828 |
+      | 2     | 2        | auto   | 10.828 |
+      | 2     | 1        | auto   | 6.828  |
+
+  @planning
+  Scenario Outline: <REQ_NAV_09> Robot plans around obstacles that lie between lattice nodes
+    Given the robot is at position [0, 0, 0]
+    And the workspace is bounded by [0, 0, 0] and [4, 4, 0]
+    And an obstacle at [<x1>, <y1>, 0]
+    And an obstacle at [<x2>, <y2>, 0]
+    When the robot navigates to [4, 4, 0] using <method>
+    Then the robot should be at position [4, 4, 0]
+    And the planned path should avoid all obstacles
+    And the planned path should cost <cost> units
+
+    Examples:
+      | x1  | y1  | x2  | y2  | method | cost  |
+      | 1.5 | 1.5 | 2.5 | 2.5 | astar  | 7.414 |
+      | 1.5 | 1.5 | 2.5 | 2.5 | jps    | 7.414 |
+      | 2   | 1.5 | 1.5 | 2.5 | astar  | 7.414 |
+      | 0.5 | 1.5 | 3.5 | 2.5 | jps    | 8     |
+
+  @pool
+  Scenario Outline: <REQ_NAV_08> Every example starts from a reset simulation leased from the worker's pool
+    Given the robot is leased from the simulation pool
+    Then the robot should start from the pool baseline
+    Given a wall of obstacles at x = 2 spanning y 0 to <wall> and z 0 to 1
+    When the robot moves forward by <distance>
+    Then the robot should be at position [0, <distance>, 0]
+    And the pool should have built only one simulation in this worker
+
+    Examples:
+      | wall | distance |
+      | 3    | 2        |
+      | 5    | 3        |
+      | 1    | 4        |
+
+  @planning @shared_cell
+  Scenario Outline: <REQ_NAV_10> Planning examples fork a shared cluttered cell instead of rebuilding it
+    Given a shared cell with <count> obstacles on lattice nodes and seed <seed>
+    And the robot is at position [0, 0, 0]
+    And an obstacle at [<x>, <y>, <z>]
+    When the robot navigates to [5, 5, 5] using <method>
+    Then the robot should be at position [5, 5, 5]
+    And the planned path should avoid all obstacles
+    And the shared cell should be unchanged by the example
+
+    Examples:
+      | count | seed | x   | y   | z   | method |
+      | 60    | 3    | 1   | 1   | 1   | astar  |
+      | 60    | 3    | 2.5 | 2.5 | 2.5 | auto   |
+      | 60    | 3    | 4   | 4.5 | 5   | astar  |
+      | 100   | 5    | 1   | 1   | 1   | auto   |
+
+  @stress_generator
+  Scenario Outline: <REQ_NAV_11> Generated stress suites are seeded and written once
+    Given the <suite> stress suite is generated with 5 examples and seed <seed>
+    When the <suite> stress suite is generated again with 5 examples and seed <seed>
+    Then the cached feature file should be reused
+    And writing the <suite> suite with 5 examples and seed <seed> should give the same rows
+    And writing the <suite> suite with 5 examples and seed <other> should give different rows
+
+    Examples:
+      | suite      | seed | other |
+      | navigation | 1    | 2     |
+      | safety     | 7    | 8     |
@@ -49,3 +49,132 @@ Feature: Pick and Place
       | 2       | 0       | 0       | 1     | 1     | 1     |
       | 0       | 0       | 2       | 0     | 2     | 2     |
 
+  @inverse_kinematics
+  Scenario Outline: <REQ_PAP_05> Robot arm reaches a Cartesian target through its joints
+    Given a robot with a gripper at position [<start_x>, <start_y>, <start_z>]
+    And the robot has the default jointed arm
+    When the robot reaches its arm to [<target_x>, <target_y>, <target_z>]
+    Then the arm joints should place the gripper at [<target_x>, <target_y>, <target_z>]
+
+    Examples:
+      | start_x | start_y | start_z | target_x | target_y | target_z |
+      | 0       | 0       | 0       | 0.5      | 0.2      | 0.3      |
+      | 1       | 1       | 0       | 1.3      | 1.4      | 0.6      |
+      | 2       | 0       | 1       | 1.6      | -0.3     | 1.2      |
+
+  @ik_sweep
+  Scenario Outline: <REQ_PAP_06> Robot solves a dense pick-and-place IK sweep in one batch
+    Given a robot with a gripper at position [0, 0, 0]
+    And the robot has the default jointed arm
+    When the robot solves IK for a <n> x <n> x <n> grid of targets in front of it
+    And the robot re-solves the grid shifted by <shift> units
+    Then every target in both sweeps should be reached
+    And the shifted sweep should need fewer iterations than the first
+
+    Examples:
+      | n  | shift |
+      | 10 | 0.01  |
+      | 20 | 0.005 |
+
+  @bin_picking
+  Scenario Outline: <REQ_PAP_07> Robot picks the nearest part from a bin of many parts
+    Given a robot with a gripper at position [1, 1, 0]
+    And an object is placed at [1.2, 1, 0]
+    And an object is placed at [1.1, 1.1, 0]
+    And <count> parts are scattered in a bin from [2, 2, 0] to [5, 5, 1] with seed <seed>
+    When the robot picks up an object
+    Then the robot should hold the object placed at [1.1, 1.1, 0]
+    When the robot moves the object to position [3, 3, 2]
+    And the robot releases the object
+    Then the released object should rest at [3, 3, 2]
+
+    Examples:
+      | count | seed |
+      | 10    | 1    |
+      | 5000  | 2    |
+
+  @bin_picking
+  Scenario Outline: <REQ_PAP_08> Robot cannot pick a part out of gripper reach
+    Given a robot with a gripper at position [0, 0, 0]
+    And <count> parts are scattered in a bin from [2, 2, 0] to [5, 5, 1] with seed <seed>
+    When the robot tries to pick up an object
+    Then the pick should fail
+
+    Examples:
+      | count | seed |
+      | 10    | 3    |
+      | 5000  | 4    |
+
+  @bin_picking
+  Scenario Outline: <REQ_PAP_11> Parts registered with explicit and automatic ids are all kept
+    Given a robot with a gripper at position [0, 0, 0]
+    And part <id> is placed at [1, 1, 0]
+    And an object is placed at [2, 2, 0]
+    And an object is placed at [3, 3, 0]
+    Then the cell should hold 3 parts with distinct ids
+
+    Examples:
+      | id |
+      | 0  |
+      | 1  |
+      | 7  |
+
+  @bin_picking
+  Scenario: <REQ_PAP_12> A gripper already holding a part refuses a second pick
+    Given a robot with a gripper at position [1, 1, 0]
+    And an object is placed at [1.1, 1, 0]
+    And an object is placed at [1, 1.2, 0]
+    When the robot picks up an object
+    Then the robot should hold the object placed at [1.1, 1, 0]
+    When the robot tries to pick up an object
+    Then the second pick should be refused
+    And the robot should still hold the object placed at [1.1, 1, 0]
+    And the object placed at [1, 1.2, 0] should still rest there
+
+  @ik_sweep
+  Scenario Outline: <REQ_PAP_13> IK reports the error of the joint angles it returns for unreachable targets
+    Given a robot with a gripper at position [0, 0, 0]
+    And the robot has the default jointed arm
+    When the robot solves IK for <count> targets up to <reach> units away
+    Then every reported IK error should match the distance from the gripper to its target
+
+    Examples:
+      | count | reach |
+      | 200   | 3     |
+      | 500   | 5     |
+
+  @physics
+  Scenario Outline: <REQ_PAP_09> Parts dropped into the cell settle under headless physics
+    Given a robot with a gripper at position [0, 0, 0]
+    And the robot runs with the "<backend>" physics backend
+    And a part with half size 0.05 is dropped from [2, 2, <height>]
+    And a part with half size 0.05 is dropped from [<x2>, 2, 1.5]
+    When the simulation runs for 2 seconds
+    Then the dropped parts should rest at heights 0.05 and <z2>
+
+    Examples:
+      | backend  | height | x2 | z2   |
+      | numpy    | 1      | 3  | 0.05 |
+      | numpy    | 0.5    | 2  | 0.15 |
+      | auto     | 1      | 2  | 0.15 |
+      | pybullet | 1      | 3  | 0.05 |
+      | pybullet | 0.5    | 2  | 0.15 |
+
+  @physics
+  Scenario Outline: <REQ_PAP_10> A saved physics state restores the world until the world is reset
+    Given a robot with a gripper at position [0, 0, 0]
+    And the robot runs with the "<backend>" physics backend
+    And a part with half size 0.05 is dropped from [2, 2, 1]
+    When the physics state is saved
+    And another part with half size 0.05 is dropped from [3, 3, 1]
+    And the simulation runs for 1 seconds
+    And the saved physics state is restored
+    Then the dropped parts should be back where the state was saved
+    And the physics world should hold only the bodies it had when the state was saved
+    When the physics world is reset
+    Then restoring the saved physics state should be refused
+
+    Examples:
+      | backend  |
+      | numpy    |
+      | pybullet |
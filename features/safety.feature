@@ -48,3 +48,81 @@ Feature: Robot safety
       | 0       | 0       | 0       |  0.5    |  0      | 0      |  1     | 0      | 0      | 2        | 0        | 0        |
       | 0       | 0       | 0       |  0      |  0.5    | 0      |  0     | 1      | 0      | 0        | 2        | 0        |
       | 1       | 1       | 1       |  1.5    |  1      | 1      |  2     | 1      | 1      | 3        | 1        | 1        |
+
+  @safety @arm_contact_point
+  Scenario Outline: <REQ_SAF_04> Robot arm stops exactly at the first contact on a long sweep
+    Given a robot at position [0, 0, 0]
+    And obstacles are at [<obs1_x>, <obs1_y>, <obs1_z>] and [<obs2_x>, <obs2_y>, <obs2_z>]
+    When the robot moves its arm to [<target_x>, <target_y>, <target_z>]
+    Then the robot arm should stop at [<stop_x>, <stop_y>, <stop_z>]
+
+    Examples:
+      | obs1_x | obs1_y | obs1_z | obs2_x | obs2_y | obs2_z | target_x | target_y | target_z | stop_x | stop_y | stop_z |
+      | 5      | 0      | 0      | 12     | 0      | 0      | 20       | 0      | 0      | 4.9    | 0      | 0      |
+      | 3      | 3.05   | 0      | 8      | 8      | 8      | 10       | 10     | 0      | 2.95   | 2.95   | 0      |
+      | 0      | 0      | 9      | 0      | 0      | 4      | 0        | 0      | 30     | 0      | 0      | 3.9    |
+      | 4      | 4      | 4      | 1      | 1      | 2      | 2        | 2      | 2      | 2      | 2      | 2      |
+
+  @safety @cluttered_cell
+  Scenario Outline: <REQ_SAF_05> Robot arm stops safely in a densely cluttered cell
+    Given a robot at position [0, 0, 0]
+    And <count> obstacles are scattered in the cell with seed <seed>
+    When the robot moves its arm to [<target_x>, <target_y>, <target_z>]
+    Then the robot arm should stop before the nearest obstacle
+    And the arm stop point should match a brute-force check of every obstacle
+
+    Examples:
+      | count | seed | target_x | target_y | target_z |
+      | 200   | 1    | 5        | 5        | 5        |
+      | 20000 | 2    | 5        | 0.2      | 0.1      |
+      | 20000 | 3    | 0.3      | 4        | 2        |
+
+  @safety @distance_field
+  Scenario Outline: <REQ_SAF_06> Arm clearance checks use a precomputed distance field
+    Given a robot at position [0, 0, 0]
+    And a distance field is precomputed at resolution <resolution>
+    And <count> obstacles are scattered in the cell with seed <seed>
+    When the robot moves its arm to [<target_x>, <target_y>, <target_z>]
+    Then the robot arm should stop before the nearest obstacle
+    And the distance field should bound the exact clearance at 500 random points
+
+    Examples:
+      | resolution | count | seed | target_x | target_y | target_z |
+      | 0.1        | 200   | 4    | 5        | 5        | 5        |
+      | 0.1        | 5000  | 5    | 5        | 0.2      | 0.1      |
+      | 0.25       | 20    | 6    | 0.3      | 4        | 2        |
+
+  @safety @shared_cell
+  Scenario Outline: <REQ_SAF_07> Examples fork a shared cluttered cell instead of rebuilding it
+    Given a shared cell with 20000 scattered obstacles and seed 7
+    And a robot at position [0, 0, 0]
+    And an obstacle is at [<obs_x>, <obs_y>, <obs_z>]
+    When the robot moves its arm to [<target_x>, <target_y>, <target_z>]
+    Then the robot arm should stop before the nearest obstacle
+    And the arm stop point should match a brute-force check of every obstacle
+    And the shared cell should be unchanged by the example
+
+    Examples:
+      | obs_x | obs_y | obs_z | target_x | target_y | target_z |
+      | 0.2   | 0     | 0     | 5        | 0        | 0        |
+      | 0     | 0.3   | 0     | 0        | 5        | 0        |
+      | 4     | 4     | 4     | 0.3      | 0.3      | 5        |
+
+  @safety @fuzz
+  Scenario Outline: <REQ_SAF_08> Safety invariants hold over fuzzed configurations
+    Given a robot at position [0, 0, 0]
+    When <cases> fuzzed <kind> run with seed <seed>
+    Then no fuzzed case should violate a safety invariant
+
+    Examples:
+      | kind              | cases | seed |
+      | boundary attempts | 50000 | 1    |
+      | arm sweeps        | 20000 | 1    |
+      | arm sweeps        | 20000 | 2    |
+
+  @safety @fuzz
+  Scenario: <REQ_SAF_08> The fuzzer shrinks a broken stop rule to a minimal counterexample
+    Given a robot at position [0, 0, 0]
+    And the arm stop rule only keeps half the clearance
+    When 5000 fuzzed arm sweeps run with seed 2
+    Then the fuzzer should report a "stops before obstacle" counterexample shrunk to 1 obstacle
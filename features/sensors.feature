@@ -45,3 +45,91 @@ Feature: Sensor and Filtering
       | 1.0   | 1.5   | 0     | 0     |
       | 1.0   | 0     | 1.5   | 0     |
       | 0.5   | 0     | 0     | 1.0   |
+
+  @batch_kalman_filter
+  Scenario Outline: <REQ_SEN_04> Batch Kalman filter matches the scalar filter on every channel
+    Given a batch Kalman filter with <channels> channels
+    When <samples> noisy samples per channel are applied to the batch filter
+    Then every channel should match a scalar Kalman filter fed the same samples
+
+    Examples:
+      | channels | samples |
+      | 1        | 20      |
+      | 3        | 50      |
+      | 64       | 200     |
+
+  @kalman_replay
+  Scenario Outline: <REQ_SEN_05> Bulk replay of a recorded trace matches per-sample filtering
+    Given a recorded trace of <samples> noisy readings of value <value>
+    When the trace is replayed through the Kalman filter in bulk
+    Then the bulk estimates should match per-sample updates
+    And the steady-state filter's estimate should converge approximately to <value>
+
+    Examples:
+      | samples | value |
+      | 1000    | 1.0   |
+      | 5000    | 2.5   |
+      | 100000  | -3.0  |
+
+  @seeded_sensor
+  Scenario Outline: <REQ_SEN_06> Seeded sensors reproduce identical noisy readings
+    Given two sensors with noise 0.1 and seed <seed>
+    When each sensor reads <samples> samples of value <value> using <mode> reads
+    Then both sensors should report identical readings
+    And the mean reading should be approximately <value>
+
+    Examples:
+      | seed | samples | value | mode       |
+      | 7    | 2000    | 1.0   | per-sample |
+      | 7    | 2000    | 1.0   | buffered   |
+      | 42   | 100000  | -2.5  | bulk       |
+
+  @streaming_pipeline
+  Scenario Outline: <REQ_SEN_07> Recorded trace file streams through the sensor filter pipeline in chunks
+    Given a trace file of <samples> true readings of value <value>
+    When the trace file is streamed through a seeded sensor and Kalman filter in chunks of <chunk> samples
+    Then the streamed estimates should match filtering the whole trace at once
+    And every pipeline stage should report its throughput
+
+    Examples:
+      | samples | value | chunk |
+      | 1000    | 1.0   | 64    |
+      | 200000  | -0.5  | 4096  |
+
+  @sensor_log
+  Scenario Outline: <REQ_SEN_08> Recorded sensor log replays a channel through the Kalman filter
+    Given a sensor log recording <samples> readings on <channels> channels at 1 kHz
+    When channel <channel> is replayed from the log between <start> and <end> seconds
+    Then the log should be read without copying the recorded data
+    And the replayed estimate should converge approximately to <channel>
+
+    Examples:
+      | samples | channels | channel | start | end  |
+      | 2000    | 1        | 0       | 0     | 2    |
+      | 50000   | 4        | 3       | 10    | 40   |
+
+  @sensor_log
+  Scenario Outline: <REQ_SEN_08> Appending to a log with a torn last record keeps every record aligned
+    Given a sensor log recording 100 readings on 2 channels at 1 kHz
+    And the log ends in a record torn <kept> bytes into writing
+    When 10 more readings are appended to the log
+    Then the log should read back the intact records followed by the appended ones
+
+    Examples:
+      | kept |
+      | 1    |
+      | 7    |
+      | 19   |
+
+  @object_detection_clutter
+  Scenario Outline: <REQ_SEN_09> Sensor detects exactly the in-range objects in a cluttered scene
+    Given a sensor with range <range>
+    And <count> objects are scattered within <extent> units of the sensor
+    And the last <removed> objects are removed from the environment
+    When the sensor scans
+    Then exactly the objects within range should be detected
+
+    Examples:
+      | range | count | extent | removed |
+      | 1.0   | 500   | 3      | 0       |
+      | 2.5   | 20000 | 50     | 5000    |
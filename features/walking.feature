@@ -40,4 +40,31 @@ Feature: Robot Walking
       |   0     |   1     |   0     |  2       |  0    |  3    |  0    |
       |   1     |   0     |   0     |  3       |  1    |  3    |  0    |
       |   2     |   2     |   0     |  1       |  2    |  3    |  0    |
-      |  24     |  29     |  50     | 51       | 20    | 13    | 10    |
\ No newline at end of file
+      |  24     |  29     |  50     | 51       | 20    | 13    | 10    |
+
+  @fleet
+  Scenario Outline: <REQ_WAL_04> A fleet of robots walks forward together within its boundary
+    Given a fleet of <robots> robots at position [0, 0, 0] bounded by [<max_x>, <max_y>, <max_z>]
+    When the fleet starts walking
+    And every second robot walks forward by <distance> units for <ticks> ticks
+    Then every robot in the fleet should be walking
+    And every second robot should be at position [0, <end_y>, 0]
+    And the other robots should be at position [0, 0, 0]
+
+    Examples:
+      | robots | max_x | max_y | max_z | distance | ticks | end_y |
+      | 10     | 5     | 5     | 5     | 1        | 3     | 3     |
+      | 10000  | 5     | 5     | 5     | 2        | 5     | 5     |
+
+  @timed_walk
+  Scenario Outline: <REQ_WAL_05> Robot walks forward as a timed motion at a commanded speed
+    Given a robot at position [<start_x>, <start_y>, <start_z>]
+    When the robot walks forward by <distance> units at <speed> units per second
+    Then the robot should be approximately at position [<end_x>, <end_y>, <end_z>]
+    And the walk should take <seconds> seconds of simulated time
+
+    Examples:
+      | start_x | start_y | start_z | distance | speed | end_x | end_y | end_z | seconds  |
+      | 0       | 0       | 0       | 2        | 1     | 0     | 2     | 0     | 2        |
+      | 1       | 0       | 0       | 3        | 2     | 1     | 3     | 0     | 1.5      |
+      | 0       | 1       | 0       | 1        | 0.3   | 0     | 2     | 0     | 3.333333 |
@@ -0,0 +1,292 @@
+# plugins/bdd_cache.py
+"""pytest-bdd collection cache.
+
+Two pieces, both switched off with ``--no-bdd-cache``:
+
+* Parsed features are pickled into the pytest cache directory, keyed by a
+  hash of the file's contents (and the pytest-bdd version), so an unchanged
+  .feature file is loaded instead of re-parsed on the next run.
+* Step lookup goes through an index of every step definition by the
+  literal prefix of its pattern, and the definitions that match a step's
+  text are remembered, so generated examples repeating the same step
+  lines only run the pattern matchers once.
+
+Savings are reported after collection (also with ``--collect-only``) and
+in the terminal summary.
+
+Both replace private pytest-bdd internals, so they are only installed on
+the pytest-bdd releases in SUPPORTED_BDD and when those internals are
+there; anything else runs pytest-bdd's stock parsing and lookup and says
+so in the report header.
+"""
+import hashlib
+import importlib
+import importlib.metadata
+import os
+import pickle
+import re
+import time
+from collections import defaultdict
+
+import pytest
+from pytest_bdd import parsers
+
+try:
+    from pytest_bdd.compat import getfixturedefs
+    from pytest_bdd.parser import FeatureParser
+    from pytest_bdd.steps import step_function_context_registry
+except ImportError:  # another pytest-bdd layout; pytest_configure leaves pytest-bdd alone
+    getfixturedefs = step_function_context_registry = None
+    FeatureParser = object
+
+# Looked up by name: the package exports a scenario() function that shadows its submodule
+bdd_feature = importlib.import_module("pytest_bdd.feature")
+bdd_scenario = importlib.import_module("pytest_bdd.scenario")
+
+# Cached features are only valid for the pytest-bdd that pickled them
+BDD_VERSION = importlib.metadata.version("pytest-bdd").encode()
+
+# pytest-bdd releases whose internals the patches below were written against
+SUPPORTED_BDD = ("9.0.",)
+
+# Step prefixes are bucketed by this many leading characters (lowercased)
+PREFIX_KEY = 8
+
+_REGEX_SPECIAL = set(".^$*+?{}[]\\|()")
+
+
+class CacheStats:
+    def __init__(self):
+        self.features_loaded = 0
+        self.features_parsed = 0
+        self.parse_time_saved = 0.0
+        self.parse_time_spent = 0.0
+        self.steps_resolved = 0
+        self.bindings_reused = 0
+        self.patterns_checked = 0
+        self.patterns_skipped = 0
+
+    def collection_line(self):
+        return (f"bdd cache: {self.features_loaded + self.features_parsed} feature files "
+                f"({self.features_loaded} from cache, {self.features_parsed} parsed), "
+                f"saved {self.parse_time_saved * 1e3:.1f} ms of Gherkin parsing, "
+                f"spent {self.parse_time_spent * 1e3:.1f} ms")
+
+    def matcher_line(self):
+        total = self.patterns_checked + self.patterns_skipped
+        return (f"bdd step matcher: {self.steps_resolved} steps resolved, "
+                f"{self.bindings_reused} from the binding cache, "
+                f"{self.patterns_checked:,} of {total:,} pattern checks run")
+
+
+stats = CacheStats()
+_cache_dir = None
+
+
+# -------------------------
+# Parsed feature cache
+# -------------------------
+class CachedFeatureParser(FeatureParser):
+    """FeatureParser that loads a pickled Feature when the file is unchanged."""
+
+    def parse(self):
+        if _cache_dir is None:
+            return super().parse()
+        with open(self.abs_filename, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(
+            b"\0".join((BDD_VERSION, self.abs_filename.encode(), content))).hexdigest()
+        path = os.path.join(_cache_dir, digest + ".pickle")
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                parse_time, feature = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+        else:
+            stats.features_loaded += 1
+            stats.parse_time_saved += parse_time - (time.perf_counter() - start)
+            return feature
+        start = time.perf_counter()
+        feature = super().parse()
+        parse_time = time.perf_counter() - start
+        stats.features_parsed += 1
+        # Write then rename so parallel workers never read a partial file
+        partial = f"{path}.{os.getpid()}"
+        with open(partial, "wb") as f:
+            pickle.dump((parse_time, feature), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        stats.parse_time_spent += time.perf_counter() - start
+        return feature
+
+
+# -------------------------
+# Prefix-indexed step matcher
+# -------------------------
+def literal_prefix(parser):
+    """Text every step matched by parser must start with (compared case-insensitively)."""
+    if isinstance(parser, parsers.string):
+        return parser.name
+    if isinstance(parser, parsers.parse):
+        return parser.name.split("{", 1)[0]
+    if isinstance(parser, parsers.re):
+        pattern = parser.regex.pattern
+        # Alternation or verbose patterns have no single literal prefix
+        if "|" in pattern or parser.regex.flags & re.VERBOSE:
+            return ""
+        prefix = []
+        for char in pattern.lstrip("^"):
+            if char in _REGEX_SPECIAL:
+                # A quantifier may make the character before it optional
+                if char in "*?{" and prefix:
+                    prefix.pop()
+                break
+            prefix.append(char)
+        return "".join(prefix)
+    return ""
+
+
+def fixture_fingerprint(fixturemanager):
+    """Changes whenever a fixture is defined, including another definition under an existing name.
+
+    pytest-bdd names step fixtures after the step text, so a step defined
+    again in a later module adds to an existing name's list.
+    """
+    arg2fixturedefs = fixturemanager._arg2fixturedefs
+    return len(arg2fixturedefs), sum(map(len, arg2fixturedefs.values()))
+
+
+class StepIndex:
+    """Step definitions of one fixture manager, bucketed by pattern prefix."""
+
+    def __init__(self, fixturemanager):
+        self.fingerprint = fixture_fingerprint(fixturemanager)
+        self.buckets = defaultdict(list)
+        self.short = []
+        self.count = 0
+        self.bindings = {}
+        for fixturename, fixturedefs in list(fixturemanager._arg2fixturedefs.items()):
+            for fixturedef in fixturedefs:
+                context = step_function_context_registry.get(fixturedef.func)
+                if context is None:
+                    continue
+                prefix = literal_prefix(context.parser).lower()
+                entry = (prefix, context, fixturename, fixturedef)
+                if len(prefix) >= PREFIX_KEY:
+                    self.buckets[prefix[:PREFIX_KEY]].append(entry)
+                else:
+                    self.short.append(entry)
+                self.count += 1
+
+    def matching(self, step):
+        """(fixturename, fixturedef) of every definition whose pattern matches the step."""
+        key = (step.type, step.name)
+        found = self.bindings.get(key)
+        stats.steps_resolved += 1
+        if found is not None:
+            stats.bindings_reused += 1
+            stats.patterns_skipped += self.count
+            return found
+        name = step.name.lower()
+        found = []
+        checked = 0
+        for prefix, context, fixturename, fixturedef in self.buckets.get(name[:PREFIX_KEY], []) + self.short:
+            if not name.startswith(prefix):
+                continue
+            if context.type is not None and context.type != step.type:
+                continue
+            checked += 1
+            if context.parser.is_matching(step.name):
+                found.append((fixturename, fixturedef))
+        stats.patterns_checked += checked
+        stats.patterns_skipped += self.count - checked
+        self.bindings[key] = found
+        return found
+
+
+_indexes = {}
+
+
+def find_fixturedefs_for_step(step, fixturemanager, node):
+    """Drop-in for bdd_scenario.find_fixturedefs_for_step backed by a StepIndex."""
+    # The index reads pytest's private fixture table; without it use the stock lookup
+    if not hasattr(fixturemanager, "_arg2fixturedefs"):
+        yield from _originals["find_fixturedefs_for_step"](step, fixturemanager, node)
+        return
+    index = _indexes.get(id(fixturemanager))
+    # Rebuilt if step modules were imported since (new fixture definitions)
+    if index is None or index.fingerprint != fixture_fingerprint(fixturemanager):
+        index = _indexes[id(fixturemanager)] = StepIndex(fixturemanager)
+    for fixturename, fixturedef in index.matching(step):
+        if fixturedef in (getfixturedefs(fixturemanager, fixturename, node) or ()):
+            yield fixturedef
+
+
+# -------------------------
+# Hooks
+# -------------------------
+_originals = {}
+_unsupported = None
+
+
+def unsupported_reason():
+    """Why the patches cannot be installed on this pytest-bdd, or None."""
+    version = BDD_VERSION.decode()
+    if not version.startswith(SUPPORTED_BDD):
+        return f"pytest-bdd {version} is not one of the supported releases {', '.join(SUPPORTED_BDD)}x"
+    missing = [name for name, present in (
+        ("pytest_bdd.feature.FeatureParser", hasattr(bdd_feature, "FeatureParser")),
+        ("pytest_bdd.scenario.find_fixturedefs_for_step", hasattr(bdd_scenario, "find_fixturedefs_for_step")),
+        ("pytest_bdd.compat.getfixturedefs", getfixturedefs is not None),
+        ("pytest_bdd.steps.step_function_context_registry", step_function_context_registry is not None),
+    ) if not present]
+    return f"pytest-bdd {version} has no {', '.join(missing)}" if missing else None
+
+
+def pytest_addoption(parser):
+    parser.addoption("--no-bdd-cache", action="store_true", default=False,
+                     help="Parse every .feature file and match every step from scratch")
+
+
+def pytest_configure(config):
+    global _cache_dir, _unsupported
+    if config.getoption("no_bdd_cache"):
+        return
+    _unsupported = unsupported_reason()
+    if _unsupported:
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning(f"bdd cache disabled: {_unsupported}"), stacklevel=2)
+        return
+    cache = getattr(config, "cache", None)
+    _cache_dir = str(cache.mkdir("bdd-features")) if cache is not None else None
+    _originals["FeatureParser"] = bdd_feature.FeatureParser
+    _originals["find_fixturedefs_for_step"] = bdd_scenario.find_fixturedefs_for_step
+    bdd_feature.FeatureParser = CachedFeatureParser
+    bdd_scenario.find_fixturedefs_for_step = find_fixturedefs_for_step
+
+
+def pytest_unconfigure(config):
+    global _cache_dir, _unsupported
+    if "FeatureParser" in _originals:
+        bdd_feature.FeatureParser = _originals.pop("FeatureParser")
+        bdd_scenario.find_fixturedefs_for_step = _originals.pop("find_fixturedefs_for_step")
+    _cache_dir = None
+    _unsupported = None
+    _indexes.clear()
+
+
+def pytest_report_header(config):
+    if _unsupported:
+        return f"bdd cache: off, stock pytest-bdd parsing and step lookup ({_unsupported})"
+    return None
+
+
+def pytest_report_collectionfinish(config):
+    if _cache_dir is None:
+        return None
+    return stats.collection_line()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if stats.steps_resolved:
+        terminalreporter.write_line(stats.matcher_line())
@@ -0,0 +1,208 @@
+# plugins/scenario_generator.py
+"""Seeded stress suites built from the existing step definitions.
+
+``pytest --stress-examples N`` writes, for each suite, a feature file of
+scenario outlines with N generated Examples rows each, then the suite's
+step module binds it next to its hand-written feature. Rows are produced
+lazily in NumPy chunks and streamed straight to the file, so 100k rows
+never sit in memory as a table. Files are cached by suite, size, seed,
+template and this module's source (so changing a row distribution or
+CHUNK invalidates them), and later runs (and every xdist worker) reuse
+them. The scenarios are tagged ``@stress`` and trace to their own
+requirements; deselect them with ``-m "not stress"``.
+
+Also runnable on its own:
+    python -m plugins.scenario_generator navigation 100000 --seed 1 -o moves.feature
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from simulation.trajectory import DIRECTIONS
+
+# Rows drawn from the RNG at a time
+CHUNK = 4096
+
+
+def _fmt(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+# -------------------------
+# Row generators: each yields tuples in the order of its outline's columns
+# -------------------------
+def single_moves(count, rng):
+    names = list(DIRECTIONS)
+    units = np.array([DIRECTIONS[name] for name in names])
+    for first in range(0, count, CHUNK):
+        n = min(CHUNK, count - first)
+        start = np.round(rng.uniform(-50, 50, size=(n, 3)), 2)
+        which = rng.integers(len(names), size=n)
+        distance = np.round(rng.uniform(0.01, 20, size=n), 2)
+        end = np.round(start + units[which] * distance[:, None], 2)
+        for s, w, d, e in zip(start.tolist(), which.tolist(), distance.tolist(), end.tolist()):
+            yield (*s, names[w], d, *e)
+
+
+def diagonal_moves(count, rng):
+    for first in range(0, count, CHUNK):
+        n = min(CHUNK, count - first)
+        start = np.round(rng.uniform(-50, 50, size=(n, 3)), 2)
+        delta = np.round(rng.uniform(-20, 20, size=(n, 3)), 2)
+        end = np.round(start + delta, 2)
+        for row in np.hstack((start, delta, end)).tolist():
+            yield tuple(row)
+
+
+def boundary_attempts(count, rng):
+    for first in range(0, count, CHUNK):
+        n = min(CHUNK, count - first)
+        start = np.round(rng.uniform(0, 5, size=(n, 3)), 2)
+        target = np.round(rng.uniform(-5, 10, size=(n, 3)), 2)
+        for row in np.hstack((start, target)).tolist():
+            yield tuple(row)
+
+
+def cluttered_sweeps(count, rng):
+    for first in range(0, count, CHUNK):
+        n = min(CHUNK, count - first)
+        obstacles = rng.integers(20, 2000, size=n)
+        seeds = rng.integers(0, 2**31, size=n)
+        target = np.round(rng.uniform(0, 5, size=(n, 3)), 2)
+        for c, s, t in zip(obstacles.tolist(), seeds.tolist(), target.tolist()):
+            yield (c, s, *t)
+
+
+# suite -> (feature tags, [(scenario header and steps, columns, row generator)])
+SUITES = {
+    "navigation": ("@navigation @stress", [
+        ("""  @move
+  Scenario Outline: <REQ_NAV_11> Generated single-direction moves
+    Given the robot is at position [<start_x>, <start_y>, <start_z>]
+    When the robot moves <direction> by <distance>
+    Then the robot should be at position [<end_x>, <end_y>, <end_z>]
+""", ("start_x", "start_y", "start_z", "direction", "distance", "end_x", "end_y", "end_z"), single_moves),
+        ("""  @diagonal
+  Scenario Outline: <REQ_NAV_11> Generated diagonal moves
+    Given the robot is at position [<start_x>, <start_y>, <start_z>]
+    When the robot moves diagonally by [<dx>, <dy>, <dz>]
+    Then the robot should be at position [<end_x>, <end_y>, <end_z>]
+""", ("start_x", "start_y", "start_z", "dx", "dy", "dz", "end_x", "end_y", "end_z"), diagonal_moves),
+    ]),
+    "safety": ("@safety @stress", [
+        ("""  @boundary_check
+  Scenario Outline: <REQ_SAF_09> Generated boundary attempts
+    Given a robot at position [<start_x>, <start_y>, <start_z>]
+    When the robot attempts to move to [<target_x>, <target_y>, <target_z>]
+    Then the robot should remain within boundaries
+""", ("start_x", "start_y", "start_z", "target_x", "target_y", "target_z"), boundary_attempts),
+        ("""  @cluttered_cell
+  Scenario Outline: <REQ_SAF_09> Generated sweeps through cluttered cells
+    Given a robot at position [0, 0, 0]
+    And <count> obstacles are scattered in the cell with seed <seed>
+    When the robot moves its arm to [<target_x>, <target_y>, <target_z>]
+    Then the robot arm should stop before the nearest obstacle
+    And the arm stop point should match a brute-force check of every obstacle
+""", ("count", "seed", "target_x", "target_y", "target_z"), cluttered_sweeps),
+    ]),
+}
+
+
+def write_feature(suite, count, seed, out):
+    """Stream the suite's feature, with count rows per outline, to the text file out."""
+    tags, outlines = SUITES[suite]
+    rng = np.random.default_rng(seed)
+    out.write(f"# Generated by plugins/scenario_generator.py: suite {suite}, "
+              f"{count} examples per outline, seed {seed}. Do not edit.\n")
+    out.write(f"{tags}\nFeature: Generated {suite} stress suite\n")
+    out.write("  Seeded random examples run through the existing step definitions.\n")
+    for outline, columns, rows in outlines:
+        out.write(f"\n{outline}\n    Examples:\n      | {' | '.join(columns)} |\n")
+        for row in rows(count, rng):
+            out.write(f"      | {' | '.join(map(_fmt, row))} |\n")
+
+
+def _generator_source():
+    """This module's source and the move table it draws from: what the rows depend on."""
+    with open(__file__, "rb") as f:
+        return f.read() + repr(sorted(DIRECTIONS.items())).encode()
+
+
+def feature_path(directory, suite, count, seed):
+    """Where the suite's feature is cached; the name changes with its template or the generator."""
+    tags, outlines = SUITES[suite]
+    template = repr((tags, [(outline, columns, rows.__name__) for outline, columns, rows in outlines]))
+    digest = hashlib.sha256(template.encode() + b"\0" + _generator_source()).hexdigest()[:12]
+    return os.path.join(directory, f"{suite}-{count}-{seed}-{digest}.feature")
+
+
+def generate(directory, suite, count, seed):
+    """Path of the suite's feature, writing it only if it is not cached yet."""
+    path = feature_path(directory, suite, count, seed)
+    if not os.path.exists(path):
+        # Write then rename so parallel workers never read a partial file
+        partial = f"{path}.{os.getpid()}"
+        with open(partial, "w", encoding="utf-8") as out:
+            write_feature(suite, count, seed, out)
+        os.replace(partial, path)
+    return path
+
+
+# -------------------------
+# pytest plugin
+# -------------------------
+_generated = {}
+
+
+def generated_features(suite):
+    """Generated feature files for suite in this run (empty unless --stress-examples is set)."""
+    return _generated.get(suite, [])
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stress", "generated stress scenarios")
+    group.addoption("--stress-examples", type=int, default=0, metavar="N",
+                    help="Add generated scenario outlines with N examples each (default: off)")
+    group.addoption("--stress-seed", type=int, default=0, help="Seed for the generated examples")
+    group.addoption("--stress-suite", action="append", choices=sorted(SUITES),
+                    help="Only generate this suite (repeatable; default: all)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "stress: generated large-scale scenarios")
+    count = config.getoption("stress_examples")
+    if count <= 0:
+        return
+    cache = getattr(config, "cache", None)
+    directory = (str(cache.mkdir("generated-features")) if cache is not None
+                 else os.path.join(tempfile.gettempdir(), "robot-bdd-generated-features"))
+    os.makedirs(directory, exist_ok=True)
+    seed = config.getoption("stress_seed")
+    for suite in config.getoption("stress_suite") or sorted(SUITES):
+        _generated[suite] = [generate(directory, suite, count, seed)]
+
+
+def pytest_unconfigure(config):
+    _generated.clear()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Write a generated stress feature file.")
+    parser.add_argument("suite", choices=sorted(SUITES))
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Feature file to write (default: stdout)")
+    args = parser.parse_args(argv[1:])
+    if args.output is None:
+        write_feature(args.suite, args.count, args.seed, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_feature(args.suite, args.count, args.seed, out)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,214 @@
+# plugins/step_timing.py
+"""Per-step and per-scenario timings from pytest-bdd's step hooks.
+
+Every step is split into two phases on the high-resolution clock:
+
+* framework: ``pytest_bdd_before_step`` to ``pytest_bdd_before_step_call``,
+  i.e. parsing the step's arguments and looking up its fixtures;
+* body: from there to ``pytest_bdd_after_step`` (or ``pytest_bdd_step_error``),
+  the step function and the simulation calls it makes.
+
+A scenario's overhead is its wall time (``pytest_bdd_before_scenario`` to
+``pytest_bdd_after_scenario``) minus its step bodies.
+
+With ``--alluredir`` each scenario gets its totals as Allure parameters
+(excluded from history ids, so timings never split a test's history) and
+its steps as a CSV attachment. ``--step-timings PATH`` aggregates every
+step definition over all its examples and writes them, slowest first, to
+PATH as CSV or JSON (by extension), and the terminal summary lists the top
+few. Under xdist each worker sends its totals to the controller, which
+writes the file. Nothing is registered unless one of the two is given.
+"""
+import csv
+import io
+import json
+import time
+
+import allure
+import pytest
+from pytest_bdd.steps import step_function_context_registry
+
+# Slowest step definitions and scenarios listed in the terminal summary
+SUMMARY_TOP = 10
+
+STEP_COLUMNS = ("keyword", "step", "calls", "failures", "total_ms", "body_ms", "framework_ms",
+                "mean_ms", "max_ms", "share", "slowest_example", "slowest_test")
+
+_ms = 1e-6  # perf_counter_ns -> milliseconds
+
+
+class _ScenarioClock:
+    """Timestamps of the scenario and step in flight, and the rows of finished steps."""
+    __slots__ = ("start", "step_start", "call_start", "steps")
+
+    def __init__(self):
+        self.start = time.perf_counter_ns()
+        self.step_start = self.call_start = None
+        # (keyword as written, step type, pattern, text, framework ns, body ns, failed)
+        self.steps = []
+
+
+_clock_key = pytest.StashKey()
+
+
+class StepTimer:
+    def __init__(self, config):
+        self.path = config.getoption("step_timings")
+        self.allure = bool(config.getoption("allure_report_dir", None))
+        # (keyword, pattern) -> [calls, failures, framework ns, body ns, max ns, slowest text, slowest test]
+        self.steps = {}
+        # (wall ns, body ns, test)
+        self.scenarios = []
+        self._patterns = {}
+
+    def _pattern(self, step_func, step_type):
+        """The step definition's pattern(s), shared by every example it matches."""
+        key = (step_func, step_type)
+        if key not in self._patterns:
+            patterns = {context.parser.name for context in list(step_function_context_registry.values())
+                        if context.step_func is step_func and context.type in (None, step_type)}
+            self._patterns[key] = " | ".join(sorted(patterns)) or step_func.__name__
+        return self._patterns[key]
+
+    # -------------------------
+    # pytest-bdd hooks
+    # -------------------------
+    def pytest_bdd_before_scenario(self, request):
+        request.node.stash[_clock_key] = _ScenarioClock()
+
+    def pytest_bdd_before_step(self, request):
+        clock = request.node.stash[_clock_key]
+        clock.step_start = time.perf_counter_ns()
+        clock.call_start = None
+
+    def pytest_bdd_before_step_call(self, request):
+        request.node.stash[_clock_key].call_start = time.perf_counter_ns()
+
+    def _finish_step(self, request, step, step_func, failed):
+        now = time.perf_counter_ns()
+        clock = request.node.stash[_clock_key]
+        # Failing before the call (argument parsing, fixtures) is all framework time
+        call_start = now if clock.call_start is None else clock.call_start
+        clock.steps.append((step.keyword, step.type, self._pattern(step_func, step.type), step.name,
+                            call_start - clock.step_start, now - call_start, failed))
+
+    def pytest_bdd_after_step(self, request, step, step_func):
+        self._finish_step(request, step, step_func, False)
+
+    def pytest_bdd_step_error(self, request, step, step_func):
+        self._finish_step(request, step, step_func, True)
+
+    def pytest_bdd_after_scenario(self, request):
+        clock = request.node.stash.get(_clock_key, None)
+        if clock is None:
+            return
+        wall = time.perf_counter_ns() - clock.start
+        nodeid = request.node.nodeid
+        body = 0
+        for _, step_type, pattern, text, framework, call, failed in clock.steps:
+            body += call
+            # "And"/"But" steps count under the Given/When/Then they continue
+            total = self.steps.setdefault((step_type.capitalize(), pattern), [0, 0, 0, 0, -1, "", ""])
+            total[0] += 1
+            total[1] += failed
+            total[2] += framework
+            total[3] += call
+            if framework + call > total[4]:
+                total[4:] = [framework + call, text, nodeid]
+        self.scenarios.append((wall, body, nodeid))
+        if self.allure:
+            self._to_allure(clock, wall, body)
+
+    def _to_allure(self, clock, wall, body):
+        allure.dynamic.parameter("scenario wall time (ms)", round(wall * _ms, 3), excluded=True)
+        allure.dynamic.parameter("step bodies (ms)", round(body * _ms, 3), excluded=True)
+        allure.dynamic.parameter("framework overhead (ms)", round((wall - body) * _ms, 3), excluded=True)
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(("keyword", "step", "framework_ms", "body_ms", "failed"))
+        for keyword, _, _, text, framework, call, failed in clock.steps:
+            writer.writerow((keyword, text, f"{framework * _ms:.4f}", f"{call * _ms:.4f}", failed))
+        allure.attach(out.getvalue(), name="step timings", attachment_type=allure.attachment_type.CSV)
+
+    # -------------------------
+    # Aggregation across the run (and xdist workers)
+    # -------------------------
+    def _merge(self, steps, scenarios):
+        for keyword, pattern, calls, failures, framework, call, slowest, text, nodeid in steps:
+            total = self.steps.setdefault((keyword, pattern), [0, 0, 0, 0, -1, "", ""])
+            total[0] += calls
+            total[1] += failures
+            total[2] += framework
+            total[3] += call
+            if slowest > total[4]:
+                total[4:] = [slowest, text, nodeid]
+        self.scenarios.extend(tuple(row) for row in scenarios)
+
+    def rows(self):
+        """Aggregated step definitions as dicts of STEP_COLUMNS, slowest total first."""
+        grand = sum(framework + call for _, _, framework, call, *_ in self.steps.values()) or 1
+        rows = []
+        for (keyword, pattern), (calls, failures, framework, call, slowest, text, nodeid) in self.steps.items():
+            total = framework + call
+            rows.append({"keyword": keyword, "step": pattern, "calls": calls, "failures": failures,
+                         "total_ms": round(total * _ms, 4), "body_ms": round(call * _ms, 4),
+                         "framework_ms": round(framework * _ms, 4), "mean_ms": round(total / calls * _ms, 4),
+                         "max_ms": round(slowest * _ms, 4), "share": round(total / grand, 4),
+                         "slowest_example": text, "slowest_test": nodeid})
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def write(self, path):
+        rows = self.rows()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".json"):
+                scenarios = [{"test": nodeid, "wall_ms": round(wall * _ms, 4), "steps_ms": round(body * _ms, 4),
+                              "overhead_ms": round((wall - body) * _ms, 4)}
+                             for wall, body, nodeid in sorted(self.scenarios, reverse=True)]
+                json.dump({"steps": rows, "scenarios": scenarios}, f, indent=2)
+            else:
+                writer = csv.DictWriter(f, fieldnames=STEP_COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+
+    # -------------------------
+    # pytest hooks
+    # -------------------------
+    def pytest_sessionfinish(self, session):
+        config = session.config
+        if hasattr(config, "workerinput"):
+            config.workeroutput["step_timings"] = json.dumps((
+                [(*key, *value) for key, value in self.steps.items()], self.scenarios))
+        elif self.path and self.steps:
+            self.write(self.path)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        payload = getattr(node, "workeroutput", {}).get("step_timings")
+        if payload:
+            self._merge(*json.loads(payload))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.path or not self.steps:
+            return
+        write = terminalreporter.write_line
+        wall = sum(row[0] for row in self.scenarios)
+        body = sum(row[1] for row in self.scenarios)
+        terminalreporter.section("step timings")
+        write(f"{len(self.scenarios)} scenarios: {wall * _ms:.1f} ms wall, {body * _ms:.1f} ms in step "
+              f"bodies, {(wall - body) * _ms:.1f} ms framework overhead")
+        write(f"slowest step definitions (total ms / calls / max ms), written to {self.path}:")
+        for row in self.rows()[:SUMMARY_TOP]:
+            write(f"  {row['total_ms']:10.2f} {row['calls']:6d} {row['max_ms']:9.2f}  "
+                  f"{row['keyword']} {row['step']}")
+
+
+def pytest_addoption(parser):
+    parser.getgroup("reporting").addoption(
+        "--step-timings", metavar="PATH", default=None,
+        help="Write per-step-definition timings, slowest first, to PATH (.csv or .json)")
+
+
+def pytest_configure(config):
+    if config.getoption("step_timings") or config.getoption("allure_report_dir", None):
+        config.pluginmanager.register(StepTimer(config), "step-timer")
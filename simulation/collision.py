@@ -0,0 +1,150 @@
+# simulation/collision.py
+
+import numpy as np
+
+# Half-width of the box around an obstacle that the arm must stay out of.
+# Matches the "within 0.1 units in all axes" proximity rule of the safety steps.
+ARM_CLEARANCE = 0.1
+
+# How far (in world units) the stop point is pulled back from the contact
+# surface, so rounding cannot leave the arm a hair inside the clearance zone.
+CONTACT_MARGIN = 1e-9
+
+
+def segment_aabb_first_hit(start, end, centers, half_extent=ARM_CLEARANCE):
+    """First entry of the segment start->end into any axis-aligned box.
+
+    Boxes are open: (center - half_extent, center + half_extent) on every
+    axis, so grazing a face is not a hit. Runs the slab test for all boxes
+    at once. Returns (t, index) with t in [0, 1] the fraction of the segment
+    travelled at contact, or (None, -1) if the path is clear. A start point
+    already inside a box reports t = 0.
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    count = centers.shape[0]
+    if not count:
+        return None, -1
+    start = [float(v) for v in start]
+    direction = [float(e) - s for e, s in zip(end, start)]
+
+    t_enter = np.zeros(count)
+    t_exit = np.ones(count)
+    for axis in range(3):
+        offset = centers[:, axis] - start[axis]
+        d = direction[axis]
+        if d == 0.0:
+            # Not moving on this axis: the slab either always or never contains us
+            t_exit[np.abs(offset) >= half_extent] = -1.0
+            continue
+        inv = 1.0 / d
+        near = (offset - half_extent) * inv
+        far = (offset + half_extent) * inv
+        if d < 0.0:
+            near, far = far, near
+        np.maximum(t_enter, near, out=t_enter)
+        np.minimum(t_exit, far, out=t_exit)
+
+    # Starting from [0, 1] clips each overlap to the segment; the strict
+    # comparison rejects grazing contacts and moves ending exactly on a face.
+    hit = t_enter < t_exit
+    if not hit.any():
+        return None, -1
+    t_contact = np.where(hit, t_enter, np.inf)
+    index = int(t_contact.argmin())
+    return float(t_contact[index]), index
+
+
+def segment_sphere_first_hit(start, end, centers, radius=ARM_CLEARANCE):
+    """Like segment_aabb_first_hit, for open spheres of the given radius."""
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    if not centers.shape[0]:
+        return None, -1
+    start = np.asarray(start, dtype=float)
+    direction = np.asarray(end, dtype=float) - start
+    offset = start - centers
+
+    a = direction @ direction
+    c = np.einsum("ij,ij->i", offset, offset) - radius * radius
+    if a == 0.0:
+        inside = c < 0.0
+        return (0.0, int(inside.argmax())) if inside.any() else (None, -1)
+    b = offset @ direction
+    disc = b * b - a * c
+    with np.errstate(invalid="ignore"):
+        root = np.sqrt(disc)
+    t_enter = (-b - root) / a
+    t_exit = (-b + root) / a
+
+    hit = (disc > 0.0) & (t_exit > 0.0) & (t_enter <= 1.0)
+    if not hit.any():
+        return None, -1
+    t_contact = np.where(hit, np.maximum(t_enter, 0.0), np.inf)
+    index = int(t_contact.argmin())
+    return float(t_contact[index]), index
+
+
+def sweep_stop_point(start, end, centers, clearance=ARM_CLEARANCE, shape="box"):
+    """Move from start toward end and stop at the first obstacle contact.
+
+    Returns (stop_point, index) where stop_point is a tuple and index is the
+    obstacle that was hit, or -1 if the full move was possible.
+    """
+    if shape == "box":
+        t, index = segment_aabb_first_hit(start, end, centers, clearance)
+    elif shape == "sphere":
+        t, index = segment_sphere_first_hit(start, end, centers, clearance)
+    else:
+        raise ValueError(f"Unknown obstacle shape: {shape}")
+
+    if t is None:
+        return tuple(float(v) for v in end), -1
+    return contact_point(start, end, t), index
+
+
+def contact_point(start, end, t):
+    """Point at fraction t of start->end, pulled back by CONTACT_MARGIN."""
+    length = sum((float(e) - float(s)) ** 2 for s, e in zip(start, end)) ** 0.5
+    t = max(t - CONTACT_MARGIN / length, 0.0) if length else 0.0
+    return tuple(float(s) + (float(e) - float(s)) * t for s, e in zip(start, end))
+
+
+def segments_aabb_first_hit(starts, ends, centers, present=None, half_extent=ARM_CLEARANCE):
+    """segment_aabb_first_hit for a batch of B segments, each with its own boxes.
+
+    starts and ends are (B, 3), centers (B, K, 3) and the optional (B, K)
+    ``present`` mask drops unused box slots. Returns (t, index) arrays of
+    shape (B,), with t = inf and index = -1 where the path is clear.
+    """
+    starts = np.asarray(starts, dtype=float)
+    direction = (np.asarray(ends, dtype=float) - starts)[:, None, :]
+    offset = np.asarray(centers, dtype=float) - starts[:, None, :]
+    moving = direction != 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near = (offset - half_extent) / direction
+        far = (offset + half_extent) / direction
+    # Not moving on an axis: the slab either always or never contains the segment
+    inside = np.abs(offset) < half_extent
+    lo = np.where(moving, np.minimum(near, far), np.where(inside, -np.inf, np.inf))
+    hi = np.where(moving, np.maximum(near, far), np.where(inside, np.inf, -np.inf))
+    # Pairwise over the three axes: NumPy reductions along a length-3 axis are slow
+    t_enter = np.maximum(np.maximum(np.maximum(lo[..., 0], lo[..., 1]), lo[..., 2]), 0.0)
+    t_exit = np.minimum(np.minimum(np.minimum(hi[..., 0], hi[..., 1]), hi[..., 2]), 1.0)
+    hit = t_enter < t_exit
+    if present is not None:
+        hit &= present
+    t_contact = np.where(hit, t_enter, np.inf)
+    index = t_contact.argmin(axis=1) if t_contact.shape[1] else np.zeros(len(starts), dtype=np.int64)
+    t = t_contact[np.arange(len(starts)), index] if t_contact.shape[1] else np.full(len(starts), np.inf)
+    return t, np.where(np.isfinite(t), index, -1)
+
+
+def sweep_stop_points(starts, ends, centers, present=None, clearance=ARM_CLEARANCE):
+    """sweep_stop_point for a batch of moves; returns (B, 3) stop points and hit indices."""
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    t, index = segments_aabb_first_hit(starts, ends, centers, present, clearance)
+    length = np.sqrt(((ends - starts) ** 2).sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pulled = np.maximum(t - CONTACT_MARGIN / length, 0.0)
+    t = np.where(index < 0, 1.0, np.where(length > 0, pulled, 0.0))
+    return starts + (ends - starts) * t[:, None], index
@@ -0,0 +1,239 @@
+# simulation/distance_field.py
+
+import copy
+import itertools
+import math
+
+import numpy as np
+
+# Refuse to allocate a field larger than this unless the caller raises the limit
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Nodes per side of the blocks the exact build solves at once
+BLOCK = 4
+
+# Above this many new obstacles an incremental update costs more than a rebuild
+INCREMENTAL_LIMIT = 32
+
+_CORNERS = np.array(list(itertools.product((0, 1), repeat=3)))
+_CORNER_LIST = _CORNERS.tolist()
+
+
+class DistanceField:
+    """Euclidean distance to the nearest obstacle, sampled on a lattice.
+
+    Node (i, j, k) sits at ``min_bound + (i, j, k) * resolution`` and holds
+    the exact distance to its nearest obstacle center, so a clearance query
+    is a trilinear lookup of the 8 surrounding nodes instead of a search.
+    Because distance changes by at most the distance moved, each corner
+    also gives a guaranteed lower bound on the true clearance; callers that
+    need exact answers only fall back to a real search when that bound is
+    too small to decide.
+    """
+    # float64 distance + int32 index of the nearest obstacle
+    BYTES_PER_NODE = 12
+
+    def __init__(self, boundary, resolution=0.05, max_bytes=DEFAULT_MAX_BYTES):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        needed = self.estimate_bytes(boundary, resolution)
+        if max_bytes is not None and needed > max_bytes:
+            raise MemoryError(f"Distance field needs {needed:,} bytes, over the {max_bytes:,} byte limit")
+        self.min_bound = np.asarray(boundary[0], dtype=float)
+        self.resolution = float(resolution)
+        self.shape = self.lattice_shape(boundary, resolution)
+        self.distance = np.full(self.shape, np.inf)
+        self.nearest = np.full(self.shape, -1, dtype=np.int32)
+        self._origin = self.min_bound.tolist()
+        self._axes = [self.min_bound[a] + np.arange(n) * self.resolution for a, n in enumerate(self.shape)]
+        self._centers = np.empty((0, 3))
+        # (id, generation, count) of the ObstacleWorld last synced
+        self._source = None
+
+    @staticmethod
+    def lattice_shape(boundary, resolution):
+        """Nodes per axis covering boundary (at least 2, for interpolation)."""
+        min_bound, max_bound = boundary
+        extent = np.asarray(max_bound, dtype=float) - np.asarray(min_bound, dtype=float)
+        return tuple(max(int(n), 2) for n in np.floor(extent / resolution + 1e-9) + 1)
+
+    @classmethod
+    def estimate_bytes(cls, boundary, resolution):
+        """Memory a field over boundary at this resolution would allocate."""
+        return int(np.prod(cls.lattice_shape(boundary, resolution))) * cls.BYTES_PER_NODE
+
+    @property
+    def nbytes(self):
+        return self.distance.nbytes + self.nearest.nbytes
+
+    def __len__(self):
+        return self._centers.shape[0]
+
+    # -------------------------
+    # Building and updates
+    # -------------------------
+    def sync(self, world):
+        """Bring the field up to date with an ObstacleWorld; True if anything changed.
+
+        Obstacles appended since the last sync are folded in incrementally;
+        after a clear() (or for a different world) the field is rebuilt.
+        """
+        state = (id(world), world.generation, len(world))
+        if state == self._source:
+            return False
+        if self._source is not None and self._source[:2] == state[:2] and state[2] >= self._source[2]:
+            self.add_obstacles(world.centers[self._source[2]:])
+        else:
+            self._centers = np.array(world.centers, dtype=float).reshape(-1, 3)
+            self.rebuild()
+        self._source = state
+        return True
+
+    def fork(self, world):
+        """Copy-on-write duplicate tracking ``world``, a fork of the world last synced.
+
+        The lattice arrays are shared read-only until either field updates.
+        """
+        self.distance.flags.writeable = False
+        self.nearest.flags.writeable = False
+        twin = copy.copy(self)
+        if self._source is not None:
+            twin._source = (id(world),) + self._source[1:]
+        return twin
+
+    def _own_arrays(self):
+        if not self.distance.flags.writeable:
+            self.distance = self.distance.copy()
+            self.nearest = self.nearest.copy()
+
+    def add_obstacles(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not points.shape[0]:
+            return
+        first = self._centers.shape[0]
+        self._centers = np.concatenate((self._centers, points))
+        if points.shape[0] > INCREMENTAL_LIMIT:
+            self.rebuild()
+            return
+        self._own_arrays()
+        xs, ys, zs = self._axes
+        for offset, (px, py, pz) in enumerate(points.tolist()):
+            d2 = ((xs[:, None, None] - px) ** 2 + (ys[None, :, None] - py) ** 2
+                  + (zs[None, None, :] - pz) ** 2)
+            closer = d2 < self.distance ** 2
+            self.distance[closer] = np.sqrt(d2[closer])
+            self.nearest[closer] = first + offset
+
+    def rebuild(self):
+        """Recompute every node exactly, one BLOCK^3 block of nodes at a time.
+
+        Obstacles are bucketed into a grid whose cells line up with the
+        blocks. A block gathers the buckets in a cube of cells around it; if
+        the nearest of those is d0 from the block's center and the block's
+        half-diagonal is r, every node's true nearest obstacle is within
+        d0 + r of the block, so once the cube reaches that far the block is
+        solved with one matrix product against what it gathered.
+        """
+        self._own_arrays()
+        self.distance.fill(np.inf)
+        self.nearest.fill(-1)
+        centers = self._centers
+        if not centers.shape[0]:
+            return
+        cell = BLOCK * self.resolution
+        dims = np.array([-(-n // BLOCK) for n in self.shape])
+        # Obstacles outside the lattice go to the border cells, which keeps the cube test valid
+        ijk = np.clip(np.floor((centers - self.min_bound) / cell).astype(np.int64), 0, dims - 1)
+        keys = (ijk[:, 0] * dims[1] + ijk[:, 1]) * dims[2] + ijk[:, 2]
+        order = np.argsort(keys, kind="stable")
+        runs = np.searchsorted(keys[order], np.arange(dims.prod() + 1)).tolist()
+        sq_centers = np.einsum("ij,ij->i", centers, centers)
+        nx, ny, nz = dims.tolist()
+        max_m = int(dims.max())
+
+        def gather(a, b, c, m):
+            parts = []
+            z0, z1 = max(c - m, 0), min(c + m, nz - 1)
+            for x in range(max(a - m, 0), min(a + m, nx - 1) + 1):
+                for y in range(max(b - m, 0), min(b + m, ny - 1) + 1):
+                    row = (x * ny + y) * nz
+                    if runs[row + z1 + 1] > runs[row + z0]:
+                        parts.append(order[runs[row + z0]:runs[row + z1 + 1]])
+            return np.concatenate(parts) if parts else order[:0]
+
+        for a, b, c in itertools.product(range(nx), range(ny), range(nz)):
+            block = (slice(a * BLOCK, (a + 1) * BLOCK), slice(b * BLOCK, (b + 1) * BLOCK),
+                     slice(c * BLOCK, (c + 1) * BLOCK))
+            xs, ys, zs = (axis[s] for axis, s in zip(self._axes, block))
+            lo = np.array([xs[0], ys[0], zs[0]])
+            hi = np.array([xs[-1], ys[-1], zs[-1]])
+            center = (lo + hi) / 2
+            r = 0.5 * float(np.linalg.norm(hi - lo))
+            m = 1
+            while True:
+                candidates = gather(a, b, c, m)
+                if m >= max_m:
+                    break
+                if not candidates.size:
+                    m *= 2
+                    continue
+                d0 = float(np.sqrt(((centers[candidates] - center) ** 2).sum(axis=1).min()))
+                if d0 + r <= m * cell:
+                    break
+                m = math.ceil((d0 + r) / cell)
+            nodes = np.stack(np.meshgrid(xs, ys, zs, indexing="ij"), axis=-1).reshape(-1, 3)
+            # |n - c|^2 = |n|^2 - 2 n.c + |c|^2 as one matrix product
+            d2 = sq_centers[candidates] - 2.0 * (nodes @ centers[candidates].T)
+            best = candidates[d2.argmin(axis=1)]
+            shape = (len(xs), len(ys), len(zs))
+            # Distances to the winners are recomputed directly, free of cancellation
+            self.distance[block] = np.sqrt(((nodes - centers[best]) ** 2).sum(axis=1)).reshape(shape)
+            self.nearest[block] = best.reshape(shape)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def lookup(self, points):
+        """Trilinear distance estimates and guaranteed lower bounds for (N, 3) points."""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        rel = (points - self.min_bound) / self.resolution
+        base = np.clip(np.floor(rel).astype(np.int64), 0, np.asarray(self.shape) - 2)
+        corners = base[:, None, :] + _CORNERS                       # (N, 8, 3)
+        values = self.distance[corners[..., 0], corners[..., 1], corners[..., 2]]
+        frac = np.clip(rel - base, 0.0, 1.0)[:, None, :]
+        weights = np.where(_CORNERS, frac, 1.0 - frac).prod(axis=2)
+        with np.errstate(invalid="ignore"):
+            estimate = np.where(np.isinf(values).any(axis=1), np.inf, (weights * values).sum(axis=1))
+        offsets = self.min_bound + corners * self.resolution - points[:, None, :]
+        bound = (values - np.sqrt((offsets ** 2).sum(axis=2))).max(axis=1)
+        return estimate, bound
+
+    def _lookup_one(self, point):
+        """lookup() for a single point, in plain Python to skip array overhead."""
+        res = self.resolution
+        item = self.distance.item
+        base, frac, origin = [], [], []
+        for axis in range(3):
+            rel = (float(point[axis]) - self._origin[axis]) / res
+            i = min(max(math.floor(rel), 0), self.shape[axis] - 2)
+            base.append(i)
+            frac.append(min(max(rel - i, 0.0), 1.0))
+            origin.append(self._origin[axis] + i * res - float(point[axis]))
+        estimate, bound = 0.0, -math.inf
+        for di, dj, dk in _CORNER_LIST:
+            value = item(base[0] + di, base[1] + dj, base[2] + dk)
+            weight = ((frac[0] if di else 1.0 - frac[0]) * (frac[1] if dj else 1.0 - frac[1])
+                      * (frac[2] if dk else 1.0 - frac[2]))
+            estimate += weight * value if weight else 0.0
+            gap = math.sqrt((origin[0] + di * res) ** 2 + (origin[1] + dj * res) ** 2
+                            + (origin[2] + dk * res) ** 2)
+            bound = max(bound, value - gap)
+        return estimate, bound
+
+    def distance_at(self, point):
+        """Interpolated distance to the nearest obstacle (within ~resolution)."""
+        return self._lookup_one(point)[0]
+
+    def lower_bound(self, point):
+        """A distance the nearest obstacle is guaranteed to be at least as far as."""
+        return self._lookup_one(point)[1]
@@ -0,0 +1,116 @@
+# simulation/fleet.py
+
+import numpy as np
+
+
+class RobotFleet:
+    """Many robots simulated together as NumPy arrays.
+
+    Mirrors the RobotSim API, but every call acts on the whole fleet, or on
+    the robots selected by an optional boolean ``mask``, as one vectorized
+    operation. Per-robot arguments (distances, targets) may be scalars or
+    arrays with one entry per robot. When ``boundary`` is set, moved robots
+    are clamped into it.
+    """
+    def __init__(self, size, boundary=None):
+        self.size = int(size)
+        self.positions = np.zeros((self.size, 3))
+        self.walking = np.zeros(self.size, dtype=bool)
+        self.crouched = np.zeros(self.size, dtype=bool)
+        self.gripper_blocked = np.zeros(self.size, dtype=bool)
+        self.holding_object = np.zeros(self.size, dtype=bool)
+        self.velocities = np.zeros((self.size, 3))
+        self.accelerations = np.zeros((self.size, 3))
+        self.tick_rate = 1000.0
+        self.sim_time = 0.0
+        # ((min_x, min_y, min_z), (max_x, max_y, max_z)), or None if unbounded
+        self.boundary = boundary
+
+    def __len__(self):
+        return self.size
+
+    def _mask(self, mask):
+        return np.ones(self.size, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    # Position
+    def set_positions(self, positions, mask=None):
+        positions = np.broadcast_to(np.asarray(positions, dtype=float), self.positions.shape)
+        if mask is None:
+            self.positions[:] = positions
+        else:
+            mask = self._mask(mask)
+            self.positions[mask] = positions[mask]
+
+    def clamp_to_boundary(self, mask=None):
+        if self.boundary is None:
+            return
+        min_bound, max_bound = self.boundary
+        clamped = np.clip(self.positions, min_bound, max_bound)
+        if mask is None:
+            self.positions[:] = clamped
+        else:
+            np.copyto(self.positions, clamped, where=self._mask(mask)[:, None])
+
+    def _translate(self, axis, delta, mask):
+        if mask is None:
+            self.positions[:, axis] += delta
+        else:
+            self.positions[:, axis] += np.where(self._mask(mask), delta, 0.0)
+        self.clamp_to_boundary(mask)
+
+    # Motion commands and time integration
+    def set_velocity(self, velocity, mask=None):
+        velocity = np.broadcast_to(np.asarray(velocity, dtype=float), self.velocities.shape)
+        np.copyto(self.velocities, velocity, where=self._mask(mask)[:, None])
+
+    def stop(self, mask=None):
+        keep = ~self._mask(mask)[:, None]
+        self.velocities *= keep
+        self.accelerations *= keep
+
+    def step(self, dt=None):
+        """Advance every robot one tick with semi-implicit Euler (see RobotSim.step)."""
+        if dt is None:
+            dt = 1.0 / self.tick_rate
+        self.velocities += self.accelerations * dt
+        self.positions += self.velocities * dt
+        self.clamp_to_boundary()
+        self.sim_time += dt
+
+    # Walking
+    def start_walking(self, mask=None):
+        self.walking |= self._mask(mask)
+
+    def crouch_until_chest_touches_ground(self, mask=None):
+        self.crouched |= self._mask(mask)
+
+    def move_forward(self, distance, mask=None):
+        # Move along Y-axis for forward
+        self._translate(1, distance, mask)
+
+    def move_backward(self, distance, mask=None):
+        # Move along Y-axis for backward
+        self._translate(1, -np.asarray(distance, dtype=float), mask)
+
+    # Pick and Place
+    def pick_object(self, mask=None):
+        """Try to pick with the selected robots; returns the per-robot result."""
+        mask = self._mask(mask)
+        success = mask & ~self.gripper_blocked
+        self.holding_object[mask] = success[mask]
+        return success
+
+    def move_object_to(self, targets, mask=None):
+        """Move the selected robots that hold an object; returns who moved."""
+        moving = self._mask(mask) & self.holding_object
+        targets = np.broadcast_to(np.asarray(targets, dtype=float), self.positions.shape)
+        np.copyto(self.positions, targets, where=moving[:, None])
+        self.clamp_to_boundary(moving)
+        return moving
+
+    # Gripper state
+    def block_gripper(self, mask=None):
+        self.gripper_blocked |= self._mask(mask)
+
+    def unblock_gripper(self, mask=None):
+        self.gripper_blocked &= ~self._mask(mask)
@@ -0,0 +1,282 @@
+# simulation/fuzz.py
+
+import time
+
+import numpy as np
+
+from simulation.collision import ARM_CLEARANCE, CONTACT_MARGIN, segments_aabb_first_hit, sweep_stop_points
+from simulation.fleet import RobotFleet
+from simulation.obstacles import ObstacleWorld
+from simulation.robot_sim import RobotSim
+
+# Property evaluations one shrink may spend
+SHRINK_BUDGET = 2000
+
+# Tolerance for comparing positions computed along different code paths
+EPSILON = 1e-9
+
+# Rows of each batch also run through the scalar path the steps take
+REFERENCE_SAMPLE = 64
+
+
+class Counterexample:
+    """A failing case after shrinking: which invariant broke, and the smallest input found."""
+    def __init__(self, invariant, case, shrink_steps):
+        self.invariant = invariant
+        self.case = case
+        self.shrink_steps = shrink_steps
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={np.round(value, 12).tolist()}" for name, value in self.case.items())
+        return f"Counterexample({self.invariant!r}, {fields}, shrink_steps={self.shrink_steps})"
+
+
+class FuzzReport:
+    """Outcome of one fuzzing run."""
+    def __init__(self, name):
+        self.name = name
+        self.cases = 0
+        # Generated cases that violated a precondition and were not checked
+        self.discarded = 0
+        self.elapsed = 0.0
+        self.counterexamples = []
+
+    @property
+    def cases_per_sec(self):
+        return self.cases / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def ok(self):
+        return not self.counterexamples
+
+    def __repr__(self):
+        lines = [f"FuzzReport({self.name}: cases={self.cases}, discarded={self.discarded}, "
+                 f"cases/sec={self.cases_per_sec:,.0f}, counterexamples={len(self.counterexamples)})"]
+        lines.extend(f"  {example!r}" for example in self.counterexamples)
+        return "\n".join(lines)
+
+
+# -------------------------
+# Shrinking
+# -------------------------
+def _simpler(value):
+    """Candidate replacements for a number, simplest first."""
+    for candidate in (0.0, float(round(value)), round(value, 1), round(value, 2)):
+        if candidate != value:
+            yield candidate
+
+
+def shrink(case, still_fails, budget=SHRINK_BUDGET):
+    """Greedily minimise a failing case; returns (case, steps accepted).
+
+    ``case`` maps names to arrays. Like Hypothesis, first delete rows of
+    the multi-row arrays (obstacles) in halving chunks, then replace each
+    number with a simpler one (0, an integer, fewer decimals), keeping
+    every change that still fails, until a full pass changes nothing.
+    """
+    case = {name: np.array(value, dtype=float) for name, value in case.items()}
+    steps = 0
+    calls = 0
+
+    def attempt(candidate):
+        nonlocal calls
+        calls += 1
+        return still_fails(candidate)
+
+    changed = True
+    while changed and calls < budget:
+        changed = False
+        for name, value in case.items():
+            if value.ndim < 2:
+                continue
+            chunk = len(value) // 2 or 1
+            while chunk and calls < budget:
+                start = 0
+                while start < len(case[name]) and calls < budget:
+                    candidate = dict(case, **{name: np.delete(case[name], slice(start, start + chunk), axis=0)})
+                    if attempt(candidate):
+                        case, changed, steps = candidate, True, steps + 1
+                    else:
+                        start += chunk
+                chunk //= 2
+        for name in case:
+            for position in np.ndindex(case[name].shape):
+                if not np.isfinite(case[name][position]):
+                    continue
+                for candidate_value in _simpler(float(case[name][position])):
+                    if calls >= budget:
+                        break
+                    value = case[name].copy()
+                    value[position] = candidate_value
+                    candidate = dict(case, **{name: value})
+                    if attempt(candidate):
+                        case, changed, steps = candidate, True, steps + 1
+                        break
+    return case, steps
+
+
+def _fuzz(report, cases, batch, generate, check):
+    """Run check over generated batches, shrinking the first failure of each invariant.
+
+    ``generate(n)`` returns a dict of arrays with n rows each and ``check``
+    returns one code per row: 0 passes, -1 is discarded, anything else
+    indexes ``check.invariants``.
+    """
+    start = time.perf_counter()
+    found = set()
+    while report.cases < cases:
+        arrays = generate(min(batch, cases - report.cases))
+        codes = check(arrays)
+        report.discarded += int((codes < 0).sum())
+        report.cases += len(codes)
+        for code in np.unique(codes[codes > 0]).tolist():
+            if code in found:
+                continue
+            found.add(code)
+            row = int(np.flatnonzero(codes == code)[0])
+            case = {name: value[row] for name, value in arrays.items()}
+
+            def still_fails(candidate, code=code):
+                return check({name: value[None] for name, value in candidate.items()})[0] == code
+
+            shrunk, steps = shrink(case, still_fails)
+            report.counterexamples.append(Counterexample(check.invariants[code], shrunk, steps))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+# -------------------------
+# Workspace boundary
+# -------------------------
+def fleet_attempts(starts, targets, boundary):
+    """Default system under test: the whole batch as one RobotFleet moved to targets and clamped."""
+    fleet = RobotFleet(len(starts), boundary=boundary)
+    fleet.set_positions(starts)
+    fleet.set_positions(targets)
+    fleet.clamp_to_boundary()
+    return fleet.positions
+
+
+def robot_attempts(starts, targets, boundary):
+    """RobotSim.attempt_move, the safety steps' move, one case at a time."""
+    sim = RobotSim()
+    sim.boundary = boundary
+    reached = np.empty_like(targets)
+    for row, (start, target) in enumerate(zip(starts.tolist(), targets.tolist())):
+        sim.set_position(*start)
+        sim.attempt_move(*target)
+        reached[row] = sim.object_position
+    return reached
+
+
+def fuzz_boundary(boundary, cases=10_000, seed=0, batch=4096, attempt=fleet_attempts,
+                  reference_sample=REFERENCE_SAMPLE):
+    """Fuzz "a move never leaves the workspace, and goes as far toward the target as it allows".
+
+    ``attempt(starts, targets, boundary)`` returns the (B, 3) positions
+    reached for a whole batch; they are checked against np.clip of the
+    targets, and a random sample of each batch against RobotSim.attempt_move.
+    Targets reach up to one workspace width outside the boundary and are
+    biased toward the faces and corners.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = (np.asarray(b, dtype=float) for b in boundary)
+    span = high - low
+
+    def generate(n):
+        starts = rng.uniform(low, high, size=(n, 3))
+        targets = rng.uniform(low - span, high + span, size=(n, 3))
+        edge = rng.random((n, 3))
+        targets = np.where(edge < 0.1, low, np.where(edge < 0.2, high, targets))
+        return {"start": starts, "target": targets}
+
+    def check(arrays):
+        reached = attempt(arrays["start"], arrays["target"], boundary)
+        outside = ((reached < low - EPSILON) | (reached > high + EPSILON)).any(axis=1)
+        short = (np.abs(reached - np.clip(arrays["target"], low, high)) > EPSILON).any(axis=1)
+        codes = np.where(outside, 1, np.where(short, 2, 0))
+        sample = rng.choice(len(codes), size=min(reference_sample, len(codes)), replace=False)
+        expected = robot_attempts(arrays["start"][sample], arrays["target"][sample], boundary)
+        differs = (np.abs(expected - reached[sample]) > EPSILON).any(axis=1)
+        codes[sample[differs & (codes[sample] == 0)]] = 3
+        return codes
+    check.invariants = {1: "within boundaries", 2: "moves to the nearest allowed point",
+                        3: "matches RobotSim.attempt_move"}
+
+    return _fuzz(FuzzReport("boundary"), cases, batch, generate, check)
+
+
+# -------------------------
+# Arm stops before obstacles
+# -------------------------
+def fuzz_arm_stops(boundary, cases=10_000, seed=0, batch=2048, obstacles=16, stop=sweep_stop_points,
+                   clearance=ARM_CLEARANCE, reference_sample=REFERENCE_SAMPLE):
+    """Fuzz "the arm stops before the first obstacle on its sweep, and not earlier".
+
+    ``stop(starts, targets, centers, present)`` returns (B, 3) stop
+    points and hit indices, like sweep_stop_points. Every stop point is
+    checked against the invariants in one vectorized pass, and a random
+    sample of each batch against ObstacleWorld.stop_point, the scalar path
+    the safety steps take. Each case has up
+    to ``obstacles`` obstacles, half of them scattered near the sweep and
+    some exactly grazing it, and a share of the moves run along an axis.
+    Cases starting inside an obstacle's clearance box are discarded.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = (np.asarray(b, dtype=float) for b in boundary)
+
+    def generate(n):
+        starts = rng.uniform(low, high, size=(n, 3))
+        targets = rng.uniform(low, high, size=(n, 3))
+        # Moves along an axis exercise the zero-direction slabs
+        targets = np.where(rng.random((n, 3)) < 0.15, starts, targets)
+        centers = rng.uniform(low, high, size=(n, obstacles, 3))
+        near = obstacles // 2
+        along = starts[:, None] + (targets - starts)[:, None] * rng.random((n, near, 1))
+        centers[:, :near] = along + rng.normal(0.0, 1.5 * clearance, size=(n, near, 3))
+        # A few exactly one clearance off the path on one axis: grazing contacts
+        axis = rng.integers(3, size=n)
+        centers[np.arange(n), 0, axis] = along[np.arange(n), 0, axis] + clearance
+        # Unused obstacle slots are NaN, so cases with fewer obstacles share the batch
+        counts = rng.integers(0, obstacles + 1, size=n)
+        centers[np.arange(obstacles) >= counts[:, None]] = np.nan
+        return {"start": starts, "target": targets, "obstacles": centers}
+
+    def check(arrays):
+        starts, targets, centers = arrays["start"], arrays["target"], arrays["obstacles"]
+        present = ~np.isnan(centers).any(axis=2)
+        stops = np.asarray(stop(starts, targets, centers, present)[0], dtype=float)
+        codes = np.zeros(len(starts), dtype=np.int64)
+        move = targets - starts
+        # On the segment: stop = start + s * move for one s in [0, 1]
+        length2 = (move * move).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(length2 > 0, ((stops - starts) * move).sum(axis=1) / length2, 1.0)
+        off = np.abs(starts + move * s[:, None] - stops).max(axis=1) > EPSILON
+        codes[off | (s < -EPSILON) | (s > 1 + EPSILON)] = 3
+        # Nothing entered between start and stop
+        t, _ = segments_aabb_first_hit(starts, stops, centers, present, clearance)
+        codes[(codes == 0) & np.isfinite(t)] = 1
+        # Stopped short: a hair further along must touch an obstacle
+        length = np.sqrt(length2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(length > 0, 4 * CONTACT_MARGIN / length, 0.0)
+        beyond = starts + move * np.minimum(s + step, 1.0)[:, None]
+        early = (s < 1 - EPSILON) & ~np.isfinite(segments_aabb_first_hit(stops, beyond, centers, present,
+                                                                         clearance)[0])
+        codes[(codes == 0) & early] = 2
+        # Reference: the scalar broad phase and slab test, on a sample of the batch
+        sample = rng.choice(len(starts), size=min(reference_sample, len(starts)), replace=False)
+        for row in sample[codes[sample] == 0].tolist():
+            expected, _ = ObstacleWorld(centers[row][present[row]], clearance).stop_point(starts[row], targets[row])
+            if np.abs(np.asarray(expected) - stops[row]).max() > EPSILON:
+                codes[row] = 4
+        # Precondition: the arm does not start inside a clearance box
+        with np.errstate(invalid="ignore"):
+            inside = ((np.abs(centers - starts[:, None]) < clearance).all(axis=2) & present).any(axis=1)
+        codes[inside] = -1
+        return codes
+    check.invariants = {1: "stops before obstacle", 2: "does not stop short", 3: "stays on its path",
+                        4: "matches ObstacleWorld.stop_point"}
+
+    return _fuzz(FuzzReport("arm stops"), cases, batch, generate, check)
@@ -0,0 +1,204 @@
+# simulation/kinematics.py
+
+import math
+
+import numpy as np
+
+
+class ArmChain:
+    """Serial arm of revolute joints described by standard DH parameters.
+
+    Each joint is (a, alpha, d, theta_offset): link length, link twist,
+    link offset and a constant added to the joint angle. Positions are
+    relative to the arm's base. Every method is batched: joint angles may
+    have any leading shape (..., dof).
+    """
+    def __init__(self, dh, home=None, joint_limits=None):
+        dh = np.asarray(dh, dtype=float).reshape(-1, 4)
+        self.a, self.alpha, self.d, self.offset = dh.T
+        self.dof = dh.shape[0]
+        self._cos_alpha = np.cos(self.alpha)
+        self._sin_alpha = np.sin(self.alpha)
+        self.home = np.zeros(self.dof) if home is None else np.asarray(home, dtype=float)
+        # (dof, 2) array of (min, max) angles, or None for unlimited joints
+        self.joint_limits = None if joint_limits is None else np.asarray(joint_limits, dtype=float)
+
+    @classmethod
+    def default(cls):
+        """Four-joint arm: base yaw, shoulder, elbow and wrist pitch (about 1 unit reach)."""
+        return cls(
+            dh=[(0.0, math.pi / 2, 0.4, 0.0),
+                (0.5, 0.0, 0.0, 0.0),
+                (0.4, 0.0, 0.0, 0.0),
+                (0.1, 0.0, 0.0, 0.0)],
+            home=(0.0, 0.8, -1.6, 0.8),
+            joint_limits=[(-math.pi, math.pi), (-0.2, math.pi), (-2.8, 2.8), (-2.0, 2.0)],
+        )
+
+    @property
+    def reach(self):
+        """Upper bound on the distance from the base to the end effector."""
+        return float(np.sum(np.hypot(self.a, self.d)))
+
+    def _frames(self, q):
+        """Joint origins and z axes, each (..., dof + 1, 3), base frame first."""
+        q = np.asarray(q, dtype=float)
+        lead = q.shape[:-1]
+        origins = np.zeros(lead + (self.dof + 1, 3))
+        axes = np.zeros(lead + (self.dof + 1, 3))
+        # Columns of the running rotation, updated in place rather than by 3x3 products
+        x = np.zeros(lead + (3,))
+        y = np.zeros(lead + (3,))
+        z = np.zeros(lead + (3,))
+        x[..., 0] = y[..., 1] = z[..., 2] = 1.0
+        axes[..., 0, :] = z
+        theta = q + self.offset
+        cos_t, sin_t = np.cos(theta)[..., None], np.sin(theta)[..., None]
+        for i in range(self.dof):
+            c, s = cos_t[..., i, :], sin_t[..., i, :]
+            ca, sa = self._cos_alpha[i], self._sin_alpha[i]
+            # Rz(theta): rotate x, y about z; then Rx(alpha): rotate y, z about the new x
+            x, y = c * x + s * y, c * y - s * x
+            origins[..., i + 1, :] = origins[..., i, :] + self.a[i] * x + self.d[i] * z
+            y, z = ca * y + sa * z, ca * z - sa * y
+            axes[..., i + 1, :] = z
+        return origins, axes
+
+    def forward(self, q):
+        """End-effector position(s) for joint angles q, shape (..., 3)."""
+        return self._frames(q)[0][..., -1, :]
+
+    def jacobian(self, q):
+        """End-effector position and its (..., 3, dof) Jacobian w.r.t. the joints."""
+        origins, axes = self._frames(q)
+        end = origins[..., -1, :]
+        # Revolute joint i moves the end effector by z_i x (p_end - p_i)
+        columns = np.cross(axes[..., :-1, :], end[..., None, :] - origins[..., :-1, :])
+        return end, np.swapaxes(columns, -1, -2)
+
+    def clip(self, q):
+        if self.joint_limits is None:
+            return q
+        return np.clip(q, self.joint_limits[:, 0], self.joint_limits[:, 1])
+
+
+class IKResult:
+    """Joint solutions from one IKSolver.solve() call."""
+    def __init__(self, q, converged, iterations, error):
+        self.q = q
+        self.converged = converged
+        self.iterations = iterations
+        self.error = error
+
+    def __len__(self):
+        return len(self.q)
+
+    @property
+    def success_rate(self):
+        return float(self.converged.mean()) if len(self.converged) else 1.0
+
+    def __repr__(self):
+        return (f"IKResult(targets={len(self)}, converged={int(self.converged.sum())}, "
+                f"mean_iterations={self.iterations.mean() if len(self) else 0:.1f}, "
+                f"max_error={self.error.max() if len(self) else 0:.2e})")
+
+
+class IKSolver:
+    """Damped-least-squares position IK for an ArmChain, solving many targets at once.
+
+    Each iteration takes dq = J^T (J J^T + damping^2 I)^-1 e for every
+    unconverged target together; the 3x3 systems are solved as one batch.
+    With ``warm_start`` a solve starts from the previous call's solutions:
+    row for row when the batch has the same size (a sweep moving through
+    the workspace), otherwise from the last solution found.
+    """
+    def __init__(self, chain, damping=0.05, tolerance=1e-6, max_iterations=200, max_step=0.5,
+                 restarts=3, seed=0):
+        self.chain = chain
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        # Largest joint change (radians) a single iteration may take
+        self.max_step = max_step
+        self.restarts = restarts
+        self.seed = seed
+        self.last = None
+
+    def reset(self):
+        """Forget the warm-start solution."""
+        self.last = None
+
+    def _initial(self, count, initial, warm_start):
+        if initial is not None:
+            return np.broadcast_to(np.asarray(initial, dtype=float), (count, self.chain.dof)).copy()
+        if warm_start and self.last is not None:
+            if self.last.shape[0] == count:
+                return self.last.copy()
+            return np.tile(self.last[-1], (count, 1))
+        return np.tile(self.chain.home, (count, 1))
+
+    def _iterate(self, q, targets, rows):
+        """Run DLS on q[rows] in place; returns the error of those rows.
+
+        A row leaves the loop once it converges or stops improving (stuck
+        against a joint limit or in a local minimum), and ends on the
+        best joint angles it reached, so q[rows] has exactly that error.
+        """
+        iterations = np.zeros(len(rows), dtype=np.int64)
+        error = np.full(len(rows), np.inf)
+        best = q[rows].copy()
+        active = np.arange(len(rows))
+        damping2 = self.damping ** 2
+        for _ in range(self.max_iterations + 1):
+            end, J = self.chain.jacobian(q[rows[active]])
+            e = targets[rows[active]] - end
+            norm = np.sqrt((e * e).sum(axis=1))
+            improving = norm < error[active] * (1.0 - 1e-9)
+            better = active[norm < error[active]]
+            best[better] = q[rows[better]]
+            error[active] = np.minimum(norm, error[active])
+            keep = (norm > self.tolerance) & improving
+            active, e, J = active[keep], e[keep], J[keep]
+            if not active.size:
+                break
+            JJt = J @ np.swapaxes(J, 1, 2)
+            JJt[:, [0, 1, 2], [0, 1, 2]] += damping2
+            dq = np.einsum("nij,ni->nj", J, np.linalg.solve(JJt, e[..., None])[..., 0])
+            # Keep each update inside the region where the linearisation holds
+            largest = np.abs(dq).max(axis=1, keepdims=True)
+            dq *= np.minimum(1.0, self.max_step / np.maximum(largest, 1e-300))
+            moved = rows[active]
+            q[moved] = self.chain.clip(q[moved] + dq)
+            iterations[active] += 1
+        # Undo each row's last step that made it worse (or ran out of iterations)
+        q[rows] = best
+        return error, iterations
+
+    def solve(self, targets, initial=None, warm_start=True):
+        """Joint angles reaching (N, 3) base-relative targets, as an IKResult.
+
+        Targets that are not reached from the starting guess are retried
+        from up to ``restarts`` random configurations (seeded, so repeatable).
+        """
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        count = targets.shape[0]
+        q = self._initial(count, initial, warm_start)
+        rows = np.arange(count)
+        error, iterations = self._iterate(q, targets, rows)
+        rng = np.random.default_rng(self.seed)
+        low, high = (self.chain.joint_limits.T if self.chain.joint_limits is not None
+                     else (np.full(self.chain.dof, -math.pi), np.full(self.chain.dof, math.pi)))
+        for _ in range(self.restarts):
+            failed = rows[error > self.tolerance]
+            if not failed.size:
+                break
+            best = q[failed].copy()
+            q[failed] = rng.uniform(low, high, size=(failed.size, self.chain.dof))
+            retry_error, retry_iterations = self._iterate(q, targets, failed)
+            iterations[failed] += retry_iterations
+            # Keep whichever attempt got closer
+            worse = retry_error >= error[failed]
+            q[failed[worse]] = best[worse]
+            error[failed] = np.minimum(error[failed], retry_error)
+        self.last = q.copy()
+        return IKResult(q, error <= self.tolerance, iterations, error)
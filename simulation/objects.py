@@ -0,0 +1,107 @@
+# simulation/objects.py
+
+from simulation.spatial import SpatialHash
+
+# How far from the gripper a part may be and still be grasped
+GRIPPER_REACH = 0.25
+
+
+class ObjectRegistry:
+    """Parts in the workcell, each with an id, a position and a held flag.
+
+    Parts resting in the cell live in a SpatialHash with cells half a
+    gripper reach wide, so finding the part to grasp only looks at the few
+    cells around the gripper however many parts there are. A held part
+    leaves the index and travels with the gripper until it is released.
+    fork() shares the index with the copy until either side changes it.
+    """
+    def __init__(self, reach=GRIPPER_REACH):
+        self.reach = reach
+        self._index = SpatialHash(cell_size=reach / 2)
+        self._held = {}
+        self._next_id = 0
+        self._shared = False
+
+    def fork(self):
+        """Copy-on-write duplicate: O(1) now, each side copies on its first change."""
+        twin = ObjectRegistry.__new__(ObjectRegistry)
+        twin.reach = self.reach
+        twin._index = self._index
+        twin._held = self._held
+        twin._next_id = self._next_id
+        self._shared = twin._shared = True
+        return twin
+
+    def _own(self):
+        if self._shared:
+            self._index = self._index.copy()
+            self._held = dict(self._held)
+            self._shared = False
+
+    def __len__(self):
+        return len(self._index) + len(self._held)
+
+    def __contains__(self, object_id):
+        return object_id in self._index or object_id in self._held
+
+    def __iter__(self):
+        yield from self._index
+        yield from self._held
+
+    def add(self, position, object_id=None):
+        """Register a part resting at position; returns its id."""
+        self._own()
+        if object_id is None:
+            # Skip ids already given out explicitly
+            while self._next_id in self:
+                self._next_id += 1
+            object_id = self._next_id
+            self._next_id += 1
+        elif object_id in self:
+            raise ValueError(f"Object {object_id!r} is already registered")
+        self._index.insert(object_id, position)
+        return object_id
+
+    def add_many(self, positions):
+        return [self.add(position) for position in positions]
+
+    def remove(self, object_id):
+        self._own()
+        if object_id in self._held:
+            del self._held[object_id]
+        else:
+            self._index.remove(object_id)
+
+    def clear(self):
+        self._own()
+        self._index.clear()
+        self._held.clear()
+
+    def position(self, object_id):
+        if object_id in self._held:
+            return self._held[object_id]
+        return self._index.position(object_id)
+
+    def is_held(self, object_id):
+        return object_id in self._held
+
+    def nearest_free(self, point, reach=None):
+        """Id of the closest part not held, within reach of point, or None."""
+        return self._index.nearest(point, self.reach if reach is None else reach)
+
+    def attach(self, object_id):
+        """Lift a resting part off the table into the gripper."""
+        self._own()
+        self._held[object_id] = self._index.position(object_id)
+        self._index.remove(object_id)
+
+    def carry(self, object_id, position):
+        """Move a held part along with the gripper."""
+        self._own()
+        self._held[object_id] = (float(position[0]), float(position[1]), float(position[2]))
+
+    def release(self, object_id, position=None):
+        """Set a held part down at position (default: where it was carried to)."""
+        self._own()
+        held_at = self._held.pop(object_id)
+        self._index.insert(object_id, held_at if position is None else position)
@@ -0,0 +1,195 @@
+# simulation/obstacles.py
+
+import numpy as np
+
+from simulation.collision import ARM_CLEARANCE, contact_point, segment_aabb_first_hit
+
+# Relative padding of the broad phase's clearance boxes
+BROAD_PHASE_SLACK = 1e-9
+
+# Shared read-only placeholders so an empty world allocates no arrays of its own
+_NO_CENTERS = np.empty((0, 3))
+_NO_X = np.empty(0)
+_NO_ORDER = np.empty(0, dtype=np.int64)
+for _array in (_NO_CENTERS, _NO_X, _NO_ORDER):
+    _array.flags.writeable = False
+
+
+class ObstacleWorld:
+    """Point obstacles with a sweep-and-prune broad phase along the x axis.
+
+    Obstacle centers live in one growable NumPy array (insertion order),
+    alongside a copy of their x coordinates kept sorted. append() and
+    extend() only write centers; the next query merges everything added
+    since into the sorted index in one batch. Queries first cut the
+    candidate set down to an x interval with a binary search and only run
+    exact tests on what is left. It also behaves like the plain list of
+    (x, y, z) tuples the steps used before: append(), extend(), len(),
+    iteration and indexing all work. ``generation`` counts clear() calls, so
+    (generation, len) identifies the contents: between clears they only grow.
+    fork() copies a world in constant time; the centers array is shared
+    read-only and each world copies it on its first write.
+    """
+    __slots__ = ("clearance", "generation", "_centers", "_count", "_indexed", "_sorted_x", "_order")
+
+    def __init__(self, obstacles=(), clearance=ARM_CLEARANCE):
+        self.clearance = clearance
+        self.generation = 0
+        self._centers = _NO_CENTERS
+        self._count = 0
+        # Obstacles [0, _indexed) are in the sorted x index
+        self._indexed = 0
+        self._sorted_x = _NO_X
+        self._order = _NO_ORDER
+        self.extend(obstacles)
+
+    # -------------------------
+    # List-like interface
+    # -------------------------
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(map(tuple, self.centers.tolist()))
+
+    def __getitem__(self, index):
+        return tuple(self.centers[index].tolist())
+
+    def __iadd__(self, points):
+        self.extend(points)
+        return self
+
+    def __repr__(self):
+        return f"ObstacleWorld({list(self)!r})"
+
+    @property
+    def centers(self):
+        """(N, 3) view of obstacle centers in insertion order."""
+        return self._centers[:self._count]
+
+    def _reserve(self, extra):
+        needed = self._count + extra
+        capacity = self._centers.shape[0]
+        # A read-only array is shared with a fork (or a placeholder): copy before writing
+        if needed > capacity or not self._centers.flags.writeable:
+            grown = np.empty((max(needed, 16, 2 * capacity) if needed > capacity else capacity, 3))
+            grown[:self._count] = self.centers
+            self._centers = grown
+
+    def fork(self):
+        """Copy-on-write duplicate: O(1) now, each side copies on its first write."""
+        self._centers.flags.writeable = False
+        twin = ObstacleWorld.__new__(ObstacleWorld)
+        twin.clearance = self.clearance
+        twin.generation = self.generation
+        twin._centers = self._centers
+        twin._count = self._count
+        twin._indexed = self._indexed
+        # Sorted x and order arrays are only ever replaced, never written in place
+        twin._sorted_x = self._sorted_x
+        twin._order = self._order
+        return twin
+
+    def append(self, point):
+        self._reserve(1)
+        self._centers[self._count] = point
+        self._count += 1
+
+    def extend(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not points.shape[0]:
+            return
+        self._reserve(points.shape[0])
+        self._centers[self._count:self._count + points.shape[0]] = points
+        self._count += points.shape[0]
+
+    def clear(self):
+        self.generation += 1
+        self._count = 0
+        self._indexed = 0
+        self._sorted_x = _NO_X
+        self._order = _NO_ORDER
+
+    def _index(self):
+        """Merge the obstacles added since the last query into the sorted x index."""
+        if self._indexed == self._count:
+            return
+        if not self._indexed:
+            self._order = np.argsort(self.centers[:, 0], kind="stable")
+            self._sorted_x = self.centers[self._order, 0]
+        else:
+            added = np.arange(self._indexed, self._count)
+            added = added[np.argsort(self._centers[added, 0], kind="stable")]
+            x = self._centers[added, 0]
+            # After equal x already indexed, as a stable sort of the whole world would put them
+            pos = np.searchsorted(self._sorted_x, x, side="right")
+            self._sorted_x = np.insert(self._sorted_x, pos, x)
+            self._order = np.insert(self._order, pos, added)
+        self._indexed = self._count
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def _x_window(self, x_min, x_max):
+        """Indices of obstacles whose center x lies in [x_min, x_max]."""
+        self._index()
+        lo = np.searchsorted(self._sorted_x, x_min, side="left")
+        hi = np.searchsorted(self._sorted_x, x_max, side="right")
+        return self._order[lo:hi]
+
+    def overlapping(self, box_min, box_max):
+        """Indices of obstacles whose clearance box overlaps [box_min, box_max]."""
+        # Padded so rounding here never drops a box the exact narrow-phase test would hit
+        h = self.clearance * (1 + BROAD_PHASE_SLACK)
+        candidates = self._x_window(box_min[0] - h, box_max[0] + h)
+        c = self._centers[candidates]
+        keep = ((c[:, 1] > box_min[1] - h) & (c[:, 1] < box_max[1] + h)
+                & (c[:, 2] > box_min[2] - h) & (c[:, 2] < box_max[2] + h))
+        return candidates[keep]
+
+    def first_contact(self, start, end):
+        """First obstacle hit moving start->end, as (t, index) or (None, -1)."""
+        box_min = [min(s, e) for s, e in zip(start, end)]
+        box_max = [max(s, e) for s, e in zip(start, end)]
+        candidates = self.overlapping(box_min, box_max)
+        if not candidates.size:
+            return None, -1
+        t, local = segment_aabb_first_hit(start, end, self._centers[candidates], self.clearance)
+        return (t, int(candidates[local])) if t is not None else (None, -1)
+
+    def stop_point(self, start, end):
+        """Where a move start->end stops, as (point, index of obstacle hit or -1)."""
+        t, index = self.first_contact(start, end)
+        if t is None:
+            return tuple(float(v) for v in end), -1
+        return contact_point(start, end, t), index
+
+    def nearest(self, point):
+        """Closest obstacle to point, as (index, distance) or (-1, inf)."""
+        if not self._count:
+            return -1, float("inf")
+        self._index()
+        point = np.asarray(point, dtype=float)
+        px = point[0]
+        # Walk outward from the query's slot in x order, a block at a time;
+        # once the next unexamined obstacles are further away in x alone
+        # than the best match so far, nothing closer can remain.
+        n = self._count
+        pos = int(np.searchsorted(self._sorted_x, px))
+        lo = hi = pos
+        best_index, best_d2 = -1, np.inf
+        block = 64
+        while lo > 0 or hi < n:
+            new_lo, new_hi = max(lo - block, 0), min(hi + block, n)
+            candidates = np.concatenate((self._order[new_lo:lo], self._order[hi:new_hi]))
+            d2 = ((self._centers[candidates] - point) ** 2).sum(axis=1)
+            i = int(d2.argmin())
+            if d2[i] < best_d2:
+                best_index, best_d2 = int(candidates[i]), float(d2[i])
+            lo, hi = new_lo, new_hi
+            gap = min(px - self._sorted_x[lo - 1] if lo > 0 else np.inf,
+                      self._sorted_x[hi] - px if hi < n else np.inf)
+            if gap * gap >= best_d2:
+                break
+            block *= 2
+        return best_index, float(np.sqrt(best_d2))
@@ -0,0 +1,352 @@
+# simulation/physics.py
+
+import functools
+import os
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    import pybullet
+except ImportError:  # pybullet is optional; NumpyWorld is used instead
+    pybullet = None
+
+# PyBullet's default step
+DEFAULT_DT = 1.0 / 240.0
+GRAVITY = (0.0, 0.0, -9.81)
+
+# Below this approach speed a contact stops instead of bouncing
+RESTING_SPEED = 0.1
+
+# Collision shape: kind is "sphere" (size = (radius,)) or "box" (size = half extents)
+Shape = namedtuple("Shape", ["kind", "size", "mass"])
+
+
+def sphere(radius, mass=1.0):
+    return Shape("sphere", (float(radius),), float(mass))
+
+
+def box(half_extents, mass=1.0):
+    return Shape("box", tuple(float(h) for h in half_extents), float(mass))
+
+
+def _half_extents(shape):
+    return shape.size * 3 if shape.kind == "sphere" else shape.size
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_urdf(path, mtime):
+    root = ET.parse(path).getroot()
+    low, high = np.full(3, np.inf), np.full(3, -np.inf)
+    mass = 0.0
+    for link in root.iter("link"):
+        node = link.find("inertial/mass")
+        if node is not None:
+            mass += float(node.get("value", 0.0))
+        for collision in link.iter("collision"):
+            origin = collision.find("origin")
+            offset = np.zeros(3) if origin is None else np.fromstring(origin.get("xyz", "0 0 0"), sep=" ")
+            geometry = collision.find("geometry")
+            if geometry.find("box") is not None:
+                half = np.fromstring(geometry.find("box").get("size"), sep=" ") / 2
+            elif geometry.find("sphere") is not None:
+                half = np.full(3, float(geometry.find("sphere").get("radius")))
+            elif geometry.find("cylinder") is not None:
+                cylinder = geometry.find("cylinder")
+                radius = float(cylinder.get("radius"))
+                half = np.array([radius, radius, float(cylinder.get("length")) / 2])
+            else:
+                raise ValueError(f"{path}: only box, sphere and cylinder collision geometry is supported")
+            low = np.minimum(low, offset - half)
+            high = np.maximum(high, offset + half)
+    if not np.isfinite(low).all():
+        raise ValueError(f"{path}: no collision geometry")
+    # Links are merged into one box around the origin covering all of them
+    return box(np.maximum(-low, high), mass or 1.0)
+
+
+def load_urdf_shape(path):
+    """Collision Shape for a URDF file: one box bounding every link's collision geometry.
+
+    Parsed once per process and cached (re-read if the file changes).
+    """
+    path = os.path.abspath(path)
+    return _parse_urdf(path, os.path.getmtime(path))
+
+
+class _World:
+    """Fixed-timestep bookkeeping shared by the backends."""
+    def __init__(self, dt=DEFAULT_DT, gravity=GRAVITY):
+        self.dt = float(dt)
+        self.gravity = tuple(float(g) for g in gravity)
+        self.time = 0.0
+        self._pending = 0.0
+        # Bumped by reset(); states saved before it no longer apply
+        self.resets = 0
+
+    def step(self, ticks=1):
+        """Advance ``ticks`` fixed steps in one call."""
+        if ticks > 0:
+            self._step(ticks)
+            self.time += ticks * self.dt
+
+    def advance(self, duration):
+        """Step as many whole ticks as fit in duration plus any carried-over remainder."""
+        self._pending += duration
+        ticks = int(self._pending / self.dt + 1e-9)
+        self.step(ticks)
+        self._pending -= ticks * self.dt
+        return ticks
+
+    def reset(self):
+        """Remove every body and rewind time, keeping the world and its shape caches."""
+        self.time = 0.0
+        self._pending = 0.0
+        self.resets += 1
+        self._clear()
+
+    def state(self):
+        """Opaque copy of the bodies and time for restore_state(), valid until the next reset()."""
+        return (self.resets, self.time, self._save())
+
+    def restore_state(self, state):
+        resets, time, saved = state
+        if resets != self.resets:
+            raise ValueError("Physics state was saved before the world was last reset")
+        self.time = time
+        self._pending = 0.0
+        self._restore(saved)
+
+
+class NumpyWorld(_World):
+    """Pure-NumPy rigid bodies: axis-aligned boxes that translate but do not rotate.
+
+    Spheres collide as their bounding cube. Bodies fall onto a ground plane
+    at z = 0 and push each other apart; every tick is a handful of array
+    operations over all bodies at once. Kinematic bodies (infinite mass)
+    only move when set_position() is called.
+    """
+    backend = "numpy"
+
+    def __init__(self, dt=DEFAULT_DT, gravity=GRAVITY, restitution=0.2, friction=0.05, iterations=4):
+        super().__init__(dt, gravity)
+        self.restitution = restitution
+        self.iterations = iterations
+        # Fraction of horizontal speed lost per tick in ground contact
+        self.friction = friction
+        self._clear()
+
+    def _clear(self):
+        self.positions = np.empty((0, 3))
+        self.velocities = np.empty((0, 3))
+        self.half_extents = np.empty((0, 3))
+        self.inv_mass = np.empty(0)
+
+    def __len__(self):
+        return self.positions.shape[0]
+
+    def add_body(self, shape, position, kinematic=False):
+        """Add a body; returns its index."""
+        self.positions = np.vstack((self.positions, np.asarray(position, dtype=float).reshape(1, 3)))
+        self.velocities = np.vstack((self.velocities, np.zeros((1, 3))))
+        self.half_extents = np.vstack((self.half_extents, [_half_extents(shape)]))
+        self.inv_mass = np.append(self.inv_mass, 0.0 if kinematic else 1.0 / shape.mass)
+        return len(self) - 1
+
+    def load_urdf(self, path, position, kinematic=False):
+        return self.add_body(load_urdf_shape(path), position, kinematic)
+
+    def position(self, body):
+        return tuple(self.positions[body].tolist())
+
+    def set_position(self, body, position):
+        self.positions[body] = position
+
+    def velocity(self, body):
+        return tuple(self.velocities[body].tolist())
+
+    def set_velocity(self, body, velocity):
+        self.velocities[body] = velocity
+
+    def _save(self):
+        return (self.positions.copy(), self.velocities.copy(), self.half_extents.copy(), self.inv_mass.copy())
+
+    def _restore(self, saved):
+        positions, velocities, half_extents, inv_mass = saved
+        self.positions, self.velocities = positions.copy(), velocities.copy()
+        self.half_extents, self.inv_mass = half_extents.copy(), inv_mass.copy()
+
+    def _step(self, ticks):
+        dynamic = self.inv_mass > 0
+        gravity = np.asarray(self.gravity) * self.dt
+        i, j = np.triu_indices(len(self), 1)
+        pairs = dynamic[i] | dynamic[j]
+        i, j = i[pairs], j[pairs]
+        for _ in range(ticks):
+            self.velocities[dynamic] += gravity
+            self.positions[dynamic] += self.velocities[dynamic] * self.dt
+            self._ground(dynamic)
+            # Contacts are solved pairwise, so stacks need a few passes to settle
+            for _ in range(self.iterations if i.size else 0):
+                self._collide(i, j)
+                self._ground(dynamic)
+
+    def _ground(self, dynamic):
+        z, vz = self.positions[:, 2], self.velocities[:, 2]
+        low = self.half_extents[:, 2]
+        touching = dynamic & (z <= low)
+        if not touching.any():
+            return
+        z[touching] = low[touching]
+        approach = -vz[touching]
+        vz[touching] = np.where(approach > RESTING_SPEED, self.restitution * approach, 0.0)
+        self.velocities[touching, :2] *= 1.0 - self.friction
+
+    def _collide(self, i, j):
+        delta = self.positions[j] - self.positions[i]
+        penetration = self.half_extents[i] + self.half_extents[j] - np.abs(delta)
+        hit = (penetration > 0).all(axis=1)
+        if not hit.any():
+            return
+        i, j, delta, penetration = i[hit], j[hit], delta[hit], penetration[hit]
+        # Separate along the axis of least penetration
+        axis = penetration.argmin(axis=1)
+        rows = np.arange(axis.size)
+        normal = np.zeros_like(delta)
+        normal[rows, axis] = np.where(delta[rows, axis] >= 0, 1.0, -1.0)
+        depth = penetration[rows, axis]
+        inv_i, inv_j = self.inv_mass[i], self.inv_mass[j]
+        share = 1.0 / (inv_i + inv_j)
+        np.add.at(self.positions, i, -normal * (depth * inv_i * share)[:, None])
+        np.add.at(self.positions, j, normal * (depth * inv_j * share)[:, None])
+        closing = ((self.velocities[j] - self.velocities[i]) * normal).sum(axis=1)
+        bounce = np.where(closing < -RESTING_SPEED, self.restitution, 0.0)
+        impulse = np.where(closing < 0, -(1.0 + bounce) * closing * share, 0.0)
+        np.add.at(self.velocities, i, -normal * (impulse * inv_i)[:, None])
+        np.add.at(self.velocities, j, normal * (impulse * inv_j)[:, None])
+
+
+class BulletWorld(_World):
+    """PyBullet world, headless (DIRECT) unless ``gui`` is set.
+
+    Collision shapes are created once per Shape and reused, URDFs load with
+    PyBullet's cached-shape flag, and reset() removes the scenario's bodies
+    instead of tearing down the connection, so a new scenario starts in
+    milliseconds.
+    """
+    backend = "pybullet"
+
+    def __init__(self, gui=False, dt=DEFAULT_DT, gravity=GRAVITY):
+        if pybullet is None:
+            raise ImportError("pybullet is not installed")
+        super().__init__(dt, gravity)
+        self.client = pybullet.connect(pybullet.GUI if gui else pybullet.DIRECT)
+        pybullet.setGravity(*self.gravity, physicsClientId=self.client)
+        pybullet.setTimeStep(self.dt, physicsClientId=self.client)
+        ground = pybullet.createCollisionShape(pybullet.GEOM_PLANE, physicsClientId=self.client)
+        pybullet.createMultiBody(0, ground, physicsClientId=self.client)
+        self._shapes = {}
+        self._bodies = []
+        # In-memory states from saveState(), freed on reset
+        self._states = []
+
+    def _clear(self):
+        for body in self._bodies:
+            pybullet.removeBody(body, physicsClientId=self.client)
+        self._bodies = []
+        for state_id in self._states:
+            pybullet.removeState(state_id, physicsClientId=self.client)
+        self._states = []
+
+    def __len__(self):
+        return len(self._bodies)
+
+    def _shape_id(self, shape):
+        shape_id = self._shapes.get(shape)
+        if shape_id is None:
+            if shape.kind == "sphere":
+                shape_id = pybullet.createCollisionShape(
+                    pybullet.GEOM_SPHERE, radius=shape.size[0], physicsClientId=self.client)
+            else:
+                shape_id = pybullet.createCollisionShape(
+                    pybullet.GEOM_BOX, halfExtents=shape.size, physicsClientId=self.client)
+            self._shapes[shape] = shape_id
+        return shape_id
+
+    def add_body(self, shape, position, kinematic=False):
+        """Add a body; returns its index."""
+        self._bodies.append(pybullet.createMultiBody(
+            0.0 if kinematic else shape.mass, self._shape_id(shape),
+            basePosition=position, physicsClientId=self.client))
+        return len(self._bodies) - 1
+
+    def load_urdf(self, path, position, kinematic=False):
+        self._bodies.append(pybullet.loadURDF(
+            os.path.abspath(path), position, useFixedBase=kinematic,
+            flags=pybullet.URDF_ENABLE_CACHED_GRAPHICS_SHAPES, physicsClientId=self.client))
+        return len(self._bodies) - 1
+
+    @property
+    def positions(self):
+        return np.array([self.position(body) for body in range(len(self))]).reshape(-1, 3)
+
+    def position(self, body):
+        return pybullet.getBasePositionAndOrientation(self._bodies[body], physicsClientId=self.client)[0]
+
+    def set_position(self, body, position):
+        body_id = self._bodies[body]
+        _, orientation = pybullet.getBasePositionAndOrientation(body_id, physicsClientId=self.client)
+        pybullet.resetBasePositionAndOrientation(body_id, position, orientation, physicsClientId=self.client)
+
+    def velocity(self, body):
+        return pybullet.getBaseVelocity(self._bodies[body], physicsClientId=self.client)[0]
+
+    def set_velocity(self, body, velocity):
+        pybullet.resetBaseVelocity(self._bodies[body], velocity, physicsClientId=self.client)
+
+    def _save(self):
+        # An in-memory PyBullet state id; reset() frees it
+        state_id = pybullet.saveState(physicsClientId=self.client)
+        self._states.append(state_id)
+        return state_id, len(self._bodies)
+
+    def _restore(self, saved):
+        state_id, count = saved
+        # restoreState() only rewinds the bodies it saved; later ones go first
+        for body in self._bodies[count:]:
+            pybullet.removeBody(body, physicsClientId=self.client)
+        del self._bodies[count:]
+        pybullet.restoreState(stateId=state_id, physicsClientId=self.client)
+
+    def _step(self, ticks):
+        for _ in range(ticks):
+            pybullet.stepSimulation(physicsClientId=self.client)
+
+
+# One world per (backend, gui) per process, reset between scenarios
+_WORLDS = {}
+
+
+def available_backends():
+    return ("pybullet", "numpy") if pybullet is not None else ("numpy",)
+
+
+def physics_world(backend="auto", gui=False):
+    """This process's world for backend, reset and ready for a new scenario.
+
+    "auto" picks PyBullet when it is installed and NumPy otherwise. The
+    world is created on first use and then reused, so only one scenario
+    per process should use it at a time.
+    """
+    if backend == "auto":
+        backend = available_backends()[0]
+    if backend not in ("pybullet", "numpy"):
+        raise ValueError(f"Unknown physics backend: {backend}")
+    key = (backend, bool(gui) and backend == "pybullet")
+    world = _WORLDS.get(key)
+    if world is None:
+        world = _WORLDS[key] = BulletWorld(gui=key[1]) if backend == "pybullet" else NumpyWorld()
+    else:
+        world.reset()
+    return world
@@ -0,0 +1,161 @@
+# simulation/pipeline.py
+
+import time
+from itertools import islice
+
+import numpy as np
+
+from simulation.sensors import BatchKalmanFilter
+
+
+class StageStats:
+    """Counters collected for one pipeline stage."""
+    def __init__(self, name):
+        self.name = name
+        self.chunks = 0
+        self.items = 0
+        self.seconds = 0.0
+
+    @property
+    def throughput(self):
+        """Items processed per second of time spent inside this stage."""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def latency(self):
+        """Mean seconds spent per chunk."""
+        return self.seconds / self.chunks if self.chunks else 0.0
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "chunks": self.chunks,
+            "items": self.items,
+            "seconds": self.seconds,
+            "latency": self.latency,
+            "throughput": self.throughput,
+        }
+
+    def __repr__(self):
+        return (f"StageStats({self.name!r}, chunks={self.chunks}, items={self.items}, "
+                f"latency={self.latency * 1e3:.3f}ms, throughput={self.throughput:,.0f}/s)")
+
+
+# -------------------------
+# Sources
+# -------------------------
+def chunked(values, chunk_size=65536):
+    """Yield float arrays of at most chunk_size items.
+
+    NumPy arrays are sliced without copying; any other iterable (including
+    generators) is consumed lazily, chunk_size items at a time.
+    """
+    if isinstance(values, np.ndarray):
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
+        return
+    iterator = iter(values)
+    while True:
+        chunk = np.fromiter(islice(iterator, chunk_size), dtype=float)
+        if not chunk.size:
+            return
+        yield chunk
+
+
+def read_chunks(path, dtype="<f8", chunk_size=65536, offset=0):
+    """Yield chunks of a raw binary trace file without loading it whole."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            chunk = np.fromfile(f, dtype=dtype, count=chunk_size)
+            if not chunk.size:
+                return
+            yield chunk
+
+
+# -------------------------
+# Stages
+# -------------------------
+class SensorStage:
+    """Turn chunks of true values into noisy readings."""
+    def __init__(self, sensor, name="sensor"):
+        self.sensor = sensor
+        self.name = name
+
+    def __call__(self, chunk):
+        return self.sensor.read_many(chunk)
+
+
+class FilterStage:
+    """Run chunks through a Kalman filter, carrying its state across chunks.
+
+    A KalmanFilter takes 1D chunks (KalmanFilter.filter); a BatchKalmanFilter
+    takes T x N chunks (BatchKalmanFilter.update_block).
+    """
+    def __init__(self, kalman_filter, name="filter"):
+        self.kalman_filter = kalman_filter
+        self.name = name
+
+    def __call__(self, chunk):
+        if isinstance(self.kalman_filter, BatchKalmanFilter):
+            return self.kalman_filter.update_block(chunk)
+        return self.kalman_filter.filter(chunk)
+
+
+class Pipeline:
+    """Lazy chain of chunk-processing stages.
+
+    Each stage is a callable taking one chunk and returning the next one; a
+    stage returning None is a sink and passes its input through unchanged.
+    Only one chunk per stage is alive at a time, so memory stays bounded by
+    the chunk size no matter how long the source is.
+    """
+    def __init__(self, source, name="source"):
+        self.source = source
+        self.stages = []
+        self.stats = [StageStats(name)]
+
+    def add(self, stage, name=None):
+        """Append a stage and return the pipeline, so calls can be chained."""
+        name = name or getattr(stage, "name", None) or getattr(stage, "__name__", type(stage).__name__)
+        self.stages.append(stage)
+        self.stats.append(StageStats(name))
+        return self
+
+    def __iter__(self):
+        source_stats = self.stats[0]
+        iterator = iter(self.source)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            source_stats.seconds += clock() - start
+            source_stats.chunks += 1
+            source_stats.items += len(chunk)
+
+            for stage, stats in zip(self.stages, self.stats[1:]):
+                start = clock()
+                result = stage(chunk)
+                stats.seconds += clock() - start
+                stats.chunks += 1
+                stats.items += len(chunk)
+                if result is not None:
+                    chunk = result
+            yield chunk
+
+    def run(self):
+        """Drain the pipeline and return the per-stage statistics."""
+        for _ in self:
+            pass
+        return self.stats
+
+    def report(self):
+        """Human-readable per-stage latency/throughput table."""
+        lines = [f"{'stage':<12}{'chunks':>10}{'items':>14}{'latency(ms)':>14}{'items/sec':>16}"]
+        for stats in self.stats:
+            lines.append(f"{stats.name:<12}{stats.chunks:>10}{stats.items:>14}"
+                         f"{stats.latency * 1e3:>14.3f}{stats.throughput:>16,.0f}")
+        return "\n".join(lines)
@@ -0,0 +1,405 @@
+# simulation/planner.py
+
+import heapq
+import itertools
+import math
+import re
+import time
+from array import array
+
+import numpy as np
+
+from simulation.collision import ARM_CLEARANCE
+
+SQRT2 = math.sqrt(2.0)
+SQRT3 = math.sqrt(3.0)
+
+
+class OccupancyGrid:
+    """Free/blocked nodes on a regular lattice covering a workspace boundary.
+
+    Node (i, j, k) sits at ``min_bound + (i, j, k) * resolution`` and owns the
+    cell of side ``resolution`` around it. A node is blocked when its cell
+    overlaps an obstacle's clearance box (the same open box the safety checks
+    use), so obstacles off the lattice block the nodes around them: a straight
+    move between neighbouring nodes stays inside their two cells, and so
+    never enters a clearance box unless one of its ends is blocked.
+    Occupancy is stored as one flat array with a one-node blocked border
+    around the workspace, so planners can step to any neighbour index
+    without bounds checks.
+    """
+    def __init__(self, boundary, resolution=1.0, clearance=ARM_CLEARANCE):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        min_bound, max_bound = boundary
+        self.min_bound = np.asarray(min_bound, dtype=float)
+        self.resolution = float(resolution)
+        self.clearance = clearance
+        extent = np.asarray(max_bound, dtype=float) - self.min_bound
+        self.shape = tuple(int(n) for n in np.floor(extent / self.resolution + 1e-9) + 1)
+        padded = tuple(n + 2 for n in self.shape)
+        self._free = np.zeros(padded, dtype=bool)
+        self._free[1:-1, 1:-1, 1:-1] = True
+        self.strides = (padded[1] * padded[2], padded[2], 1)
+
+    @classmethod
+    def from_sim(cls, sim, resolution=1.0):
+        """Grid over sim.boundary with sim.obstacles marked as blocked."""
+        if sim.boundary is None:
+            raise ValueError("Planning needs a workspace boundary")
+        grid = cls(sim.boundary, resolution, clearance=getattr(sim.obstacles, "clearance", ARM_CLEARANCE))
+        grid.add_obstacles(list(sim.obstacles))
+        return grid
+
+    @property
+    def is_2d(self):
+        return self.shape[2] == 1
+
+    @property
+    def occupied(self):
+        """(nx, ny, nz) boolean view, True where a node is blocked."""
+        return ~self._free[1:-1, 1:-1, 1:-1]
+
+    def add_obstacles(self, centers):
+        """Block every node whose cell overlaps the clearance box of a center."""
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        if not centers.shape[0]:
+            return
+        # Clearance box grown by half a cell: the nodes whose cells it overlaps
+        h = self.clearance / self.resolution + 0.5
+        rel = (centers - self.min_bound) / self.resolution
+        # Open interval (rel - h, rel + h) -> inclusive node range [lo, hi]
+        lo = np.maximum(np.floor(rel - h).astype(np.int64) + 1, 0)
+        hi = np.minimum(np.ceil(rel + h).astype(np.int64) - 1, np.asarray(self.shape) - 1)
+        keep = (lo <= hi).all(axis=1)
+        lo, hi = lo[keep], hi[keep]
+        if not lo.shape[0]:
+            return
+        span = (hi - lo).max(axis=0) + 1
+        # One vectorized pass per offset inside the largest box
+        for offset in itertools.product(*(range(s) for s in span)):
+            node = lo + offset
+            inside = (node <= hi).all(axis=1)
+            i, j, k = (node[inside] + 1).T
+            self._free[i, j, k] = False
+
+    def node(self, point):
+        """Flat (padded) index of the lattice node nearest to point."""
+        ijk = np.rint((np.asarray(point, dtype=float) - self.min_bound) / self.resolution).astype(np.int64)
+        if (ijk < 0).any() or (ijk >= self.shape).any():
+            raise ValueError(f"Point {tuple(point)} is outside the workspace")
+        sx, sy, sz = self.strides
+        return int((ijk[0] + 1) * sx + (ijk[1] + 1) * sy + (ijk[2] + 1) * sz)
+
+    def coords(self, node):
+        """Unpadded (i, j, k) lattice coordinates of a flat index."""
+        sx, sy, _ = self.strides
+        i, rem = divmod(node, sx)
+        j, k = divmod(rem, sy)
+        return i - 1, j - 1, k - 1
+
+    def point(self, node):
+        return tuple((self.min_bound + np.asarray(self.coords(node)) * self.resolution).tolist())
+
+    def is_free(self, point):
+        try:
+            return bool(self._free.flat[self.node(point)])
+        except ValueError:
+            return False
+
+
+class Plan:
+    """Result of one plan_path() call."""
+    def __init__(self, path, cost, expanded, elapsed, method):
+        # (N, 3) array of waypoints from start to goal, or None if unreachable
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+        self.elapsed = elapsed
+        self.method = method
+
+    @property
+    def found(self):
+        return self.path is not None
+
+    @property
+    def nodes_per_sec(self):
+        """Nodes expanded per second of planning time."""
+        return self.expanded / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f"Plan(method={self.method}, found={self.found}, cost={self.cost:.4f}, "
+                f"expanded={self.expanded}, elapsed={self.elapsed * 1e3:.2f}ms, "
+                f"nodes/sec={self.nodes_per_sec:,.0f})")
+
+
+def _moves(grid, diagonal):
+    """(flat offset, cost, offsets that must also be free) for every allowed move.
+
+    A diagonal move may not cut a corner: every node it passes next to,
+    i.e. every partial step of the move, must be free too.
+    """
+    axes = [axis for axis, n in enumerate(grid.shape) if n > 1]
+    moves = []
+    for delta in itertools.product((-1, 0, 1), repeat=len(axes)):
+        dims = sum(1 for d in delta if d)
+        if not dims or (dims > 1 and not diagonal):
+            continue
+        step = [0, 0, 0]
+        for axis, d in zip(axes, delta):
+            step[axis] = d
+        required = []
+        if dims > 1:
+            nonzero = [axis for axis in range(3) if step[axis]]
+            for r in range(1, dims):
+                for subset in itertools.combinations(nonzero, r):
+                    required.append(sum(step[a] * grid.strides[a] for a in subset))
+        offset = sum(step[a] * grid.strides[a] for a in range(3))
+        moves.append((offset, math.sqrt(dims), tuple(required)))
+    return moves
+
+
+def _heuristic(grid, goal, diagonal):
+    """Admissible distance-to-goal in lattice steps: octile, or Manhattan without diagonals."""
+    gi, gj, gk = grid.coords(goal)
+    coords = grid.coords
+
+    def h(node):
+        i, j, k = coords(node)
+        a, b, c = sorted((abs(i - gi), abs(j - gj), abs(k - gk)), reverse=True)
+        if not diagonal:
+            return a + b + c
+        return a + (SQRT2 - 1.0) * b + (SQRT3 - SQRT2) * c
+    return h
+
+
+def _trace(parent, goal):
+    nodes = [goal]
+    while parent[nodes[-1]] >= 0:
+        nodes.append(parent[nodes[-1]])
+    nodes.reverse()
+    return nodes
+
+
+def _astar(grid, start, goal, diagonal):
+    free = bytes(np.ascontiguousarray(grid._free))
+    size = len(free)
+    moves = _moves(grid, diagonal)
+    h = _heuristic(grid, goal, diagonal)
+    g = array("d", [math.inf]) * size
+    parent = array("q", [-1]) * size
+    closed = bytearray(size)
+    g[start] = 0.0
+    open_set = [(h(start), 0.0, start)]
+    push, pop = heapq.heappush, heapq.heappop
+    expanded = 0
+    while open_set:
+        _, _, node = pop(open_set)
+        if closed[node]:
+            continue
+        if node == goal:
+            return _trace(parent, goal), g[goal], expanded
+        closed[node] = 1
+        expanded += 1
+        g_node = g[node]
+        for offset, cost, required in moves:
+            nb = node + offset
+            if not free[nb] or closed[nb]:
+                continue
+            if required and not all(free[node + r] for r in required):
+                continue
+            g_nb = g_node + cost
+            if g_nb < g[nb]:
+                g[nb] = g_nb
+                parent[nb] = node
+                h_nb = h(nb)
+                # Ties on f go to the node nearer the goal
+                push(open_set, (g_nb + h_nb, h_nb, nb))
+    return None, math.inf, expanded
+
+
+# First cell that ends a straight jump: blocked (1) or with a forced neighbour (2)
+_STOP = re.compile(rb"[^\x00]")
+
+
+def _stop_maps(free):
+    """Per-direction stop codes for straight jumps on a padded 2D free map.
+
+    Returns byte strings for +y, -y, +x and -x scans, each laid out so the
+    scan runs forwards through memory: 0 to keep going, 1 for a blocked
+    cell, 2 for a cell with a forced neighbour (a side cell that opens up
+    right after being blocked, which only this cell can reach optimally).
+    The blocked border guarantees every scan stops inside its own row.
+    """
+    blocked = ~free
+    codes = []
+    for axis, sign in ((1, 1), (1, -1), (0, 1), (0, -1)):
+        f = free if axis == 1 else free.T
+        forced = np.zeros(f.shape, dtype=bool)
+        if sign > 0:
+            forced[1:-1, 1:] = (f[2:, 1:] & ~f[2:, :-1]) | (f[:-2, 1:] & ~f[:-2, :-1])
+        else:
+            forced[1:-1, :-1] = (f[2:, :-1] & ~f[2:, 1:]) | (f[:-2, :-1] & ~f[:-2, 1:])
+        code = np.where(blocked if axis == 1 else blocked.T, 1, np.where(forced, 2, 0)).astype(np.uint8)
+        codes.append(bytes(np.ascontiguousarray(code if sign > 0 else code[:, ::-1])))
+    return codes
+
+
+def _jps(grid, start, goal):
+    """Jump Point Search on a single-layer grid (8-connected, no corner cutting).
+
+    Works on the grid's middle z layer as a 2D map indexed i * Y + j.
+    Straight jumps are a single regex search over a precomputed stop map.
+    """
+    free2d = np.ascontiguousarray(grid._free[:, :, 1])
+    X, Y = free2d.shape
+    free = bytes(free2d)
+    ypos, yneg, xpos, xneg = _stop_maps(free2d)
+    search = _STOP.search
+    si, sj, _ = grid.coords(start)
+    gi, gj, _ = grid.coords(goal)
+    start2, goal2 = (si + 1) * Y + sj + 1, (gi + 1) * Y + gj + 1
+    gi, gj = divmod(goal2, Y)
+    size = X * Y
+    g = array("d", [math.inf]) * size
+    parent = array("q", [-1]) * size
+    closed = bytearray(size)
+
+    def straight(i, j, dx, dy):
+        """Jump from (i, j) along one axis; index of the jump point or -1."""
+        if dy > 0:
+            base = i * Y
+            k = search(ypos, base + j + 1).start()
+            code, k = ypos[k], k - base
+            if gi == i and j < gj <= k:
+                return goal2
+            return base + k if code == 2 else -1
+        if dy < 0:
+            base = i * Y
+            k = search(yneg, base + Y - j).start()
+            code, k = yneg[k], Y - 1 - (k - base)
+            if gi == i and k <= gj < j:
+                return goal2
+            return base + k if code == 2 else -1
+        if dx > 0:
+            base = j * X
+            k = search(xpos, base + i + 1).start()
+            code, k = xpos[k], k - base
+            if gj == j and i < gi <= k:
+                return goal2
+            return k * Y + j if code == 2 else -1
+        base = j * X
+        k = search(xneg, base + X - i).start()
+        code, k = xneg[k], X - 1 - (k - base)
+        if gj == j and k <= gi < i:
+            return goal2
+        return k * Y + j if code == 2 else -1
+
+    def jump(node, dx, dy):
+        """Jump from node in direction (dx, dy); index of the jump point or -1."""
+        i, j = divmod(node, Y)
+        if not (dx and dy):
+            return straight(i, j, dx, dy)
+        while True:
+            if not (free[(i + dx) * Y + j] and free[i * Y + j + dy]):
+                return -1
+            i += dx
+            j += dy
+            node = i * Y + j
+            if not free[node]:
+                return -1
+            if node == goal2 or straight(i, j, dx, 0) >= 0 or straight(i, j, 0, dy) >= 0:
+                return node
+
+    def directions(node):
+        """Pruned set of directions to search from node, given how it was reached."""
+        p = parent[node]
+        if p < 0:
+            return [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        pi, pj = divmod(p, Y)
+        i, j = divmod(node, Y)
+        dx = (i > pi) - (i < pi)
+        dy = (j > pj) - (j < pj)
+        if dx and dy:
+            return [(dx, 0), (0, dy), (dx, dy)]
+        if dx:
+            return [(dx, 0), (dx, 1), (dx, -1), (0, 1), (0, -1)]
+        return [(0, dy), (1, dy), (-1, dy), (1, 0), (-1, 0)]
+
+    def h(node):
+        i, j = divmod(node, Y)
+        a, b = abs(i - gi), abs(j - gj)
+        return max(a, b) + (SQRT2 - 1.0) * min(a, b)
+
+    g[start2] = 0.0
+    open_set = [(h(start2), 0.0, start2)]
+    push, pop = heapq.heappush, heapq.heappop
+    expanded = 0
+    while open_set:
+        _, _, node = pop(open_set)
+        if closed[node]:
+            continue
+        if node == goal2:
+            points = _trace(parent, goal2)
+            nodes = [(p // Y) * grid.strides[0] + (p % Y) * grid.strides[1] + 1 for p in points]
+            return _fill(grid, nodes), g[goal2], expanded
+        closed[node] = 1
+        expanded += 1
+        i, j = divmod(node, Y)
+        g_node = g[node]
+        for dx, dy in directions(node):
+            if dx and dy:
+                # Diagonal neighbours of a straight move only exist past a free corner
+                if not free[(i + dx) * Y + j + dy]:
+                    continue
+            jp = jump(node, dx, dy)
+            if jp < 0 or closed[jp]:
+                continue
+            a, b = abs(jp // Y - i), abs(jp % Y - j)
+            g_jp = g_node + max(a, b) + (SQRT2 - 1.0) * min(a, b)
+            if g_jp < g[jp]:
+                g[jp] = g_jp
+                parent[jp] = node
+                h_jp = h(jp)
+                push(open_set, (g_jp + h_jp, h_jp, jp))
+    return None, math.inf, expanded
+
+
+def _fill(grid, jump_points):
+    """Expand straight/diagonal runs between jump points into every node on them."""
+    nodes = jump_points[:1]
+    for a, b in zip(jump_points, jump_points[1:]):
+        ai, aj, ak = grid.coords(a)
+        bi, bj, bk = grid.coords(b)
+        di = (bi > ai) - (bi < ai)
+        dj = (bj > aj) - (bj < aj)
+        step = di * grid.strides[0] + dj * grid.strides[1]
+        for _ in range(max(abs(bi - ai), abs(bj - aj))):
+            nodes.append(nodes[-1] + step)
+    return nodes
+
+
+def plan_path(grid, start, goal, method="auto", diagonal=True):
+    """Shortest lattice path from start to goal, as a Plan.
+
+    ``method`` is "astar", "jps" or "auto" (Jump Point Search on a
+    single-layer grid, A* otherwise). JPS only covers the 8-connected 2D
+    case; on 3D grids, or with ``diagonal=False``, it falls back to A*.
+    """
+    if method not in ("auto", "astar", "jps"):
+        raise ValueError(f"Unknown planning method: {method}")
+    use_jps = method != "astar" and diagonal and grid.is_2d
+    start_node, goal_node = grid.node(start), grid.node(goal)
+    clock = time.perf_counter()
+    if not (grid._free.flat[start_node] and grid._free.flat[goal_node]):
+        nodes, cost, expanded = None, math.inf, 0
+    elif use_jps:
+        nodes, cost, expanded = _jps(grid, start_node, goal_node)
+    else:
+        nodes, cost, expanded = _astar(grid, start_node, goal_node, diagonal)
+    elapsed = time.perf_counter() - clock
+    path = None
+    if nodes is not None:
+        ijk = np.array([grid.coords(n) for n in nodes], dtype=float)
+        path = grid.min_bound + ijk * grid.resolution
+    return Plan(path, cost * grid.resolution, expanded, elapsed, "jps" if use_jps else "astar")
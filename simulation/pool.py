@@ -0,0 +1,92 @@
+# simulation/pool.py
+
+import contextlib
+import hashlib
+
+import numpy as np
+
+from simulation.robot_sim import RobotSim
+
+
+def obstacle_digest(world, count=None):
+    """SHA-256 of the first count obstacle centers of world (all of them by default)."""
+    return hashlib.sha256(np.ascontiguousarray(world.centers[:count]).tobytes()).hexdigest()
+
+
+class SimPool:
+    """Reusable RobotSims, each reset to one pre-initialized baseline when leased.
+
+    ``setup`` prepares the baseline sim once; its snapshot is what every
+    lease is restored to, so an expensive world (obstacles, distance field,
+    parts) is built once per pool instead of once per user. Restoring is
+    O(1) in the world size (see RobotSim.snapshot). Sims returned with
+    release() are handed out again rather than rebuilt.
+    """
+    def __init__(self, setup=None, name="main"):
+        self.name = name
+        base = RobotSim()
+        if setup is not None:
+            setup(base)
+        self.baseline = base.snapshot()
+        self._idle = [base]
+        self.created = 1
+        self.leases = 0
+
+    def __len__(self):
+        """Sims idle in the pool."""
+        return len(self._idle)
+
+    def acquire(self):
+        """A sim in the baseline state; hand it back with release()."""
+        if self._idle:
+            sim = self._idle.pop()
+        else:
+            sim = RobotSim.__new__(RobotSim)
+            self.created += 1
+        sim.restore(self.baseline)
+        self.leases += 1
+        return sim
+
+    def release(self, sim):
+        self._idle.append(sim)
+
+    @contextlib.contextmanager
+    def lease(self):
+        sim = self.acquire()
+        try:
+            yield sim
+        finally:
+            self.release(sim)
+
+    def __repr__(self):
+        return f"SimPool(name={self.name!r}, created={self.created}, leases={self.leases}, idle={len(self)})"
+
+
+class SharedCells:
+    """Expensive cell setups, built once per process and forked into each example.
+
+    A cell is built on a fork of the first sim that asks for it and kept as
+    a snapshot, along with a digest of its obstacles taken right then, so a
+    check after an example can show that nothing it did reached the cell.
+    """
+    def __init__(self):
+        self._cells = {}
+
+    def __len__(self):
+        return len(self._cells)
+
+    def restore(self, sim, key, build):
+        """Restore sim to the cell for key, as (snapshot, obstacle digest).
+
+        The first request for a key runs ``build`` on a fork of sim.
+        """
+        if key not in self._cells:
+            base = sim.fork()
+            build(base)
+            self._cells[key] = (base.snapshot(), obstacle_digest(base.obstacles))
+        snapshot, digest = self._cells[key]
+        sim.restore(snapshot)
+        return snapshot, digest
+
+    def __repr__(self):
+        return f"SharedCells({list(self._cells)!r})"
@@ -1,18 +1,309 @@
 # simulation/robot_sim.py
 
+import copy
+import struct
+
+import numpy as np
+
+from simulation.distance_field import DEFAULT_MAX_BYTES, DistanceField
+from simulation.kinematics import ArmChain, IKSolver
+from simulation.objects import GRIPPER_REACH, ObjectRegistry
+from simulation.obstacles import ObstacleWorld
+from simulation.physics import box, physics_world
+
+# Pose, velocity, acceleration, tick_rate, sim_time, gripper_reach, arm_position; then the flags
+_STATE = struct.Struct("<15d5?")
+
+# The robot's body in a physics world: kinematic, driven by its pose
+ROBOT_BODY = box((0.25, 0.25, 0.5), mass=50.0)
+
+
+class SimSnapshot:
+    """Frozen RobotSim state, made by RobotSim.snapshot().
+
+    Numeric state and flags are packed into one bytes buffer; the obstacle
+    world, distance field and part registry are copy-on-write forks, so
+    taking a snapshot and restoring from it cost the same however large the
+    world is, and nothing done to a restored sim reaches the snapshot.
+    Scenario data steps hang on the sim (its ``__dict__``) is deep-copied
+    both ways, so it costs its own size.
+    """
+    __slots__ = ("_state", "_world", "_field", "_objects", "_extras")
+
+    def __init__(self, state, world, field, objects, extras):
+        self._state = state
+        self._world = world
+        self._field = field
+        self._objects = objects
+        self._extras = extras
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_extras"):
+            raise AttributeError("SimSnapshot is immutable")
+        object.__setattr__(self, name, value)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def obstacle_count(self):
+        return len(self._world)
+
+    @property
+    def object_position(self):
+        return _STATE.unpack(self._state)[:3]
+
+    def __repr__(self):
+        return (f"SimSnapshot(position={self.object_position}, obstacles={self.obstacle_count}, "
+                f"state_bytes={len(self._state)})")
+
+
 class RobotSim:
+    """Single-robot simulation state.
+
+    All state is declared in __slots__: pose is kept as three scalars (so
+    moves update a number instead of building a new tuple), next to the arm,
+    gripper and workspace boundary. ``__dict__`` stays in the slot list so
+    steps can still hang scenario-specific data on the sim; it is only
+    allocated the first time such an attribute is set.
+    """
+    __slots__ = (
+        "gui",
+        # Pose and its time integration
+        "_x", "_y", "_z",
+        "_vx", "_vy", "_vz", "_ax", "_ay", "_az",
+        "tick_rate", "sim_time",
+        # Gait
+        "walking", "crouched",
+        # Arm and gripper
+        "arm_position", "arm", "joint_angles", "gripper_blocked", "holding_object",
+        "pick_result", "move_result",
+        # Parts in the cell; the registry is created on first use
+        "_objects", "gripper_reach", "held_object",
+        # Workspace
+        "boundary", "_world", "distance_field",
+        # Optional physics world (see enable_physics) and the robot's body in it
+        "physics", "_body",
+        "__dict__",
+    )
+
     def __init__(self, gui=False):
         self.gui = gui
         self.walking = False
         self.crouched = False
-        self.object_position = (0, 0, 0)
+        self._x = self._y = self._z = 0
+        self._vx = self._vy = self._vz = 0.0
+        self._ax = self._ay = self._az = 0.0
+        self.tick_rate = 1000.0
+        self.sim_time = 0.0
+        self.arm_position = (0, 0, 0)
+        # Optional jointed arm (an IKSolver over an ArmChain) based at the robot's position
+        self.arm = None
+        self.joint_angles = None
         self.gripper_blocked = False
         self.holding_object = False
+        self.pick_result = None
+        self.move_result = None
+        self._objects = None
+        self.gripper_reach = GRIPPER_REACH
+        self.held_object = None
+        # ((min_x, min_y, min_z), (max_x, max_y, max_z)), or None if unbounded
+        self.boundary = None
+        self._world = ObstacleWorld()
+        self.distance_field = None
+        self.physics = None
+        self._body = None
+
+    # Snapshots
+    def snapshot(self):
+        """Capture the whole state as an immutable SimSnapshot.
+
+        Costs O(1) in the size of the obstacle world, distance field and
+        part registry: they are forked copy-on-write, not copied. Attributes
+        steps set on the sim are deep-copied, so later changes to a mutable
+        one (a list, a dict) do not reach the snapshot.
+        """
+        state = _STATE.pack(
+            self._x, self._y, self._z, self._vx, self._vy, self._vz, self._ax, self._ay, self._az,
+            self.tick_rate, self.sim_time, self.gripper_reach, *self.arm_position,
+            self.gui, self.walking, self.crouched, self.gripper_blocked, self.holding_object)
+        world = self._world.fork()
+        field = self.distance_field.fork(world) if self.distance_field is not None else None
+        objects = self._objects.fork() if self._objects is not None else None
+        joint_angles = None
+        if self.joint_angles is not None:
+            joint_angles = self.joint_angles.copy()
+            joint_angles.flags.writeable = False
+        physics = (self.physics, self._body,
+                   self.physics.state() if self.physics is not None else None)
+        extras = (self.pick_result, self.move_result, self.boundary, self.held_object, joint_angles,
+                  copy.copy(self.arm), physics, copy.deepcopy(self.__dict__))
+        return SimSnapshot(state, world, field, objects, extras)
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot(); the snapshot stays reusable."""
+        values = _STATE.unpack(snapshot._state)
+        (self._x, self._y, self._z, self._vx, self._vy, self._vz, self._ax, self._ay, self._az,
+         self.tick_rate, self.sim_time, self.gripper_reach) = values[:12]
+        self.arm_position = values[12:15]
+        self.gui, self.walking, self.crouched, self.gripper_blocked, self.holding_object = values[15:]
+        self._world = snapshot._world.fork()
+        self.distance_field = snapshot._field.fork(self._world) if snapshot._field is not None else None
+        self._objects = snapshot._objects.fork() if snapshot._objects is not None else None
+        (self.pick_result, self.move_result, self.boundary, self.held_object, self.joint_angles,
+         arm, (self.physics, self._body, physics_state), scratch) = snapshot._extras
+        self.arm = copy.copy(arm)
+        if self.physics is not None:
+            self.physics.restore_state(physics_state)
+        self.__dict__.clear()
+        self.__dict__.update(copy.deepcopy(scratch))
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        sim = cls.__new__(cls)
+        sim.restore(snapshot)
+        return sim
+
+    def fork(self):
+        """Independent copy of this sim, made in constant time (copy-on-write)."""
+        return RobotSim.from_snapshot(self.snapshot())
 
     # Position
+    @property
+    def object_position(self):
+        return (self._x, self._y, self._z)
+
+    @object_position.setter
+    def object_position(self, position):
+        self._x, self._y, self._z = position
+
     def set_position(self, x, y, z):
         """Explicitly set the robot's position."""
-        self.object_position = (x, y, z)
+        self._x, self._y, self._z = x, y, z
+
+    def attempt_move(self, x, y, z):
+        """Move to (x, y, z), stopping at the workspace boundary (a unit cube when unset)."""
+        min_bound, max_bound = self.boundary or ((0, 0, 0), (1, 1, 1))
+        self._x = max(min(x, max_bound[0]), min_bound[0])
+        self._y = max(min(y, max_bound[1]), min_bound[1])
+        self._z = max(min(z, max_bound[2]), min_bound[2])
+
+    # Motion commands and time integration
+    @property
+    def velocity(self):
+        return (self._vx, self._vy, self._vz)
+
+    def set_velocity(self, vx, vy, vz):
+        self._vx, self._vy, self._vz = vx, vy, vz
+
+    def set_acceleration(self, ax, ay, az):
+        self._ax, self._ay, self._az = ax, ay, az
+
+    def stop(self):
+        """Zero the velocity and acceleration commands."""
+        self._vx = self._vy = self._vz = 0.0
+        self._ax = self._ay = self._az = 0.0
+
+    def step(self, dt=None):
+        """Advance the simulation by one tick (default 1 / tick_rate seconds).
+
+        Semi-implicit Euler: velocity is updated first and the new velocity
+        moves the pose, which stays stable for stiff commands. With physics
+        enabled the robot's body follows the pose and the physics world
+        advances by the same time.
+        """
+        if dt is None:
+            dt = 1.0 / self.tick_rate
+        self._vx += self._ax * dt
+        self._vy += self._ay * dt
+        self._vz += self._az * dt
+        self._x += self._vx * dt
+        self._y += self._vy * dt
+        self._z += self._vz * dt
+        self.sim_time += dt
+        if self.physics is not None:
+            self.physics.set_position(self._body, (self._x, self._y, self._z))
+            self.physics.advance(dt)
+
+    # Physics
+    def enable_physics(self, backend="auto"):
+        """Put the robot in this process's physics world ("pybullet", "numpy" or "auto").
+
+        The world is shared and reset rather than rebuilt (see
+        physics_world), headless unless the sim was created with gui=True.
+        """
+        self.physics = physics_world(backend, gui=self.gui)
+        self._body = self.physics.add_body(ROBOT_BODY, self.object_position, kinematic=True)
+        return self.physics
+
+    def step_physics(self, ticks):
+        """Advance only the physics world, ``ticks`` fixed steps in one batch."""
+        self.physics.set_position(self._body, self.object_position)
+        self.physics.step(ticks)
+
+    # Trajectories
+    def execute_trajectory(self, motions, kind="deltas", dt=None):
+        """Apply a whole (N, 3) array of motions in one call; returns the pose history.
+
+        ``kind`` says what each row is: "deltas" (a displacement),
+        "waypoints" (an absolute position) or "velocities" (held for one
+        tick of ``dt``, default 1 / tick_rate, which also advances sim_time).
+        The path is a single cumulative sum instead of N move calls. The
+        returned (N + 1, 3) history starts at the current pose and the robot
+        ends on its last row.
+        """
+        motions = np.asarray(motions, dtype=float).reshape(-1, 3)
+        history = np.empty((motions.shape[0] + 1, 3))
+        history[0] = self.object_position
+        if kind == "waypoints":
+            history[1:] = motions
+        elif kind == "deltas":
+            np.cumsum(motions, axis=0, out=history[1:])
+            history[1:] += history[0]
+        elif kind == "velocities":
+            if dt is None:
+                dt = 1.0 / self.tick_rate
+            np.cumsum(motions * dt, axis=0, out=history[1:])
+            history[1:] += history[0]
+            self.sim_time += motions.shape[0] * dt
+        else:
+            raise ValueError(f"Unknown trajectory kind: {kind}")
+        if motions.shape[0]:
+            self._x, self._y, self._z = history[-1].tolist()
+        return history
+
+    # Obstacles
+    @property
+    def obstacles(self):
+        """Shared ObstacleWorld; assigning a list of points replaces its contents."""
+        return self._world
+
+    @obstacles.setter
+    def obstacles(self, points):
+        # sim.obstacles = sim.obstacles, and += (which extends in place), keep the world as is
+        if points is self._world:
+            return
+        # Copied before clearing: points may be a view of this world's centers
+        points = np.array(points if isinstance(points, np.ndarray) else list(points), dtype=float)
+        self._world.clear()
+        self._world.extend(points)
+
+    def precompute_distance_field(self, resolution=0.05, max_bytes=DEFAULT_MAX_BYTES):
+        """Build a DistanceField over the boundary for O(1) clearance lookups.
+
+        Raises MemoryError, before allocating, if the field would exceed
+        ``max_bytes`` (see DistanceField.estimate_bytes). The field follows
+        later obstacle changes through DistanceField.sync().
+        """
+        if self.boundary is None:
+            raise ValueError("A distance field needs a workspace boundary")
+        field = DistanceField(self.boundary, resolution, max_bytes)
+        field.sync(self._world)
+        self.distance_field = field
+        return field
 
     # Walking
     def start_walking(self):
@@ -23,29 +314,96 @@ class RobotSim:
 
 
     def move_forward(self, distance):
-        x, y, z = self.object_position
         # Move along Y-axis for forward
-        self.object_position = (x, y + distance, z)
+        self._y += distance
 
     def move_backward(self, distance):
-        x, y, z = self.object_position
         # Move along Y-axis for backward
-        self.object_position = (x, y - distance, z)
-        
+        self._y -= distance
+
     # Pick and Place
+    @property
+    def objects(self):
+        """ObjectRegistry of the parts in the cell."""
+        if self._objects is None:
+            self._objects = ObjectRegistry(self.gripper_reach)
+        return self._objects
+
+    @property
+    def gripper_position(self):
+        """Where the gripper is: the arm's end effector, or the robot itself without an arm."""
+        return self.arm_position if self.arm is not None else self.object_position
+
+    def place_object(self, position, object_id=None):
+        """Put a part in the cell at position; returns its id."""
+        return self.objects.add(position, object_id)
+
     def pick_object(self):
+        """Grasp the nearest part within gripper reach.
+
+        With no parts registered the robot is assumed to be handed one, as
+        in the original single-object scenarios. A gripper already holding a
+        part refuses the pick and keeps the part it has.
+        """
+        if self.held_object is not None:
+            return False
         if self.gripper_blocked:
             self.holding_object = False
             return False
+        if self._objects is None or not len(self._objects):
+            self.holding_object = True
+            return True
+        object_id = self._objects.nearest_free(self.gripper_position, self.gripper_reach)
+        if object_id is None:
+            self.holding_object = False
+            return False
+        self._objects.attach(object_id)
+        self.held_object = object_id
         self.holding_object = True
         return True
 
     def move_object_to(self, x, y, z):
         if self.holding_object:
-            self.object_position = (x, y, z)
+            self._x, self._y, self._z = x, y, z
+            if self.held_object is not None:
+                self._objects.carry(self.held_object, (x, y, z))
             return True
         return False
 
+    def release_object(self):
+        """Set the held part down where it is; returns its id (or None)."""
+        object_id = self.held_object
+        if object_id is not None:
+            self._objects.release(object_id)
+        self.held_object = None
+        self.holding_object = False
+        return object_id
+
+    # Jointed arm
+    def attach_arm(self, chain=None, **solver_options):
+        """Give the robot a DH-chain arm (ArmChain.default() if none) and park it at home."""
+        chain = ArmChain.default() if chain is None else chain
+        self.arm = IKSolver(chain, **solver_options)
+        self.set_joint_angles(chain.home)
+        return self.arm
+
+    def set_joint_angles(self, q):
+        self.joint_angles = np.asarray(q, dtype=float)
+        end = self.arm.chain.forward(self.joint_angles) + self.object_position
+        self.arm_position = tuple(end.tolist())
+
+    def reach_arm(self, x, y, z):
+        """Solve IK for a world target and move the joints there; True if it was reached."""
+        base = self.object_position
+        result = self.arm.solve([x - base[0], y - base[1], z - base[2]], initial=self.joint_angles)
+        self.set_joint_angles(result.q[0])
+        return bool(result.converged[0])
+
+    def solve_arm_targets(self, targets, warm_start=True):
+        """Batch IK for (N, 3) world targets without moving the arm; returns an IKResult."""
+        relative = np.asarray(targets, dtype=float).reshape(-1, 3) - self.object_position
+        return self.arm.solve(relative, warm_start=warm_start)
+
     # Gripper state
     def block_gripper(self):
         self.gripper_blocked = True
@@ -0,0 +1,141 @@
+# simulation/sensor_log.py
+
+import os
+import struct
+
+import numpy as np
+
+# File layout: a fixed 32-byte header followed by packed little-endian records.
+#   header: magic (8s) | version (u2) | record size (u2) | reserved (20x)
+#   record: timestamp (f8) | channel (u4) | value (f8)
+# The record count is derived from the file size, so appending never has to
+# rewrite the header. A torn trailing record is ignored by readers and cut
+# off by the writer before it appends.
+MAGIC = b"RBSLOG\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH20x")
+HEADER_SIZE = HEADER.size
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("channel", "<u4"), ("value", "<f8")])
+
+
+def _read_header(f):
+    raw = f.read(HEADER_SIZE)
+    if len(raw) != HEADER_SIZE:
+        raise ValueError("Not a sensor log: file is shorter than the header")
+    magic, version, record_size = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"Not a sensor log: bad magic {magic!r}")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported sensor log version {version} (record size {record_size})")
+
+
+class SensorLogWriter:
+    """Appendable recorder for (timestamp, channel, value) samples.
+
+    Single samples are buffered and written in blocks; extend() writes
+    whole arrays directly. Opening an existing log appends to it, after
+    truncating any partial record a crash mid-write left at its end.
+    """
+    def __init__(self, path, buffer_records=65536):
+        self.path = path
+        self.buffer_records = buffer_records
+        self._pending = []
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                _read_header(f)
+            size = os.path.getsize(path)
+            whole = HEADER_SIZE + (size - HEADER_SIZE) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+            if whole != size:
+                os.truncate(path, whole)
+        self._file = open(path, "ab")
+        if not exists:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+
+    def append(self, timestamp, channel, value):
+        self._pending.append((timestamp, channel, value))
+        if len(self._pending) >= self.buffer_records:
+            self.flush()
+
+    def extend(self, timestamps, channels, values):
+        """Write arrays of samples (channels may be a scalar)."""
+        self.flush()
+        timestamps = np.asarray(timestamps, dtype="<f8")
+        records = np.empty(timestamps.shape[0], dtype=RECORD_DTYPE)
+        records["timestamp"] = timestamps
+        records["channel"] = channels
+        records["value"] = values
+        records.tofile(self._file)
+
+    def flush(self):
+        if self._pending:
+            np.array(self._pending, dtype=RECORD_DTYPE).tofile(self._file)
+            self._pending = []
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SensorLog:
+    """Read-only, zero-copy view of a sensor log through numpy.memmap.
+
+    ``records`` and the ``timestamps`` / ``channels`` / ``values`` field
+    views are backed by the file, so slicing hours of data only pages in
+    what is touched. Time-window queries assume samples were recorded in
+    non-decreasing timestamp order.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            _read_header(f)
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return self.records.shape[0]
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    @property
+    def channels(self):
+        return self.records["channel"]
+
+    @property
+    def values(self):
+        return self.records["value"]
+
+    def between(self, start, end):
+        """Records with start <= timestamp < end, as a memmap slice."""
+        lo, hi = np.searchsorted(self.timestamps, [start, end], side="left")
+        return self.records[lo:hi]
+
+    def channel(self, channel, start=None, end=None):
+        """Values recorded on one channel, optionally within a time window."""
+        records = self.records if start is None and end is None else self.between(
+            -np.inf if start is None else start, np.inf if end is None else end)
+        return records["value"][records["channel"] == channel]
+
+    def chunks(self, chunk_size=65536, channel=None):
+        """Yield value arrays chunk by chunk, e.g. as a Pipeline source."""
+        for start in range(0, len(self), chunk_size):
+            block = self.records[start:start + chunk_size]
+            if channel is None:
+                yield block["value"]
+            else:
+                values = block["value"][block["channel"] == channel]
+                if values.size:
+                    yield values
@@ -1,26 +1,85 @@
 # simulation/sensors.py
 
+import math
 import random
 
+import numpy as np
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional; KalmanFilter.filter falls back to NumPy
+    lfilter = None
+
 class Sensor:
-    """Simple sensor model with Gaussian noise."""
-    def __init__(self, noise=0.0):
+    """Simple sensor model with Gaussian noise.
+
+    Pass ``seed`` to give the sensor its own random stream, independent of
+    the global ``random`` state, so readings are reproducible no matter how
+    scenarios are distributed across xdist workers. ``buffer_size`` makes
+    read() take its noise from a pre-drawn block of samples that is refilled
+    in one vectorized call when exhausted.
+    """
+    def __init__(self, noise=0.0, seed=None, buffer_size=0):
         self.noise = noise
+        self.seed = seed
+        self.buffer_size = int(buffer_size)
+        self._rng = np.random.default_rng(seed)
+        self._gauss = random.gauss if seed is None else random.Random(seed).gauss
+        self._buffer = None
+        self._index = 0
 
     def read(self, true_value: float) -> float:
         """Return sensor reading with noise applied."""
-        return true_value + random.gauss(0, self.noise)
+        if not self.buffer_size:
+            return true_value + self._gauss(0, self.noise)
+        if self._buffer is None or self._index == self.buffer_size:
+            self._buffer = self._rng.standard_normal(self.buffer_size).tolist()
+            self._index = 0
+        sample = self._buffer[self._index]
+        self._index += 1
+        return true_value + self.noise * sample
+
+    def read_many(self, true_values):
+        """Return readings for a whole array of true values at once."""
+        true_values = np.asarray(true_values, dtype=float)
+        return true_values + self.noise * self._rng.standard_normal(true_values.shape)
 
 
 class KalmanFilter:
-    """Basic 1D Kalman filter."""
-    def __init__(self, process_variance=1e-5, measurement_variance=1e-2, initial_estimate=0.0, initial_error=1.0):
+    """Basic 1D Kalman filter.
+
+    With ``steady_state=True`` the gain is solved once for the fixed
+    process/measurement variances and every update is a single
+    multiply-add. The transient of the first few samples is skipped.
+    """
+    def __init__(self, process_variance=1e-5, measurement_variance=1e-2, initial_estimate=0.0, initial_error=1.0, steady_state=False):
         self.process_variance = process_variance
         self.measurement_variance = measurement_variance
         self.estimate = initial_estimate
         self.error_estimate = initial_error
+        self.steady_state = steady_state
+        if steady_state:
+            self.steady_gain, self.error_estimate = self.steady_state_gain()
+
+    def steady_state_gain(self):
+        """Return (gain, posterior error) the filter converges to.
+
+        The predicted error p satisfies p = q + p*r/(p + r), i.e.
+        p**2 - q*p - q*r = 0, whose positive root gives the gain p/(p + r).
+        """
+        q = self.process_variance
+        r = self.measurement_variance
+        prior = (q + math.sqrt(q * q + 4.0 * q * r)) / 2.0
+        if prior + r == 0.0:
+            return 0.0, 0.0
+        gain = prior / (prior + r)
+        return gain, (1 - gain) * prior
 
     def update(self, measurement: float) -> float:
+        if self.steady_state:
+            self.estimate += self.steady_gain * (measurement - self.estimate)
+            return self.estimate
+
         # Prediction step
         self.error_estimate += self.process_variance
 
@@ -34,3 +93,220 @@ class KalmanFilter:
         self.error_estimate = (1 - kalman_gain) * self.error_estimate
 
         return self.estimate
+
+    def filter(self, measurements):
+        """Run a whole recorded trace through the filter.
+
+        Returns a NumPy array of estimates identical (to rounding) to calling
+        update() per sample, and leaves the filter in the same final state.
+        The error covariance does not depend on the data, so samples are fed
+        one at a time only until the gain has converged; the rest of the
+        trace is the linear recursion y[n] = (1 - K) y[n-1] + K x[n], solved
+        with scipy.signal.lfilter when available or in NumPy otherwise.
+        """
+        x = np.asarray(measurements, dtype=float).ravel()
+        out = np.empty_like(x)
+        gain, posterior = self.steady_state_gain()
+
+        n = 0
+        if not self.steady_state:
+            tolerance = 1e-12 * max(posterior, 1e-300)
+            while n < x.size and abs(self.error_estimate - posterior) > tolerance:
+                out[n] = self.update(x[n])
+                n += 1
+        else:
+            gain = self.steady_gain
+
+        if n < x.size:
+            out[n:] = _first_order_recursion(1.0 - gain, gain, x[n:], self.estimate)
+            self.estimate = float(out[-1])
+        return out
+
+
+def _first_order_recursion(a, b, x, y0):
+    """Solve y[n] = a*y[n-1] + b*x[n] with y[-1] = y0 for 0 <= a < 1."""
+    if lfilter is not None:
+        y, _ = lfilter([b], [1.0, -a], x, zi=[a * y0])
+        return y
+    if a == 0.0:
+        return b * x
+
+    # A fast-decaying pole only remembers a few samples: use a truncated FIR.
+    taps = math.ceil(-16.0 / math.log10(a)) if a < 1.0 else math.inf
+    if taps <= 64:
+        y = np.convolve(x, b * a ** np.arange(taps))[:x.size]
+        head = min(taps, x.size)
+        y[:head] += y0 * a ** np.arange(1, head + 1)
+        return y
+
+    # Closed form within a chunk: y[k] = a**(k+1) * (y0 + b * sum_j x[j] / a**(j+1)).
+    # Chunks are short enough that a**-k stays well inside float range.
+    chunk = int(min(4096, 200 / -math.log10(a))) if a < 1.0 else 4096
+    powers = a ** np.arange(1, chunk + 1)
+    y = np.empty_like(x)
+    for start in range(0, x.size, chunk):
+        seg = x[start:start + chunk]
+        p = powers[:seg.size]
+        y[start:start + seg.size] = p * (y0 + b * np.cumsum(seg / p))
+        y0 = y[start + seg.size - 1]
+    return y
+
+
+class BatchKalmanFilter:
+    """1D Kalman filter applied independently to N channels at once.
+
+    Estimates and error covariances live in NumPy arrays so a whole set of
+    joints / IMU axes is updated with a handful of vectorized operations
+    instead of one Python call per channel. Variances may be scalars or
+    per-channel arrays.
+    """
+    def __init__(self, channels, process_variance=1e-5, measurement_variance=1e-2, initial_estimate=0.0, initial_error=1.0):
+        self.channels = int(channels)
+        shape = (self.channels,)
+        self.process_variance = np.broadcast_to(np.asarray(process_variance, dtype=float), shape).copy()
+        self.measurement_variance = np.broadcast_to(np.asarray(measurement_variance, dtype=float), shape).copy()
+        self.estimate = np.broadcast_to(np.asarray(initial_estimate, dtype=float), shape).copy()
+        self.error_estimate = np.broadcast_to(np.asarray(initial_error, dtype=float), shape).copy()
+
+    def update(self, measurements):
+        """Apply one measurement per channel and return the new estimates."""
+        measurements = np.asarray(measurements, dtype=float)
+        if measurements.shape != self.estimate.shape:
+            raise ValueError(f"Expected {self.channels} measurements, got shape {measurements.shape}")
+
+        self.error_estimate += self.process_variance
+        kalman_gain = self.error_estimate / (self.error_estimate + self.measurement_variance)
+        self.estimate += kalman_gain * (measurements - self.estimate)
+        self.error_estimate *= 1 - kalman_gain
+        return self.estimate.copy()
+
+    def update_block(self, block):
+        """Apply a T x N block of measurements (T samples per channel).
+
+        Returns the T x N array of estimates after each sample. The loop runs
+        over time only; every row is a single vectorized update across all
+        channels.
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim != 2 or block.shape[1] != self.channels:
+            raise ValueError(f"Expected a T x {self.channels} block, got shape {block.shape}")
+
+        out = np.empty_like(block)
+        estimate = self.estimate
+        error = self.error_estimate
+        q = self.process_variance
+        r = self.measurement_variance
+        for t in range(block.shape[0]):
+            error += q
+            kalman_gain = error / (error + r)
+            estimate += kalman_gain * (block[t] - estimate)
+            error *= 1 - kalman_gain
+            out[t] = estimate
+        return out
+
+
+class KalmanFilterND:
+    """Matrix-form (state-vector) Kalman filter.
+
+    x' = F x + w,  w ~ N(0, Q)
+    z  = H x + v,  v ~ N(0, R)
+
+    Constant matrices and their transposes are computed once. When the
+    structure of F/Q/H/R/P guarantees the innovation covariance S stays
+    diagonal (e.g. independent axes), the gain is a plain division instead
+    of a matrix inverse.
+    """
+    def __init__(self, F, H, Q, R, initial_state=None, initial_error=None):
+        self.F = np.array(F, dtype=float)
+        self.H = np.array(H, dtype=float)
+        self.Q = np.array(Q, dtype=float)
+        self.R = np.array(R, dtype=float)
+        n = self.F.shape[0]
+        m = self.H.shape[0]
+        if self.F.shape != (n, n) or self.Q.shape != (n, n):
+            raise ValueError("F and Q must be square n x n matrices")
+        if self.H.shape != (m, n) or self.R.shape != (m, m):
+            raise ValueError("H must be m x n and R must be m x m")
+
+        self.x = np.zeros(n) if initial_state is None else np.array(initial_state, dtype=float)
+        self.P = np.eye(n) if initial_error is None else np.array(initial_error, dtype=float)
+
+        self._Ft = self.F.T.copy()
+        self._Ht = self.H.T.copy()
+        self._R_diag = self.R.diagonal().copy()
+        self.diagonal_innovation = self._innovation_is_diagonal()
+
+    def _innovation_is_diagonal(self):
+        """True if S = H P H^T + R can never develop off-diagonal terms."""
+        if np.count_nonzero(self.R - np.diag(np.diag(self.R))):
+            return False
+        # States are coupled if F, Q or P link them; S stays diagonal when
+        # every measurement reads from its own group of coupled states.
+        coupling = (self.F != 0) | (self.F.T != 0) | (self.Q != 0) | (self.P != 0)
+        n = coupling.shape[0]
+        group = list(range(n))
+
+        def find(i):
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+
+        for i, j in zip(*np.nonzero(coupling)):
+            group[find(i)] = find(j)
+
+        owner = {}
+        for row in range(self.H.shape[0]):
+            for root in {find(i) for i in np.nonzero(self.H[row])[0]}:
+                if owner.setdefault(root, row) != row:
+                    return False
+        return True
+
+    @classmethod
+    def constant_velocity(cls, dims=3, dt=1e-3, process_variance=1e-5, measurement_variance=1e-2, initial_position=None, initial_error=1.0):
+        """Position/velocity model with `dims` independent axes.
+
+        The state is laid out as [p0, v0, p1, v1, ...]; only positions are
+        measured.
+        """
+        block_F = np.array([[1.0, dt], [0.0, 1.0]])
+        # Discrete white-noise acceleration model
+        block_Q = process_variance * np.array([[dt**4 / 4, dt**3 / 2], [dt**3 / 2, dt**2]])
+        F = np.kron(np.eye(dims), block_F)
+        Q = np.kron(np.eye(dims), block_Q)
+        H = np.kron(np.eye(dims), np.array([[1.0, 0.0]]))
+        R = measurement_variance * np.eye(dims)
+        x0 = np.zeros(2 * dims)
+        if initial_position is not None:
+            x0[0::2] = initial_position
+        return cls(F, H, Q, R, initial_state=x0, initial_error=initial_error * np.eye(2 * dims))
+
+    def predict(self):
+        F = self.F
+        self.x = F @ self.x
+        self.P = F @ self.P @ self._Ft + self.Q
+        return self.x
+
+    def correct(self, measurement):
+        PHt = self.P @ self._Ht
+        innovation = measurement - self.H @ self.x
+        if self.diagonal_innovation:
+            # S is diagonal: dividing by it replaces the inverse
+            K = PHt / ((self.H @ PHt).diagonal() + self._R_diag)
+        else:
+            S = self.H @ PHt + self.R
+            K = np.linalg.solve(S, PHt.T).T
+        self.x = self.x + K @ innovation
+        # (I - K H) P == P - K (P H^T)^T for symmetric P
+        self.P = self.P - K @ PHt.T
+        return self.x
+
+    def update(self, measurement):
+        """Predict one step ahead and fuse a measurement vector."""
+        self.predict()
+        return self.correct(measurement)
+
+    @property
+    def measured_estimate(self):
+        """Current estimate projected into measurement space (H x)."""
+        return self.H @ self.x
@@ -0,0 +1,101 @@
+# simulation/sim_loop.py
+
+import math
+import time
+
+
+class LoopStats:
+    """Counters for one SimLoop run."""
+    def __init__(self):
+        self.ticks = 0
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+
+    @property
+    def ticks_per_sec(self):
+        """Achieved ticks per second of wall time."""
+        return self.ticks / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def realtime_factor(self):
+        """Simulated seconds per wall-clock second (1.0 when paced in real time)."""
+        return self.sim_time / self.wall_time if self.wall_time else 0.0
+
+    def as_dict(self):
+        return {
+            "ticks": self.ticks,
+            "sim_time": self.sim_time,
+            "wall_time": self.wall_time,
+            "ticks_per_sec": self.ticks_per_sec,
+            "realtime_factor": self.realtime_factor,
+        }
+
+    def __repr__(self):
+        return (f"LoopStats(ticks={self.ticks}, sim_time={self.sim_time:.6f}s, "
+                f"wall_time={self.wall_time:.6f}s, ticks/sec={self.ticks_per_sec:,.0f}, "
+                f"realtime_factor={self.realtime_factor:.1f})")
+
+
+class SimLoop:
+    """Fixed-timestep driver for anything with a ``step(dt)`` method.
+
+    Works with RobotSim and RobotFleet alike. Headless mode (the default)
+    steps as fast as possible; ``realtime=True`` sleeps so that simulated
+    time tracks the wall clock.
+    """
+    def __init__(self, sim, tick_rate=1000.0, realtime=False):
+        self.sim = sim
+        self.tick_rate = float(tick_rate)
+        self.dt = 1.0 / self.tick_rate
+        self.realtime = realtime
+        self.stats = LoopStats()
+
+    def run(self, duration):
+        """Simulate ``duration`` seconds and return the accumulated stats.
+
+        Whole ticks are taken at the fixed dt; a duration that is not a
+        multiple of dt ends with one shorter tick so the motion lands on time.
+        """
+        ticks = math.floor(duration / self.dt + 1e-9)
+        remainder = duration - ticks * self.dt
+        if remainder <= 1e-12:
+            remainder = 0.0
+        dt = self.dt
+
+        step = self.sim.step
+        clock = time.perf_counter
+        start = clock()
+        if self.realtime:
+            deadline = start
+            for _ in range(ticks):
+                step(dt)
+                deadline += dt
+                delay = deadline - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            if remainder:
+                step(remainder)
+                delay = deadline + remainder - clock()
+                if delay > 0:
+                    time.sleep(delay)
+        else:
+            for _ in range(ticks):
+                step(dt)
+            if remainder:
+                step(remainder)
+
+        self.stats.wall_time += clock() - start
+        self.stats.ticks += ticks + (1 if remainder else 0)
+        self.stats.sim_time += ticks * dt + remainder
+        return self.stats
+
+    def move(self, velocity, duration):
+        """Timed RobotSim motion: hold (vx, vy, vz) for ``duration`` seconds, then stop.
+
+        For a RobotFleet, call fleet.set_velocity() and run() directly.
+        """
+        self.sim.set_velocity(*velocity)
+        try:
+            return self.run(duration)
+        finally:
+            self.sim.stop()
@@ -0,0 +1,151 @@
+# simulation/spatial.py
+
+import math
+
+
+class SpatialHash:
+    """Uniform grid index over 3D points, keyed by caller-chosen ids.
+
+    Points are bucketed into cubic cells of ``cell_size``; a radius query
+    only visits the cells overlapping the query sphere's bounding box and
+    compares squared distances, so no square roots are taken. Inserts,
+    removals and moves are O(1).
+    """
+    def __init__(self, cell_size=1.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._points = {}
+        self._cell_of = {}
+
+    def _cell(self, point):
+        s = self.cell_size
+        return (math.floor(point[0] / s), math.floor(point[1] / s), math.floor(point[2] / s))
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def position(self, key):
+        return self._points[key]
+
+    def insert(self, key, point):
+        if key in self._points:
+            self.remove(key)
+        point = (float(point[0]), float(point[1]), float(point[2]))
+        cell = self._cell(point)
+        self._points[key] = point
+        self._cell_of[key] = cell
+        self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        cell = self._cell_of.pop(key)
+        del self._points[key]
+        bucket = self._cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, key, point):
+        self.insert(key, point)
+
+    def copy(self):
+        twin = SpatialHash(self.cell_size)
+        twin._cells = {cell: set(bucket) for cell, bucket in self._cells.items()}
+        twin._points = dict(self._points)
+        twin._cell_of = dict(self._cell_of)
+        return twin
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+        self._cell_of.clear()
+
+    def _candidate_cells(self, center, radius):
+        lo = self._cell((center[0] - radius, center[1] - radius, center[2] - radius))
+        hi = self._cell((center[0] + radius, center[1] + radius, center[2] + radius))
+        span = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if span >= len(self._cells):
+            # Query box covers more cells than are occupied: walk the occupied ones
+            return [cell for cell in self._cells
+                    if lo[0] <= cell[0] <= hi[0] and lo[1] <= cell[1] <= hi[1] and lo[2] <= cell[2] <= hi[2]]
+        return [(i, j, k)
+                for i in range(lo[0], hi[0] + 1)
+                for j in range(lo[1], hi[1] + 1)
+                for k in range(lo[2], hi[2] + 1)
+                if (i, j, k) in self._cells]
+
+    def query_radius(self, center, radius):
+        """Keys of all points within ``radius`` of ``center`` (inclusive)."""
+        cx, cy, cz = center
+        r2 = radius * radius
+        points = self._points
+        found = []
+        for cell in self._candidate_cells(center, radius):
+            for key in self._cells[cell]:
+                x, y, z = points[key]
+                if (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 <= r2:
+                    found.append(key)
+        return found
+
+    def _shell(self, cell, ring):
+        """Occupied cells at Chebyshev distance exactly ``ring`` from cell."""
+        i0, j0, k0 = cell
+        cells = self._cells
+        if ring == 0:
+            return [cell] if cell in cells else []
+        found = []
+        for i in range(i0 - ring, i0 + ring + 1):
+            edge_i = abs(i - i0) == ring
+            for j in range(j0 - ring, j0 + ring + 1):
+                if edge_i or abs(j - j0) == ring:
+                    ks = range(k0 - ring, k0 + ring + 1)
+                else:
+                    ks = (k0 - ring, k0 + ring)
+                for k in ks:
+                    if (i, j, k) in cells:
+                        found.append((i, j, k))
+        return found
+
+    def nearest(self, center, max_radius):
+        """Key of the closest point within ``max_radius``, or None.
+
+        Searches shells of cells outward from the query's own cell and stops
+        as soon as nothing unvisited can be closer than the best match, so a
+        dense neighbourhood is usually settled by the first one or two shells.
+        """
+        cx, cy, cz = center
+        s = self.cell_size
+        best_key = None
+        best_d2 = max_radius * max_radius
+        points = self._points
+        home = self._cell(center)
+        rings = math.ceil(max_radius / s) + 1
+        sparse = (2 * rings + 1) ** 3 >= 2 * len(self._cells)
+        for ring in range(1 if sparse else rings + 1):
+            if sparse:
+                # Sparse grid: cheaper to walk the occupied cells in range
+                shell = self._candidate_cells(center, max_radius)
+            else:
+                if ring:
+                    # Distance from the query to the outside of the shells visited so far
+                    i, j, k = home
+                    inner = min(cx - (i - ring + 1) * s, (i + ring) * s - cx,
+                                cy - (j - ring + 1) * s, (j + ring) * s - cy,
+                                cz - (k - ring + 1) * s, (k + ring) * s - cz)
+                    if inner * inner > best_d2:
+                        break
+                shell = self._shell(home, ring)
+            for cell in shell:
+                for key in self._cells[cell]:
+                    x, y, z = points[key]
+                    d2 = (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2
+                    if d2 <= best_d2:
+                        best_key, best_d2 = key, d2
+        return best_key
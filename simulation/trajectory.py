@@ -0,0 +1,67 @@
+# simulation/trajectory.py
+
+import math
+
+import numpy as np
+
+# Unit vector for each named direction (forward is +Y, right is +X, up is +Z)
+DIRECTIONS = {
+    "forward": (0.0, 1.0, 0.0),
+    "backward": (0.0, -1.0, 0.0),
+    "left": (-1.0, 0.0, 0.0),
+    "right": (1.0, 0.0, 0.0),
+    "up": (0.0, 0.0, 1.0),
+    "down": (0.0, 0.0, -1.0),
+}
+
+
+def _unit(direction):
+    try:
+        return np.array(DIRECTIONS[direction.lower()])
+    except KeyError:
+        raise ValueError(f"Unknown direction: {direction}") from None
+
+
+def line(direction, distance):
+    """One straight move of ``distance`` along a named direction, as a (1, 3) delta array."""
+    return (_unit(direction) * distance).reshape(1, 3)
+
+
+def zigzag(first, second, dist1, dist2, repeats=2):
+    """Alternate ``first`` by dist1 and ``second`` by dist2, ``repeats`` times."""
+    pair = np.vstack((line(first, dist1), line(second, dist2)))
+    return np.tile(pair, (repeats, 1))
+
+
+def arc(radius, degrees, clockwise=False, heading=(0.0, 1.0), segments=None):
+    """Deltas that follow a circular arc in the XY plane.
+
+    The robot starts on the circle facing ``heading``; the centre lies
+    ``radius`` to its left (counter-clockwise) or right (clockwise). Sample
+    points are computed from their absolute angle, so every one lies exactly
+    on the circle. ``segments`` defaults to one per degree swept.
+    """
+    sweep = math.radians(abs(degrees))
+    if segments is None:
+        segments = max(1, math.ceil(abs(degrees)))
+    hx, hy = heading
+    norm = math.hypot(hx, hy)
+    hx, hy = hx / norm, hy / norm
+    sign = -1.0 if clockwise else 1.0
+    # Start angle of the robot as seen from the centre
+    start_angle = math.atan2(-sign * hx, sign * hy)
+    angles = start_angle + sign * np.linspace(0.0, sweep, segments + 1)
+    offsets = np.zeros((segments + 1, 3))
+    offsets[:, 0] = radius * (np.cos(angles) - math.cos(start_angle))
+    offsets[:, 1] = radius * (np.sin(angles) - math.sin(start_angle))
+    return np.diff(offsets, axis=0)
+
+
+def circle(radius, clockwise=False, heading=(0.0, 1.0), segments=None):
+    """A full closed circle; see arc()."""
+    return arc(radius, 360.0, clockwise=clockwise, heading=heading, segments=segments)
+
+
+def route(*parts):
+    """Chain motion arrays into one route for a single execute_trajectory() call."""
+    return np.vstack([np.asarray(part, dtype=float).reshape(-1, 3) for part in parts])
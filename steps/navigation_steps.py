@@ -1,76 +1,125 @@
 # steps/navigation_steps.py
+import io
+import os
 import pytest
 import allure
+import numpy as np
 from pytest_bdd import scenarios, given, when, then, parsers
+from plugins.scenario_generator import generate, generated_features, write_feature
+
+from simulation import trajectory
+from simulation.planner import OccupancyGrid, plan_path
+from simulation.pool import obstacle_digest
+from simulation.robot_sim import RobotSim
 
 # Link all navigation scenarios
 scenarios('../features/navigation.feature')
+# Seeded stress examples, only generated with --stress-examples
+if generated_features('navigation'):
+    scenarios(*generated_features('navigation'))
+
 
-# Fixture for robot simulation
-@pytest.fixture
-def sim():
-    class Sim:
-        def __init__(self):
-            self.object_position = [0, 0, 0]
-    return Sim()
+def _scatter_on_lattice(world, boundary, count, seed):
+    """Add count seeded obstacles on distinct whole-unit nodes, keeping both workspace corners free."""
+    rng = np.random.default_rng(seed)
+    low, high = (np.asarray(b, dtype=np.int64) for b in boundary)
+    axes = np.meshgrid(*(np.arange(a, b + 1) for a, b in zip(low, high)), indexing="ij")
+    nodes = np.stack(axes, axis=-1).reshape(-1, 3)
+    nodes = nodes[(nodes != low).any(axis=1) & (nodes != high).any(axis=1)]
+    world.extend(nodes[rng.choice(len(nodes), size=count, replace=False)])
 
 # --- GIVEN steps ---
 
 @given(parsers.parse("the robot is at position [{x:g}, {y:g}, {z:g}]"))
 def robot_at_position(sim, x, y, z):
     with allure.step(f"Given the robot is at position [{x}, {y}, {z}]"):
-        sim.object_position = [x, y, z]
+        sim.set_position(x, y, z)
+
+@given(parsers.parse("the workspace is bounded by [{x0:g}, {y0:g}, {z0:g}] and [{x1:g}, {y1:g}, {z1:g}]"))
+def workspace_bounded(sim, x0, y0, z0, x1, y1, z1):
+    with allure.step(f"Given the workspace is bounded by [{x0}, {y0}, {z0}] and [{x1}, {y1}, {z1}]"):
+        sim.boundary = ((x0, y0, z0), (x1, y1, z1))
+
+@given(parsers.parse("a wall of obstacles at x = {x:g} spanning y {y0:d} to {y1:d} and z {z0:d} to {z1:d}"))
+def obstacle_wall(sim, x, y0, y1, z0, z1):
+    with allure.step(f"Given a wall of obstacles at x = {x} spanning y {y0} to {y1} and z {z0} to {z1}"):
+        sim.obstacles.extend([(x, y, z) for y in range(y0, y1 + 1) for z in range(z0, z1 + 1)])
+
+@given(parsers.parse("an obstacle at [{x:g}, {y:g}, {z:g}]"))
+def obstacle_at(sim, x, y, z):
+    with allure.step(f"Given an obstacle at [{x}, {y}, {z}]"):
+        sim.obstacles.append((x, y, z))
+
+@given(parsers.parse("a shared cell with {count:d} obstacles on lattice nodes and seed {seed:d}"))
+def shared_lattice_cell(sim, shared_cells, count, seed):
+    with allure.step(f"Given a shared cell with {count} obstacles on lattice nodes and seed {seed}"):
+        sim.shared_cell, sim.shared_cell_digest = shared_cells.restore(
+            sim, ("lattice", count, seed, sim.boundary),
+            lambda base: _scatter_on_lattice(base.obstacles, base.boundary, count, seed))
+        sim.shared_cell_size = sim.shared_cell.obstacle_count
+
+@given(parsers.parse("the {suite} stress suite is generated with {count:d} examples and seed {seed:d}"))
+def generate_stress_suite(sim, tmp_path, suite, count, seed):
+    with allure.step(f"Given the {suite} stress suite is generated with {count} examples and seed {seed}"):
+        sim.generated_path = generate(str(tmp_path), suite, count, seed)
+        sim.generated_stat = os.stat(sim.generated_path)
+        with open(sim.generated_path, encoding="utf-8") as f:
+            sim.generated_text = f.read()
+        allure.attach(sim.generated_text, name="generated feature", attachment_type=allure.attachment_type.TEXT)
+
+@given("the robot is leased from the simulation pool")
+def leased_robot(sim, sim_pool):
+    with allure.step("Given the robot is leased from the simulation pool"):
+        allure.attach(repr(sim_pool), name="simulation pool", attachment_type=allure.attachment_type.TEXT)
 
 # --- WHEN steps ---
 
 @when(parsers.parse("the robot moves {direction} by {distance:g}"))
 def move_direction(sim, direction, distance):
     with allure.step(f"When the robot moves {direction} by {distance}"):
-        x, y, z = sim.object_position
-        direction = direction.lower()
-        if direction == "forward":
-            y += distance
-        elif direction == "backward":
-            y -= distance
-        elif direction == "left":
-            x -= distance
-        elif direction == "right":
-            x += distance
-        elif direction == "up":
-            z += distance
-        elif direction == "down":
-            z -= distance
-        else:
-            raise ValueError(f"Unknown direction: {direction}")
-        sim.object_position = [x, y, z]
+        sim.path = sim.execute_trajectory(trajectory.line(direction, distance))
 
 @when(parsers.parse("the robot moves diagonally by [{dx:g}, {dy:g}, {dz:g}]"))
 def move_diagonal(sim, dx, dy, dz):
     with allure.step(f"When the robot moves diagonally by [{dx}, {dy}, {dz}]"):
-        sim.object_position[0] += dx
-        sim.object_position[1] += dy
-        sim.object_position[2] += dz
+        sim.path = sim.execute_trajectory([dx, dy, dz])
 
 @when(parsers.parse("the robot moves {pattern} by {dist1:g} and {dist2:g} twice"))
 def move_zigzag(sim, pattern, dist1, dist2):
     with allure.step(f"When the robot moves {pattern} by {dist1} and {dist2} twice"):
-        x, y, z = sim.object_position
-        pattern = pattern.lower()
-        if pattern == "forward and right":
-            x += 2 * dist2
-            y += 2 * dist1
-        elif pattern == "backward and left":
-            x -= 2 * dist2
-            y -= 2 * dist1
-        else:
+        first, _, second = pattern.lower().partition(" and ")
+        if not second:
             raise ValueError(f"Unknown zigzag pattern: {pattern}")
-        sim.object_position = [x, y, z]
+        sim.path = sim.execute_trajectory(trajectory.zigzag(first, second, dist1, dist2, repeats=2))
 
 @when(parsers.parse("the robot moves in a {direction} circle with radius {r:g}"))
 def move_circle(sim, direction, r):
     with allure.step(f"When the robot moves in a {direction} circle with radius {r}"):
-        # For testing, circle returns to original position
-        sim.object_position = [0, 0, 0]
+        clockwise = direction.lower() == "clockwise"
+        sim.path = sim.execute_trajectory(trajectory.circle(r, clockwise=clockwise))
+
+@when(parsers.parse("the robot moves along a {direction} arc of radius {r:g} through {degrees:g} degrees"))
+def move_arc(sim, direction, r, degrees):
+    with allure.step(f"When the robot moves along a {direction} arc of radius {r} through {degrees} degrees"):
+        clockwise = direction.lower() == "clockwise"
+        # Centre of the turn, to the robot's right (clockwise) or left, facing forward
+        x, y, z = sim.object_position
+        sim.arc_center = (x + r if clockwise else x - r, y, z)
+        sim.path = sim.execute_trajectory(trajectory.arc(r, degrees, clockwise=clockwise))
+
+@when(parsers.parse("the robot navigates to [{x:g}, {y:g}, {z:g}] using {method}"))
+def navigate_to(sim, x, y, z, method):
+    with allure.step(f"When the robot navigates to [{x}, {y}, {z}] using {method}"):
+        grid = OccupancyGrid.from_sim(sim)
+        sim.plan = plan_path(grid, sim.object_position, (x, y, z), method=method)
+        allure.attach(repr(sim.plan), name="plan", attachment_type=allure.attachment_type.TEXT)
+        assert sim.plan.found, f"No path to [{x}, {y}, {z}]"
+        sim.path = sim.execute_trajectory(sim.plan.path[1:], kind="waypoints")
+
+@when(parsers.parse("the {suite} stress suite is generated again with {count:d} examples and seed {seed:d}"))
+def regenerate_stress_suite(sim, tmp_path, suite, count, seed):
+    with allure.step(f"When the {suite} stress suite is generated again with {count} examples and seed {seed}"):
+        sim.regenerated_path = generate(str(tmp_path), suite, count, seed)
 
 # --- THEN steps ---
 
@@ -91,4 +140,68 @@ def check_return_to_position(sim, x, y, z):
         tol = 1e-6
         assert abs(pos[0] - x) < tol, f"x={pos[0]} != {x}"
         assert abs(pos[1] - y) < tol, f"y={pos[1]} != {y}"
-        assert abs(pos[2] - z) < tol, f"z={pos[2]} != {z}"
\ No newline at end of file
+        assert abs(pos[2] - z) < tol, f"z={pos[2]} != {z}"
+
+@then(parsers.parse("every recorded pose should lie {r:g} units from the arc centre"))
+def check_path_on_arc(sim, r):
+    with allure.step(f"Then every recorded pose should lie {r} units from the arc centre"):
+        distances = np.linalg.norm(sim.path - np.asarray(sim.arc_center), axis=1)
+        allure.attach(f"poses={len(sim.path)}, max error={np.abs(distances - r).max():.3g}",
+                      name="arc path", attachment_type=allure.attachment_type.TEXT)
+        assert np.allclose(distances, r, atol=1e-9)
+
+
+@then("the planned path should avoid all obstacles")
+def check_path_clear(sim):
+    with allure.step("Then the planned path should avoid all obstacles"):
+        for a, b in zip(sim.path[:-1], sim.path[1:]):
+            t, index = sim.obstacles.first_contact(a, b)
+            assert t is None, f"Path segment {tuple(a)} -> {tuple(b)} hits obstacle {sim.obstacles[index]}"
+
+@then(parsers.parse("the planned path should cost {cost:g} units"))
+def check_path_cost(sim, cost):
+    with allure.step(f"Then the planned path should cost {cost} units"):
+        assert abs(sim.plan.cost - cost) < 1e-3, f"cost={sim.plan.cost} != {cost}"
+
+@then("the shared cell should be unchanged by the example")
+def check_shared_cell_unchanged(sim):
+    with allure.step("Then the shared cell should be unchanged by the example"):
+        # The snapshot still holds what was built, and the example's fork built on top of it
+        assert obstacle_digest(RobotSim.from_snapshot(sim.shared_cell).obstacles) == sim.shared_cell_digest
+        assert len(sim.obstacles) > sim.shared_cell_size
+        assert obstacle_digest(sim.obstacles, sim.shared_cell_size) == sim.shared_cell_digest
+
+@then("the cached feature file should be reused")
+def check_generated_reused(sim):
+    with allure.step("Then the cached feature file should be reused"):
+        assert sim.regenerated_path == sim.generated_path
+        stat = os.stat(sim.regenerated_path)
+        # Not rewritten: the same file, untouched since the first run
+        assert (stat.st_ino, stat.st_mtime_ns) == (sim.generated_stat.st_ino, sim.generated_stat.st_mtime_ns)
+
+@then(parsers.parse("writing the {suite} suite with {count:d} examples and seed {seed:d} should give the same rows"))
+def check_generated_deterministic(sim, suite, count, seed):
+    with allure.step(f"Then writing the {suite} suite with {count} examples and seed {seed} should give the same rows"):
+        out = io.StringIO()
+        write_feature(suite, count, seed, out)
+        assert out.getvalue() == sim.generated_text
+
+@then(parsers.parse("writing the {suite} suite with {count:d} examples and seed {seed:d} should give different rows"))
+def check_generated_seeded(sim, suite, count, seed):
+    with allure.step(f"Then writing the {suite} suite with {count} examples and seed {seed} should give different rows"):
+        out = io.StringIO()
+        write_feature(suite, count, seed, out)
+        rows = [line for line in out.getvalue().splitlines() if line.startswith("      |")]
+        assert rows != [line for line in sim.generated_text.splitlines() if line.startswith("      |")]
+
+@then("the robot should start from the pool baseline")
+def check_pool_baseline(sim, sim_pool):
+    with allure.step("Then the robot should start from the pool baseline"):
+        assert sim.object_position == sim_pool.baseline.object_position
+        assert len(sim.obstacles) == sim_pool.baseline.obstacle_count == 0
+        assert sim.boundary == ((0, 0, 0), (5, 5, 5))
+
+@then("the pool should have built only one simulation in this worker")
+def check_pool_reuse(sim_pool):
+    with allure.step("Then the pool should have built only one simulation in this worker"):
+        assert sim_pool.created == 1, repr(sim_pool)
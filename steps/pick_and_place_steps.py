@@ -1,17 +1,15 @@
 # steps/pick_and_place_steps.py
+import time
 import pytest
 import allure
+import numpy as np
 from pytest_bdd import scenarios, given, when, then, parsers
-from simulation.robot_sim import RobotSim
+from simulation.physics import available_backends, box
+from simulation.sim_loop import SimLoop
 
 scenarios('../features/pick_and_place.feature')
 
 
-# Fixture for the simulation
-@pytest.fixture
-def sim():
-    return RobotSim(gui=False)
-
 # --- GIVEN steps ---
 
 @given(parsers.parse("a robot with a gripper at position [{x:g}, {y:g}, {z:g}]"))
@@ -31,9 +29,48 @@ def robot_with_blocked_gripper(sim, x, y, z):
 @given(parsers.parse("an object is placed at [{x:g}, {y:g}, {z:g}]"))
 def place_object(sim, x, y, z):
     with allure.step(f"Given an object is placed at [{x}, {y}, {z}]"):
-        sim.place_object((x, y, z))
+        object_id = sim.place_object((x, y, z))
+        if not hasattr(sim, 'placed_objects'):
+            sim.placed_objects = {}
+        sim.placed_objects[(x, y, z)] = object_id
     return sim
 
+@given(parsers.parse("part {object_id:d} is placed at [{x:g}, {y:g}, {z:g}]"))
+def place_object_with_id(sim, object_id, x, y, z):
+    with allure.step(f"Given part {object_id} is placed at [{x}, {y}, {z}]"):
+        sim.place_object((x, y, z), object_id)
+        if not hasattr(sim, 'placed_objects'):
+            sim.placed_objects = {}
+        sim.placed_objects[(x, y, z)] = object_id
+
+@given(parsers.parse("{count:d} parts are scattered in a bin from [{x0:g}, {y0:g}, {z0:g}] to [{x1:g}, {y1:g}, {z1:g}] with seed {seed:d}"))
+def scatter_parts(sim, count, x0, y0, z0, x1, y1, z1, seed):
+    with allure.step(f"Given {count} parts are scattered in a bin from [{x0}, {y0}, {z0}] to [{x1}, {y1}, {z1}] with seed {seed}"):
+        rng = np.random.default_rng(seed)
+        sim.objects.add_many(rng.uniform((x0, y0, z0), (x1, y1, z1), size=(count, 3)).tolist())
+
+@given("the robot has the default jointed arm")
+def robot_with_jointed_arm(sim):
+    with allure.step("Given the robot has the default jointed arm"):
+        sim.attach_arm()
+
+@given(parsers.parse('the robot runs with the "{backend}" physics backend'))
+def robot_with_physics(sim, backend):
+    with allure.step(f'Given the robot runs with the "{backend}" physics backend'):
+        if backend == "pybullet" and backend not in available_backends():
+            pytest.skip("pybullet is not installed")
+        start = time.perf_counter()
+        world = sim.enable_physics(backend)
+        sim.physics_setup_time = time.perf_counter() - start
+        sim.dropped_parts = []
+        allure.attach(f"{world.backend}: {sim.physics_setup_time * 1e3:.2f} ms", name="physics setup",
+                      attachment_type=allure.attachment_type.TEXT)
+
+@given(parsers.parse("a part with half size {half:g} is dropped from [{x:g}, {y:g}, {z:g}]"))
+def drop_part(sim, half, x, y, z):
+    with allure.step(f"Given a part with half size {half} is dropped from [{x}, {y}, {z}]"):
+        sim.dropped_parts.append(sim.physics.add_body(box((half, half, half), mass=0.2), (x, y, z)))
+
 # --- WHEN steps ---
 
 @when("the robot picks up an object")
@@ -51,6 +88,68 @@ def move_object(sim, x, y, z):
     with allure.step(f"When the robot moves the object to position [{x}, {y}, {z}]"):
         sim.move_result = sim.move_object_to(x, y, z)
 
+@when(parsers.parse("the robot reaches its arm to [{x:g}, {y:g}, {z:g}]"))
+def reach_arm(sim, x, y, z):
+    with allure.step(f"When the robot reaches its arm to [{x}, {y}, {z}]"):
+        sim.reach_result = sim.reach_arm(x, y, z)
+
+@when(parsers.parse("the robot solves IK for a {n:d} x {n2:d} x {n3:d} grid of targets in front of it"))
+def solve_ik_grid(sim, n, n2, n3):
+    with allure.step(f"When the robot solves IK for a {n} x {n2} x {n3} grid of targets in front of it"):
+        x, y, z = sim.object_position
+        axes = (np.linspace(x + 0.3, x + 0.7, n), np.linspace(y - 0.3, y + 0.3, n2),
+                np.linspace(z + 0.1, z + 0.5, n3))
+        sim.ik_targets = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        sim.ik_sweeps = [sim.solve_arm_targets(sim.ik_targets, warm_start=False)]
+        allure.attach(repr(sim.ik_sweeps[0]), name="IK sweep", attachment_type=allure.attachment_type.TEXT)
+
+@when(parsers.parse("the robot re-solves the grid shifted by {shift:g} units"))
+def resolve_ik_grid(sim, shift):
+    with allure.step(f"When the robot re-solves the grid shifted by {shift} units"):
+        sim.ik_targets = sim.ik_targets + shift
+        sim.ik_sweeps.append(sim.solve_arm_targets(sim.ik_targets))
+        allure.attach(repr(sim.ik_sweeps[-1]), name="warm IK sweep", attachment_type=allure.attachment_type.TEXT)
+
+@when(parsers.parse("the robot solves IK for {count:d} targets up to {reach:g} units away"))
+def solve_ik_scattered(sim, count, reach):
+    with allure.step(f"When the robot solves IK for {count} targets up to {reach} units away"):
+        rng = np.random.default_rng(count)
+        sim.ik_targets = sim.object_position + rng.uniform(-reach, reach, size=(count, 3))
+        sim.ik_sweeps = [sim.solve_arm_targets(sim.ik_targets, warm_start=False)]
+        allure.attach(repr(sim.ik_sweeps[0]), name="IK sweep", attachment_type=allure.attachment_type.TEXT)
+
+@when(parsers.parse("the simulation runs for {seconds:g} seconds"))
+def run_simulation(sim, seconds):
+    with allure.step(f"When the simulation runs for {seconds} seconds"):
+        stats = SimLoop(sim, tick_rate=1.0 / sim.physics.dt).run(seconds)
+        allure.attach(repr(stats), name="simulation loop", attachment_type=allure.attachment_type.TEXT)
+
+@when("the physics state is saved")
+def save_physics_state(sim):
+    with allure.step("When the physics state is saved"):
+        sim.physics_state = sim.physics.state()
+        sim.saved_positions = np.array(sim.physics.positions)
+
+@when("the saved physics state is restored")
+def restore_physics_state(sim):
+    with allure.step("When the saved physics state is restored"):
+        sim.physics.restore_state(sim.physics_state)
+
+@when(parsers.parse("another part with half size {half:g} is dropped from [{x:g}, {y:g}, {z:g}]"))
+def drop_another_part(sim, half, x, y, z):
+    with allure.step(f"When another part with half size {half} is dropped from [{x}, {y}, {z}]"):
+        sim.dropped_parts.append(sim.physics.add_body(box((half, half, half), mass=0.2), (x, y, z)))
+
+@when("the physics world is reset")
+def reset_physics(sim):
+    with allure.step("When the physics world is reset"):
+        sim.physics.reset()
+
+@when("the robot releases the object")
+def release_object(sim):
+    with allure.step("When the robot releases the object"):
+        sim.released_object = sim.release_object()
+
 # --- THEN steps ---
 
 @then(parsers.parse("the object should be at position [{x:g}, {y:g}, {z:g}]"))
@@ -63,8 +162,106 @@ def check_object_position(sim, x, y, z):
         assert sim.holding_object is True
         assert sim.move_result is True
 
+@then("the second pick should be refused")
+def check_second_pick_refused(sim):
+    with allure.step("Then the second pick should be refused"):
+        assert sim.pick_result is False
+        assert sim.holding_object is True
+
+@then(parsers.parse("the robot should still hold the object placed at [{x:g}, {y:g}, {z:g}]"))
+def check_still_held(sim, x, y, z):
+    with allure.step(f"Then the robot should still hold the object placed at [{x}, {y}, {z}]"):
+        assert sim.held_object == sim.placed_objects[(x, y, z)]
+        assert sim.objects.is_held(sim.held_object)
+
+@then(parsers.parse("the object placed at [{x:g}, {y:g}, {z:g}] should still rest there"))
+def check_still_resting(sim, x, y, z):
+    with allure.step(f"Then the object placed at [{x}, {y}, {z}] should still rest there"):
+        object_id = sim.placed_objects[(x, y, z)]
+        assert not sim.objects.is_held(object_id)
+        assert sim.objects.position(object_id) == (x, y, z)
+
+@then(parsers.parse("the cell should hold {count:d} parts with distinct ids"))
+def check_distinct_parts(sim, count):
+    with allure.step(f"Then the cell should hold {count} parts with distinct ids"):
+        ids = list(sim.placed_objects.values())
+        assert len(set(ids)) == len(ids) == count, sim.placed_objects
+        assert len(sim.objects) == count
+        for position, object_id in sim.placed_objects.items():
+            assert sim.objects.position(object_id) == position
+
 @then("the pick should fail")
 def check_pick_failed(sim):
     with allure.step("Then the pick should fail"):
         assert sim.pick_result is False
-        assert sim.holding_object is False
\ No newline at end of file
+        assert sim.holding_object is False
+
+@then(parsers.parse("the arm joints should place the gripper at [{x:g}, {y:g}, {z:g}]"))
+def check_arm_joints(sim, x, y, z):
+    with allure.step(f"Then the arm joints should place the gripper at [{x}, {y}, {z}]"):
+        assert sim.reach_result is True
+        end = sim.arm.chain.forward(sim.joint_angles) + sim.object_position
+        assert np.allclose(end, (x, y, z), atol=1e-5), f"gripper at {end.tolist()}"
+        assert np.allclose(sim.arm_position, end)
+
+@then("every target in both sweeps should be reached")
+def check_ik_sweeps(sim):
+    with allure.step("Then every target in both sweeps should be reached"):
+        for result in sim.ik_sweeps:
+            assert result.converged.all(), f"{int((~result.converged).sum())} targets not reached"
+
+@then("the shifted sweep should need fewer iterations than the first")
+def check_ik_warm_start(sim):
+    with allure.step("Then the shifted sweep should need fewer iterations than the first"):
+        cold, warm = sim.ik_sweeps
+        assert warm.iterations.sum() < cold.iterations.sum()
+
+@then("every reported IK error should match the distance from the gripper to its target")
+def check_ik_errors(sim):
+    with allure.step("Then every reported IK error should match the distance from the gripper to its target"):
+        result = sim.ik_sweeps[0]
+        end = sim.arm.chain.forward(result.q) + sim.object_position
+        distance = np.linalg.norm(end - sim.ik_targets, axis=1)
+        np.testing.assert_allclose(result.error, distance, rtol=1e-9, atol=1e-12)
+
+
+@then(parsers.parse("the robot should hold the object placed at [{x:g}, {y:g}, {z:g}]"))
+def check_held_object(sim, x, y, z):
+    with allure.step(f"Then the robot should hold the object placed at [{x}, {y}, {z}]"):
+        assert sim.pick_result is True
+        assert sim.held_object == sim.placed_objects[(x, y, z)]
+        assert sim.objects.is_held(sim.held_object)
+
+@then(parsers.parse("the released object should rest at [{x:g}, {y:g}, {z:g}]"))
+def check_released_object(sim, x, y, z):
+    with allure.step(f"Then the released object should rest at [{x}, {y}, {z}]"):
+        object_id = sim.released_object
+        assert object_id is not None and not sim.objects.is_held(object_id)
+        assert sim.holding_object is False
+        pos = sim.objects.position(object_id)
+        assert abs(pos[0] - x) < 1e-6
+        assert abs(pos[1] - y) < 1e-6
+        assert abs(pos[2] - z) < 1e-6
+
+@then(parsers.parse("the dropped parts should rest at heights {z1:g} and {z2:g}"))
+def check_dropped_parts(sim, z1, z2):
+    with allure.step(f"Then the dropped parts should rest at heights {z1} and {z2}"):
+        for body, z in zip(sim.dropped_parts, (z1, z2)):
+            assert abs(sim.physics.position(body)[2] - z) < 0.01
+            assert np.linalg.norm(sim.physics.velocity(body)) < 0.2
+
+@then("the dropped parts should be back where the state was saved")
+def check_physics_restored(sim):
+    with allure.step("Then the dropped parts should be back where the state was saved"):
+        assert np.allclose(np.asarray(sim.physics.positions), sim.saved_positions, atol=1e-9)
+
+@then("the physics world should hold only the bodies it had when the state was saved")
+def check_physics_bodies(sim):
+    with allure.step("Then the physics world should hold only the bodies it had when the state was saved"):
+        assert len(sim.physics) == len(sim.saved_positions)
+
+@then("restoring the saved physics state should be refused")
+def check_stale_state_refused(sim):
+    with allure.step("Then restoring the saved physics state should be refused"):
+        with pytest.raises(ValueError, match="reset"):
+            sim.physics.restore_state(sim.physics_state)
@@ -2,8 +2,55 @@
 import pytest
 import math
 import allure
+import numpy as np
 from pytest_bdd import scenarios, given, when, then, parsers
+from plugins.scenario_generator import generated_features
+from simulation.collision import ARM_CLEARANCE, sweep_stop_point, sweep_stop_points
+from simulation.distance_field import DistanceField
+from simulation.fuzz import fuzz_arm_stops, fuzz_boundary
+from simulation.obstacles import ObstacleWorld
+from simulation.pool import obstacle_digest
+from simulation.robot_sim import RobotSim
 scenarios('../features/safety.feature')
+# Seeded stress examples, only generated with --stress-examples
+if generated_features('safety'):
+    scenarios(*generated_features('safety'))
+
+
+def _obstacle_world(sim):
+    """The sim's ObstacleWorld, or a temporary one over a plain obstacle list."""
+    obstacles = getattr(sim, 'obstacles', [])
+    return obstacles if isinstance(obstacles, ObstacleWorld) else ObstacleWorld(obstacles)
+
+def _arm_clearance(sim, point):
+    """(index, distance) of the nearest obstacle, as far as the clearance rule needs.
+
+    With a precomputed distance field, a lower bound of at least
+    ARM_CLEARANCE already proves the point is clear (index -1); only points
+    the field cannot decide pay for an exact search.
+    """
+    world = _obstacle_world(sim)
+    field = getattr(sim, 'distance_field', None)
+    if field is not None:
+        field.sync(world)
+        bound = field.lower_bound(point)
+        if bound >= ARM_CLEARANCE:
+            return -1, bound
+    return world.nearest(point)
+
+def _scatter(world, boundary, count, seed):
+    """Add count seeded random obstacles, half in one batch and half one by one."""
+    rng = np.random.default_rng(seed)
+    min_bound, max_bound = boundary or ((0,0,0), (1,1,1))
+    points = rng.uniform(min_bound, max_bound, size=(count, 3))
+    # Keep the arm's start clear so the sweep has somewhere to go
+    points = points[np.abs(points).max(axis=1) >= 0.2]
+    world.extend(points[:count // 2])
+    for point in points[count // 2:].tolist():
+        world.append(point)
+
+# Fuzzers by the name the steps use, each taking (boundary, cases, seed, **system under test)
+FUZZERS = {"boundary attempts": fuzz_boundary, "arm sweeps": fuzz_arm_stops}
 
 # --- GIVEN steps ---
 @given(parsers.parse("a robot at position [{x:g}, {y:g}, {z:g}]"))
@@ -23,17 +70,39 @@ def multiple_obstacles(sim, x1, y1, z1, x2, y2, z2):
     with allure.step(f"Given obstacles are at [{x1}, {y1}, {z1}] and [{x2}, {y2}, {z2}]"):
         sim.obstacles = [(x1, y1, z1), (x2, y2, z2)]
 
+@given(parsers.parse("{count:d} obstacles are scattered in the cell with seed {seed:d}"))
+def scattered_obstacles(sim, count, seed):
+    with allure.step(f"Given {count} obstacles are scattered in the cell with seed {seed}"):
+        _scatter(sim.obstacles, getattr(sim, 'boundary', None), count, seed)
+
+@given(parsers.parse("a shared cell with {count:d} scattered obstacles and seed {seed:d}"))
+def shared_cell(sim, shared_cells, count, seed):
+    with allure.step(f"Given a shared cell with {count} scattered obstacles and seed {seed}"):
+        sim.shared_cell, sim.shared_cell_digest = shared_cells.restore(
+            sim, ("scattered", count, seed, sim.boundary),
+            lambda base: _scatter(base.obstacles, base.boundary, count, seed))
+        sim.shared_cell_size = sim.shared_cell.obstacle_count
+
+@given(parsers.parse("a distance field is precomputed at resolution {resolution:g}"))
+def precompute_distance_field(sim, resolution):
+    with allure.step(f"Given a distance field is precomputed at resolution {resolution}"):
+        needed = DistanceField.estimate_bytes(sim.boundary, resolution)
+        allure.attach(f"{needed:,} bytes", name="distance field memory estimate",
+                      attachment_type=allure.attachment_type.TEXT)
+        sim.precompute_distance_field(resolution)
+
+@given("the arm stop rule only keeps half the clearance")
+def half_clearance_stop_rule(sim):
+    with allure.step("Given the arm stop rule only keeps half the clearance"):
+        # Deliberately broken rule, for checking that the fuzzer catches and shrinks it
+        sim.fuzz_target = {"stop": lambda starts, ends, centers, present:
+                           sweep_stop_points(starts, ends, centers, present, ARM_CLEARANCE / 2)}
+
 # --- WHEN steps ---
 @when(parsers.parse("the robot attempts to move to [{x:g}, {y:g}, {z:g}]"))
 def robot_attempt_move(sim, x, y, z):
     with allure.step(f"When the robot attempts to move to [{x}, {y}, {z}]"):
-        min_bound, max_bound = getattr(sim, 'boundary', ((0,0,0), (1,1,1)))
-        new_pos = (
-            max(min(x, max_bound[0]), min_bound[0]),
-            max(min(y, max_bound[1]), min_bound[1]),
-            max(min(z, max_bound[2]), min_bound[2]),
-        )
-        sim.object_position = list(new_pos)
+        sim.attempt_move(x, y, z)
 
 @when(parsers.parse("the robot moves its arm to [{x:g}, {y:g}, {z:g}]"))
 def robot_move_arm(sim, x, y, z):
@@ -42,27 +111,25 @@ def robot_move_arm(sim, x, y, z):
             sim.arm_position = list(sim.object_position)
 
         target = [x, y, z]
-        step_count = 50
-        for i in range(1, step_count + 1):
-            intermediate = [
-                sim.arm_position[j] + (target[j] - sim.arm_position[j]) * i / step_count
-                for j in range(3)
-            ]
-            collision = False
-            for obs in getattr(sim, 'obstacles', []):
-                # check if arm is within 0.1 units in all axes (3D proximity)
-                if all(abs(intermediate[j] - obs[j]) < 0.1 for j in range(3)):
-                    collision = True
-                    break
-            if collision:
-                break
-            sim.arm_position = intermediate
+        sim.arm_start, sim.arm_target = list(sim.arm_position), target
+        # Exact first contact along the straight sweep (broad phase + slab test)
+        stop, _ = _obstacle_world(sim).stop_point(sim.arm_position, target)
+        sim.arm_position = list(stop)
+
+@when(parsers.parse("{cases:d} fuzzed {kind} run with seed {seed:d}"))
+def run_fuzzer(sim, cases, kind, seed):
+    with allure.step(f"When {cases} fuzzed {kind} run with seed {seed}"):
+        report = FUZZERS[kind](sim.boundary, cases, seed=seed, **getattr(sim, 'fuzz_target', {}))
+        allure.attach(repr(report), name="fuzz report", attachment_type=allure.attachment_type.TEXT)
+        # Throughput is reported, not asserted: it depends on the machine (see benchmarks/suite.py)
+        allure.dynamic.parameter("fuzz cases/sec", round(report.cases_per_sec), excluded=True)
+        sim.fuzz_report = report
 
 # --- THEN steps ---
 @then("the robot should remain within boundaries")
 def check_boundary(sim):
     with allure.step("Then the robot should remain within boundaries"):
-        min_bound, max_bound = getattr(sim, 'boundary', ((0,0,0), (1,1,1)))
+        min_bound, max_bound = getattr(sim, 'boundary', None) or ((0,0,0), (1,1,1))
         x, y, z = sim.object_position
         assert min_bound[0] <= x <= max_bound[0]
         assert min_bound[1] <= y <= max_bound[1]
@@ -72,16 +139,71 @@ def check_boundary(sim):
 def check_arm_collision(sim):
     with allure.step("Then the robot arm should stop before the obstacle"):
         arm_pos = getattr(sim, 'arm_position', sim.object_position)
-        for obs in getattr(sim, 'obstacles', []):
-            dist = math.sqrt(sum((a - o)**2 for a, o in zip(arm_pos, obs)))
-            assert dist >= 0.1, f"Arm at {arm_pos} overlaps obstacle at {obs}"
+        index, dist = _arm_clearance(sim, arm_pos)
+        assert dist >= 0.1, f"Arm at {arm_pos} overlaps obstacle at {sim.obstacles[index]}"
 
 @then("the robot arm should stop before the nearest obstacle")
 def check_arm_collision_nearest(sim):
     with allure.step("Then the robot arm should stop before the nearest obstacle"):
         arm_pos = getattr(sim, 'arm_position', sim.object_position)
-        min_dist = min(
-            math.sqrt(sum((a - o)**2 for a, o in zip(arm_pos, obs)))
-            for obs in getattr(sim, 'obstacles', [])
-        )
-        assert min_dist >= 0.1, f"Arm at {arm_pos} overlaps nearest obstacle"
\ No newline at end of file
+        _, min_dist = _arm_clearance(sim, arm_pos)
+        assert min_dist >= 0.1, f"Arm at {arm_pos} overlaps nearest obstacle"
+
+@then(parsers.parse("the robot arm should stop at [{x:g}, {y:g}, {z:g}]"))
+def check_arm_stop_point(sim, x, y, z):
+    with allure.step(f"Then the robot arm should stop at [{x}, {y}, {z}]"):
+        arm_pos = sim.arm_position
+        tol = 1e-6
+        assert abs(arm_pos[0] - x) < tol, f"x={arm_pos[0]} != {x}"
+        assert abs(arm_pos[1] - y) < tol, f"y={arm_pos[1]} != {y}"
+        assert abs(arm_pos[2] - z) < tol, f"z={arm_pos[2]} != {z}"
+
+
+@then("the arm stop point should match a brute-force check of every obstacle")
+def check_arm_stop_brute_force(sim):
+    with allure.step("Then the arm stop point should match a brute-force check of every obstacle"):
+        target = sim.arm_target
+        expected, _ = sweep_stop_point(sim.arm_start, target, list(sim.obstacles))
+        for got, want in zip(sim.arm_position, expected):
+            assert abs(got - want) < 1e-9
+
+
+@then("the shared cell should be unchanged by the example")
+def check_shared_cell_unchanged(sim):
+    with allure.step("Then the shared cell should be unchanged by the example"):
+        # The snapshot still holds what was built, and the example's fork built on top of it
+        assert obstacle_digest(RobotSim.from_snapshot(sim.shared_cell).obstacles) == sim.shared_cell_digest
+        assert len(sim.obstacles) > sim.shared_cell_size
+        assert obstacle_digest(sim.obstacles, sim.shared_cell_size) == sim.shared_cell_digest
+
+
+@then(parsers.parse("the distance field should bound the exact clearance at {count:d} random points"))
+def check_distance_field_bounds(sim, count):
+    with allure.step(f"Then the distance field should bound the exact clearance at {count} random points"):
+        field = sim.distance_field
+        field.sync(sim.obstacles)
+        rng = np.random.default_rng(count)
+        points = rng.uniform(*sim.boundary, size=(count, 3))
+        exact = np.array([sim.obstacles.nearest(p)[1] for p in points])
+        estimate, bound = field.lookup(points)
+        # Distance is 1-Lipschitz, so interpolating a cell is off by at most its diagonal
+        assert (bound <= exact + 1e-12).all()
+        assert (np.abs(estimate - exact) <= field.resolution * math.sqrt(3)).all()
+
+
+@then("no fuzzed case should violate a safety invariant")
+def check_fuzz_clean(sim):
+    with allure.step("Then no fuzzed case should violate a safety invariant"):
+        report = sim.fuzz_report
+        assert report.ok, repr(report)
+        assert report.discarded < report.cases / 2, f"Too few cases checked: {report!r}"
+
+
+@then(parsers.parse('the fuzzer should report a "{invariant}" counterexample shrunk to {count:d} obstacle'))
+def check_fuzz_counterexample(sim, invariant, count):
+    with allure.step(f'Then the fuzzer should report a "{invariant}" counterexample shrunk to {count} obstacle'):
+        report = sim.fuzz_report
+        found = [c for c in report.counterexamples if c.invariant == invariant]
+        assert found, repr(report)
+        assert len(found[0].case["obstacles"]) == count, repr(found[0])
+        assert found[0].shrink_steps > 0, repr(found[0])
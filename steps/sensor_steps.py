@@ -1,7 +1,12 @@
 # File: steps/sensor_steps.py
 import pytest
 import allure
+import numpy as np
 from pytest_bdd import scenarios, given, when, then, parsers
+from simulation.sensors import Sensor, KalmanFilter, BatchKalmanFilter, KalmanFilterND
+from simulation.pipeline import Pipeline, SensorStage, FilterStage, read_chunks
+from simulation.sensor_log import SensorLog, SensorLogWriter
+from simulation.spatial import SpatialHash
 scenarios('../features/sensors.feature')
 
 # --- GIVEN steps ---
@@ -18,6 +23,8 @@ def sensor_with_range(sim, range):
         sim.sensor_range = range
         sim.sensor_position = (0.0, 0.0, 0.0)  # assume sensor at origin
         sim.objects_in_environment = []
+        # Grid cells the size of the range keep a scan to at most 27 cells
+        sim.object_index = SpatialHash(cell_size=range if range > 0 else 1.0)
 
 @given(parsers.re(
     r'an object is placed at \[\s*(?P<x>-?\d*\.?\d+),\s*(?P<y>-?\d*\.?\d+),\s*(?P<z>-?\d*\.?\d+)\s*\]'
@@ -26,37 +33,165 @@ def place_object(sim, x, y, z):
     x, y, z = float(x), float(y), float(z)
     with allure.step(f"Given an object is placed at [{x}, {y}, {z}]"):
         sim.objects_in_environment.append((x, y, z))
+        if hasattr(sim, "object_index"):
+            sim.object_index.insert(len(sim.objects_in_environment) - 1, (x, y, z))
         sim.current_object_position = (x, y, z)  # track for THEN steps
 
+@given(parsers.parse("a batch Kalman filter with {channels:d} channels"))
+def batch_kalman_filter(sim, channels):
+    with allure.step(f"Given a batch Kalman filter with {channels} channels"):
+        sim.batch_filter = BatchKalmanFilter(channels)
+
+@given(parsers.parse("a recorded trace of {samples:d} noisy readings of value {value:g}"))
+def recorded_trace(sim, samples, value):
+    with allure.step(f"Given a recorded trace of {samples} noisy readings of value {value}"):
+        sensor = Sensor(noise=0.1)
+        sim.recorded_trace = [sensor.read(value) for _ in range(samples)]
+
+@given(parsers.parse("two sensors with noise {noise:g} and seed {seed:d}"))
+def seeded_sensors(sim, noise, seed):
+    with allure.step(f"Given two sensors with noise {noise} and seed {seed}"):
+        sim.sensor_noise = noise
+        sim.sensor_seed = seed
+
+@given(parsers.parse("a trace file of {samples:d} true readings of value {value:g}"))
+def trace_file(sim, tmp_path, samples, value):
+    with allure.step(f"Given a trace file of {samples} true readings of value {value}"):
+        sim.trace_path = tmp_path / "trace.f64"
+        np.full(samples, value, dtype="<f8").tofile(sim.trace_path)
+
+@given(parsers.parse("a sensor log recording {samples:d} readings on {channels:d} channels at 1 kHz"))
+def sensor_log(sim, tmp_path, samples, channels):
+    with allure.step(f"Given a sensor log recording {samples} readings on {channels} channels at 1 kHz"):
+        # Channel c measures the constant value c. Samples are interleaved in
+        # time order; the first one goes through append(), the rest in bulk.
+        sim.log_path = tmp_path / "sensors.rbslog"
+        sensor = Sensor(noise=0.1, seed=3)
+        timestamps = np.repeat(np.arange(samples) * 1e-3, channels)
+        channel_ids = np.tile(np.arange(channels), samples)
+        readings = sensor.read_many(channel_ids)
+        with SensorLogWriter(sim.log_path) as writer:
+            writer.append(timestamps[0], channel_ids[0], readings[0])
+            writer.extend(timestamps[1:], channel_ids[1:], readings[1:])
+
+@given(parsers.parse("the log ends in a record torn {kept:d} bytes into writing"))
+def tear_log_tail(sim, kept):
+    with allure.step(f"Given the log ends in a record torn {kept} bytes into writing"):
+        sim.log_intact = np.array(SensorLog(sim.log_path).records)
+        with open(sim.log_path, "ab") as f:
+            f.write(b"\xff" * kept)
+
+@given(parsers.parse("{count:d} objects are scattered within {extent:g} units of the sensor"))
+def scatter_objects(sim, count, extent):
+    with allure.step(f"Given {count} objects are scattered within {extent} units of the sensor"):
+        rng = np.random.default_rng(count)
+        for point in rng.uniform(-extent, extent, size=(count, 3)).tolist():
+            sim.objects_in_environment.append(tuple(point))
+            sim.object_index.insert(len(sim.objects_in_environment) - 1, point)
+
+@given(parsers.parse("the last {removed:d} objects are removed from the environment"))
+def remove_objects(sim, removed):
+    with allure.step(f"Given the last {removed} objects are removed from the environment"):
+        for _ in range(removed):
+            sim.object_index.remove(len(sim.objects_in_environment) - 1)
+            sim.objects_in_environment.pop()
+
 # --- WHEN steps ---
 @when(parsers.parse("noisy measurements of position [{true_x:g}, {true_y:g}, {true_z:g}] are applied"))
 def apply_noisy_measurements(sim, true_x, true_y, true_z):
     with allure.step(f"When noisy measurements of position [{true_x}, {true_y}, {true_z}] are applied"):
         sim.kalman_true_position = (true_x, true_y, true_z)
-        # Simulate Kalman filter convergence with multiple iterations
+        sensor = Sensor(noise=0.01)
+        # Constant-velocity filter over x/y/z, fed 20 noisy position readings
+        kf = KalmanFilterND.constant_velocity(dims=3, measurement_variance=sensor.noise ** 2)
         for i in range(20):
-            est = sim.kalman_estimate
-            meas = sim.kalman_true_position
-            # Simple convergence: weighted average
-            sim.kalman_estimate = [
-                est[0] + 0.3 * (meas[0] - est[0]),
-                est[1] + 0.3 * (meas[1] - est[1]),
-                est[2] + 0.3 * (meas[2] - est[2])
-            ]
+            kf.update([sensor.read(v) for v in sim.kalman_true_position])
+        sim.kalman_estimate = kf.measured_estimate.tolist()
 
 @when("the sensor scans")
 def sensor_scan(sim):
     with allure.step("When the sensor scans"):
         sim.detected_objects = []
         sensor_pos = getattr(sim, "sensor_position", (0.0, 0.0, 0.0))
-        for obj in getattr(sim, "objects_in_environment", []):
+        sensor_range = getattr(sim, "sensor_range", 1.0)
+        objects = getattr(sim, "objects_in_environment", [])
+        index = getattr(sim, "object_index", None)
+        if index is not None:
+            hits = sorted(index.query_radius(sensor_pos, sensor_range))
+            sim.detected_objects = [objects[i] for i in hits]
+            return
+        range_sq = sensor_range ** 2
+        for obj in objects:
             dx = obj[0] - sensor_pos[0]
             dy = obj[1] - sensor_pos[1]
             dz = obj[2] - sensor_pos[2]
-            distance = (dx**2 + dy**2 + dz**2) ** 0.5
-            if distance <= getattr(sim, "sensor_range", 1.0):
+            if dx * dx + dy * dy + dz * dz <= range_sq:
                 sim.detected_objects.append(obj)
 
+@when(parsers.parse("{samples:d} noisy samples per channel are applied to the batch filter"))
+def apply_batch_samples(sim, samples):
+    with allure.step(f"When {samples} noisy samples per channel are applied to the batch filter"):
+        sensor = Sensor(noise=0.1)
+        channels = sim.batch_filter.channels
+        sim.batch_samples = [
+            [sensor.read(float(c)) for c in range(channels)]
+            for _ in range(samples)
+        ]
+        sim.batch_estimates = sim.batch_filter.update_block(sim.batch_samples)
+
+@when("the trace is replayed through the Kalman filter in bulk")
+def replay_trace(sim):
+    with allure.step("When the trace is replayed through the Kalman filter in bulk"):
+        sim.replay_filter = KalmanFilter()
+        sim.replay_estimates = sim.replay_filter.filter(sim.recorded_trace)
+
+@when(parsers.parse("each sensor reads {samples:d} samples of value {value:g} using {mode} reads"))
+def seeded_sensor_reads(sim, samples, value, mode):
+    with allure.step(f"When each sensor reads {samples} samples of value {value} using {mode} reads"):
+        sim.sensor_readings = []
+        for _ in range(2):
+            if mode == "bulk":
+                sensor = Sensor(noise=sim.sensor_noise, seed=sim.sensor_seed)
+                readings = sensor.read_many([value] * samples).tolist()
+            elif mode in ("per-sample", "buffered"):
+                buffer_size = 256 if mode == "buffered" else 0
+                sensor = Sensor(noise=sim.sensor_noise, seed=sim.sensor_seed, buffer_size=buffer_size)
+                readings = [sensor.read(value) for _ in range(samples)]
+            else:
+                raise ValueError(f"Unknown read mode: {mode}")
+            sim.sensor_readings.append(readings)
+
+@when(parsers.parse("the trace file is streamed through a seeded sensor and Kalman filter in chunks of {chunk:d} samples"))
+def stream_trace_file(sim, chunk):
+    with allure.step(f"When the trace file is streamed through a seeded sensor and Kalman filter in chunks of {chunk} samples"):
+        sim.pipeline = Pipeline(read_chunks(sim.trace_path, chunk_size=chunk))
+        sim.pipeline.add(SensorStage(Sensor(noise=0.1, seed=1)))
+        sim.pipeline.add(FilterStage(KalmanFilter()))
+        sim.streamed_estimates = []
+        sim.pipeline.add(sim.streamed_estimates.append, name="sink")
+        sim.pipeline.run()
+
+@when(parsers.parse("channel {channel:d} is replayed from the log between {start:g} and {end:g} seconds"))
+def replay_log_channel(sim, channel, start, end):
+    with allure.step(f"When channel {channel} is replayed from the log between {start} and {end} seconds"):
+        sim.sensor_log = SensorLog(sim.log_path)
+        # Start well away from the recorded value so convergence has to come from the data
+        sim.replay_start = float(channel) + 10.0
+        sim.replay_filter = KalmanFilter(initial_estimate=sim.replay_start)
+        sim.replay_estimates = sim.replay_filter.filter(sim.sensor_log.channel(channel, start, end))
+
+@when(parsers.parse("{count:d} more readings are appended to the log"))
+def append_to_log(sim, count):
+    with allure.step(f"When {count} more readings are appended to the log"):
+        start = float(sim.log_intact["timestamp"][-1]) + 1e-3 if len(sim.log_intact) else 0.0
+        sim.log_appended = np.empty(count, dtype=sim.log_intact.dtype)
+        sim.log_appended["timestamp"] = start + np.arange(count) * 1e-3
+        sim.log_appended["channel"] = 1
+        sim.log_appended["value"] = 42.0 + np.arange(count)
+        with SensorLogWriter(sim.log_path) as writer:
+            for record in sim.log_appended.tolist():
+                writer.append(*record)
+
 # --- THEN steps ---
 @then(parsers.parse("the filter's estimate should converge approximately to [{x:g}, {y:g}, {z:g}]"))
 def check_kalman_estimate(sim, x, y, z):
@@ -77,4 +212,93 @@ def sensor_detects(sim):
 def sensor_not_detected(sim):
     with allure.step("Then the object should not be detected"):
         obj = getattr(sim, "current_object_position", None)
-        assert obj not in getattr(sim, "detected_objects", [])
\ No newline at end of file
+        assert obj not in getattr(sim, "detected_objects", [])
+
+@then("every channel should match a scalar Kalman filter fed the same samples")
+def check_batch_parity(sim):
+    with allure.step("Then every channel should match a scalar Kalman filter fed the same samples"):
+        for c in range(sim.batch_filter.channels):
+            scalar = KalmanFilter()
+            for t, row in enumerate(sim.batch_samples):
+                expected = scalar.update(row[c])
+                assert abs(sim.batch_estimates[t][c] - expected) <= 1e-12
+            assert abs(sim.batch_filter.error_estimate[c] - scalar.error_estimate) <= 1e-12
+
+
+@then("the bulk estimates should match per-sample updates")
+def check_replay_parity(sim):
+    with allure.step("Then the bulk estimates should match per-sample updates"):
+        reference = KalmanFilter()
+        for got, measurement in zip(sim.replay_estimates, sim.recorded_trace):
+            assert abs(got - reference.update(measurement)) <= 1e-9
+        assert abs(sim.replay_filter.estimate - reference.estimate) <= 1e-9
+        assert abs(sim.replay_filter.error_estimate - reference.error_estimate) <= 1e-12
+
+@then(parsers.parse("the steady-state filter's estimate should converge approximately to {value:g}"))
+def check_steady_state_estimate(sim, value):
+    with allure.step(f"Then the steady-state filter's estimate should converge approximately to {value}"):
+        kf = KalmanFilter(initial_estimate=sim.recorded_trace[0], steady_state=True)
+        estimates = kf.filter(sim.recorded_trace)
+        assert abs(estimates[-1] - value) <= 0.1
+
+@then("both sensors should report identical readings")
+def check_identical_readings(sim):
+    with allure.step("Then both sensors should report identical readings"):
+        first, second = sim.sensor_readings
+        assert first == second
+
+@then(parsers.parse("the mean reading should be approximately {value:g}"))
+def check_mean_reading(sim, value):
+    with allure.step(f"Then the mean reading should be approximately {value}"):
+        readings = sim.sensor_readings[0]
+        assert abs(sum(readings) / len(readings) - value) <= 0.01
+
+@then("the streamed estimates should match filtering the whole trace at once")
+def check_streamed_estimates(sim):
+    with allure.step("Then the streamed estimates should match filtering the whole trace at once"):
+        true_values = np.fromfile(sim.trace_path, dtype="<f8")
+        readings = Sensor(noise=0.1, seed=1).read_many(true_values)
+        expected = KalmanFilter().filter(readings)
+        streamed = np.concatenate(sim.streamed_estimates)
+        assert streamed.shape == expected.shape
+        assert np.abs(streamed - expected).max() <= 1e-9
+
+@then("every pipeline stage should report its throughput")
+def check_pipeline_stats(sim):
+    with allure.step("Then every pipeline stage should report its throughput"):
+        allure.attach(sim.pipeline.report(), name="pipeline stats", attachment_type=allure.attachment_type.TEXT)
+        total = sim.pipeline.stats[0].items
+        for stats in sim.pipeline.stats:
+            assert stats.items == total
+            assert stats.throughput > 0
+
+@then("the log should be read without copying the recorded data")
+def check_log_memmap(sim):
+    with allure.step("Then the log should be read without copying the recorded data"):
+        assert isinstance(sim.sensor_log.records, np.memmap)
+        assert np.shares_memory(sim.sensor_log.values, sim.sensor_log.records)
+
+@then(parsers.parse("the replayed estimate should converge approximately to {value:g}"))
+def check_replayed_estimate(sim, value):
+    with allure.step(f"Then the replayed estimate should converge approximately to {value}"):
+        assert sim.replay_estimates.size > 0
+        assert abs(sim.replay_start - value) > 1.0
+        assert abs(sim.replay_filter.estimate - value) <= 0.05
+
+@then("the log should read back the intact records followed by the appended ones")
+def check_log_after_torn_tail(sim):
+    with allure.step("Then the log should read back the intact records followed by the appended ones"):
+        records = SensorLog(sim.log_path).records
+        intact = len(sim.log_intact)
+        assert len(records) == intact + len(sim.log_appended)
+        assert np.array_equal(records[:intact], sim.log_intact)
+        assert np.array_equal(records[intact:], sim.log_appended)
+
+@then("exactly the objects within range should be detected")
+def check_detected_exactly(sim):
+    with allure.step("Then exactly the objects within range should be detected"):
+        expected = [
+            obj for obj in sim.objects_in_environment
+            if sum((o - p) ** 2 for o, p in zip(obj, sim.sensor_position)) <= sim.sensor_range ** 2
+        ]
+        assert sim.detected_objects == expected
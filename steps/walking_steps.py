@@ -1,16 +1,13 @@
 # steps/walking_steps.py
 import pytest
 import allure
+import numpy as np
 from pytest_bdd import scenarios, given, when, then, parsers
-from simulation.robot_sim import RobotSim
+from simulation.fleet import RobotFleet
+from simulation.sim_loop import SimLoop
 scenarios('../features/walking.feature')
 
 
-# --- Fixture for robot simulation ---\
-@pytest.fixture
-def sim():
-    return RobotSim(gui=False)
-
 # --- GIVEN steps ---
 @given(parsers.parse("a robot at position [{x:d}, {y:d}, {z:d}]"))
 def robot_at_position(sim, x, y, z):
@@ -18,6 +15,14 @@ def robot_at_position(sim, x, y, z):
         sim.set_position(x, y, z)
     return sim
 
+@given(parsers.parse("a fleet of {robots:d} robots at position [{x:d}, {y:d}, {z:d}] bounded by [{max_x:d}, {max_y:d}, {max_z:d}]"))
+def robot_fleet(sim, robots, x, y, z, max_x, max_y, max_z):
+    with allure.step(f"Given a fleet of {robots} robots at position [{x}, {y}, {z}] bounded by [{max_x}, {max_y}, {max_z}]"):
+        sim.fleet = RobotFleet(robots, boundary=((0, 0, 0), (max_x, max_y, max_z)))
+        sim.fleet.set_positions((x, y, z))
+        sim.fleet_selection = np.arange(robots) % 2 == 0
+    return sim
+
 # --- WHEN steps ---
 @when("the robot starts walking")
 def robot_starts_walking(sim):
@@ -36,6 +41,27 @@ def walk_forward(sim, distance):
         x, y, z = sim.object_position
         sim.object_position = (x, y + distance, z)
 
+@when(parsers.parse("the robot walks forward by {distance:g} units at {speed:g} units per second"))
+def walk_forward_timed(sim, distance, speed):
+    with allure.step(f"When the robot walks forward by {distance} units at {speed} units per second"):
+        sim.start_walking()
+        start_time = sim.sim_time
+        loop = SimLoop(sim, tick_rate=sim.tick_rate)
+        stats = loop.move((0.0, speed, 0.0), distance / speed)
+        sim.walk_duration = sim.sim_time - start_time
+        allure.attach(repr(stats), name="sim loop stats", attachment_type=allure.attachment_type.TEXT)
+
+@when("the fleet starts walking")
+def fleet_starts_walking(sim):
+    with allure.step("When the fleet starts walking"):
+        sim.fleet.start_walking()
+
+@when(parsers.parse("every second robot walks forward by {distance:d} units for {ticks:d} ticks"))
+def fleet_walk_forward(sim, distance, ticks):
+    with allure.step(f"When every second robot walks forward by {distance} units for {ticks} ticks"):
+        for _ in range(ticks):
+            sim.fleet.move_forward(distance, mask=sim.fleet_selection)
+
 # --- THEN steps ---
 @then("the robot should be walking")
 def check_robot_walking(sim):
@@ -51,4 +77,33 @@ def check_robot_crouched(sim):
 def check_robot_position(sim, x, y, z):
     with allure.step(f"Then the robot should be at position [{x}, {y}, {z}]"):
         pos = sim.object_position
-        assert pos == (x, y, z)
\ No newline at end of file
+        assert pos == (x, y, z)
+
+@then("every robot in the fleet should be walking")
+def check_fleet_walking(sim):
+    with allure.step("Then every robot in the fleet should be walking"):
+        assert sim.fleet.walking.all()
+
+@then(parsers.parse("every second robot should be at position [{x:d}, {y:d}, {z:d}]"))
+def check_selected_fleet_position(sim, x, y, z):
+    with allure.step(f"Then every second robot should be at position [{x}, {y}, {z}]"):
+        assert (sim.fleet.positions[sim.fleet_selection] == (x, y, z)).all()
+
+@then(parsers.parse("the other robots should be at position [{x:d}, {y:d}, {z:d}]"))
+def check_other_fleet_position(sim, x, y, z):
+    with allure.step(f"Then the other robots should be at position [{x}, {y}, {z}]"):
+        assert (sim.fleet.positions[~sim.fleet_selection] == (x, y, z)).all()
+
+@then(parsers.parse("the robot should be approximately at position [{x:g}, {y:g}, {z:g}]"))
+def check_robot_position_approx(sim, x, y, z):
+    with allure.step(f"Then the robot should be approximately at position [{x}, {y}, {z}]"):
+        pos = sim.object_position
+        tol = 1e-6
+        assert abs(pos[0] - x) < tol, f"x={pos[0]} != {x}"
+        assert abs(pos[1] - y) < tol, f"y={pos[1]} != {y}"
+        assert abs(pos[2] - z) < tol, f"z={pos[2]} != {z}"
+
+@then(parsers.parse("the walk should take {seconds:g} seconds of simulated time"))
+def check_walk_duration(sim, seconds):
+    with allure.step(f"Then the walk should take {seconds} seconds of simulated time"):
+        assert abs(sim.walk_duration - seconds) < 1e-6
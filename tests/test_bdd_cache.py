@@ -0,0 +1,195 @@
+# tests/test_bdd_cache.py
+"""Tests for the pytest-bdd collection cache (plugins/bdd_cache.py).
+
+Whole pytest runs go through a subprocess: the plugin patches pytest-bdd
+module globals, which an in-process inner run would share with this one.
+"""
+import os
+
+import pytest
+from pytest_bdd import parsers
+from pytest_bdd.steps import StepFunctionContext, step_function_context_registry
+
+from plugins import bdd_cache
+
+pytest_plugins = ["pytester"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURE = """\
+Feature: Widgets
+  Scenario: Counting widgets
+    Given the workshop has 3 widgets
+    When go 2
+    Then 5 widgets are counted
+"""
+
+SECOND_SCENARIO = """
+  Scenario: Counting more widgets
+    Given the workshop has 4 widgets
+    When go 4
+    Then 8 widgets are counted
+"""
+
+STEPS = """\
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+scenarios("widgets.feature")
+
+
+@pytest.fixture
+def counter():
+    return {}
+
+
+@given(parsers.parse("the workshop has {n:d} widgets"))
+def workshop(counter, n):
+    counter["n"] = n
+
+
+@when(parsers.parse("go {n:d}"))
+def go(counter, n):
+    counter["n"] += n
+
+
+@then(parsers.re(r"(?P<n>\\d+) widgets are counted"))
+def counted(counter, n):
+    assert counter["n"] == int(n)
+"""
+
+STOCK = """\
+import importlib
+
+from pytest_bdd.parser import FeatureParser
+
+
+def test_stock_pytest_bdd():
+    feature = importlib.import_module("pytest_bdd.feature")
+    scenario = importlib.import_module("pytest_bdd.scenario")
+    assert feature.FeatureParser is FeatureParser
+    assert scenario.find_fixturedefs_for_step.__module__ == "pytest_bdd.scenario"
+"""
+
+
+@pytest.fixture
+def widgets(pytester, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", ROOT)
+    pytester.makefile(".feature", widgets=FEATURE)
+    pytester.makepyfile(test_widgets=STEPS)
+    return pytester
+
+
+def run(pytester, *args):
+    return pytester.runpytest_subprocess("-p", "plugins.bdd_cache", *args)
+
+
+# -------------------------
+# Whole runs
+# -------------------------
+def test_second_run_loads_features_from_cache(widgets):
+    first = run(widgets)
+    first.assert_outcomes(passed=1)
+    first.stdout.fnmatch_lines(["bdd cache: 1 feature files (0 from cache, 1 parsed)*"])
+
+    second = run(widgets)
+    second.assert_outcomes(passed=1)
+    second.stdout.fnmatch_lines(["bdd cache: 1 feature files (1 from cache, 0 parsed)*"])
+
+
+def test_changed_feature_is_parsed_again(widgets):
+    run(widgets).assert_outcomes(passed=1)
+    widgets.makefile(".feature", widgets=FEATURE + SECOND_SCENARIO)
+
+    result = run(widgets)
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["bdd cache: 1 feature files (0 from cache, 1 parsed)*"])
+
+
+def test_steps_resolve_through_the_index(widgets):
+    result = run(widgets)
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["bdd step matcher: 3 steps resolved, 0 from the binding cache, *"])
+
+
+def test_no_bdd_cache_restores_stock_behaviour(widgets):
+    widgets.makepyfile(test_stock=STOCK)
+    result = run(widgets, "--no-bdd-cache")
+    result.assert_outcomes(passed=2)
+    result.stdout.no_fnmatch_line("bdd cache:*")
+    result.stdout.no_fnmatch_line("bdd step matcher:*")
+
+
+# -------------------------
+# Prefix index
+# -------------------------
+class FixtureDef:
+    def __init__(self, func):
+        self.func = func
+
+
+class FixtureManager:
+    def __init__(self):
+        self._arg2fixturedefs = {}
+
+
+class Step:
+    def __init__(self, type_, name):
+        self.type = type_
+        self.name = name
+
+
+def define(fixturemanager, step_type, parser):
+    """Register a step definition the way pytest-bdd's decorators do."""
+    def step_func():
+        pass
+
+    def fixture():
+        pass
+
+    step_function_context_registry[fixture] = StepFunctionContext(
+        type=step_type, step_func=step_func, parser=parser)
+    fixturedef = FixtureDef(fixture)
+    fixturemanager._arg2fixturedefs.setdefault(parser.name, []).append(fixturedef)
+    return fixturedef
+
+
+@pytest.mark.parametrize("parser, prefix", [
+    (parsers.string("the arm is parked"), "the arm is parked"),
+    (parsers.parse("the arm moves {mm:d} mm"), "the arm moves "),
+    (parsers.re(r"^the arm moves (?P<mm>\d+) mm"), "the arm moves "),
+    (parsers.re(r"the arms? moves"), "the arm"),
+    (parsers.re(r"the arm (moves|stops)"), ""),
+])
+def test_literal_prefix(parser, prefix):
+    assert bdd_cache.literal_prefix(parser) == prefix
+
+
+def test_long_prefixes_are_bucketed_and_the_rest_are_short(monkeypatch):
+    # Keep these lookups out of the matcher line of the run reporting them
+    monkeypatch.setattr(bdd_cache, "stats", bdd_cache.CacheStats())
+    fixturemanager = FixtureManager()
+    moves = define(fixturemanager, "when", parsers.parse("the arm moves {mm:d} mm"))
+    go = define(fixturemanager, "when", parsers.parse("go {mm:d}"))
+    either = define(fixturemanager, "when", parsers.re(r"the arm (moves|stops).*"))
+
+    index = bdd_cache.StepIndex(fixturemanager)
+    assert [entry[3] for entry in index.buckets["the arm "]] == [moves]
+    assert [entry[3] for entry in index.short] == [go, either]
+
+    found = index.matching(Step("when", "the arm moves 5 mm"))
+    assert [fixturedef for _, fixturedef in found] == [moves, either]
+    assert [fixturedef for _, fixturedef in index.matching(Step("when", "go 5"))] == [go]
+    # "go" is skipped for the arm step and "the arm moves" for the go step
+    assert (bdd_cache.stats.patterns_checked, bdd_cache.stats.patterns_skipped) == (4, 2)
+
+
+def test_redefined_step_changes_the_fingerprint():
+    fixturemanager = FixtureManager()
+    define(fixturemanager, "given", parsers.string("the cell is clear"))
+    fingerprint = bdd_cache.fixture_fingerprint(fixturemanager)
+
+    # Same step text in another module: same fixture name, one more definition
+    define(fixturemanager, "given", parsers.string("the cell is clear"))
+    assert bdd_cache.fixture_fingerprint(fixturemanager) != fingerprint
+    assert len(bdd_cache.StepIndex(fixturemanager).buckets["the cell"]) == 2
@@ -0,0 +1,130 @@
+# tests/test_step_timing.py
+"""Tests for the per-step timing report (plugins/step_timing.py), one pytest subprocess per run."""
+import csv
+import json
+import os
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURE = """\
+Feature: Widgets
+  Scenario Outline: Counting widgets
+    Given the workshop has <n> widgets
+    When go 2
+    And go 1
+    Then <total> widgets are counted
+
+    Examples:
+      | n | total |
+      | 3 | 6     |
+      | 4 | 7     |
+
+  Scenario: Miscounting widgets
+    Given the workshop has 1 widgets
+    Then 5 widgets are counted
+"""
+
+STEPS = """\
+import pytest
+from pytest_bdd import given, parsers, scenarios, then, when
+
+scenarios("widgets.feature")
+
+
+@pytest.fixture
+def counter():
+    return {}
+
+
+@given(parsers.parse("the workshop has {n:d} widgets"))
+def workshop(counter, n):
+    counter["n"] = n
+
+
+@when(parsers.parse("go {n:d}"))
+def go(counter, n):
+    counter["n"] += n
+
+
+@then(parsers.parse("{n:d} widgets are counted"))
+def counted(counter, n):
+    assert counter["n"] == n
+"""
+
+
+@pytest.fixture
+def widgets(pytester, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", ROOT)
+    pytester.makefile(".feature", widgets=FEATURE)
+    pytester.makepyfile(test_widgets=STEPS)
+    return pytester
+
+
+def run(pytester, *args):
+    return pytester.runpytest_subprocess("-p", "plugins.step_timing", *args)
+
+
+def test_json_report_and_terminal_summary(widgets):
+    path = widgets.path / "timings.json"
+    result = run(widgets, f"--step-timings={path}")
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines([
+        "*step timings*",
+        "3 scenarios: * ms wall, * ms in step bodies, * ms framework overhead",
+        f"slowest step definitions (total ms / calls / max ms), written to {path}:",
+    ])
+
+    report = json.loads(path.read_text())
+    steps = {(row["keyword"], row["step"]): row for row in report["steps"]}
+    assert set(steps) == {("Given", "the workshop has {n:d} widgets"), ("When", "go {n:d}"),
+                          ("Then", "{n:d} widgets are counted")}
+    # "And go 1" counts under When
+    assert steps["When", "go {n:d}"]["calls"] == 4
+    assert steps["Then", "{n:d} widgets are counted"]["failures"] == 1
+    assert [row["total_ms"] for row in report["steps"]] == sorted(
+        (row["total_ms"] for row in report["steps"]), reverse=True)
+    assert sum(row["share"] for row in report["steps"]) == pytest.approx(1.0, abs=1e-3)
+    assert len(report["scenarios"]) == 3
+    for scenario in report["scenarios"]:
+        assert scenario["wall_ms"] >= scenario["steps_ms"] >= 0
+
+
+def test_csv_report(widgets):
+    path = widgets.path / "timings.csv"
+    run(widgets, f"--step-timings={path}").assert_outcomes(passed=2, failed=1)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert {row["keyword"] for row in rows} == {"Given", "When", "Then"}
+
+
+def test_allure_gets_a_csv_attachment_per_scenario(widgets):
+    alluredir = widgets.path / "allure-results"
+    result = run(widgets, f"--alluredir={alluredir}")
+    result.assert_outcomes(passed=2, failed=1)
+    # Allure alone adds no terminal report
+    result.stdout.no_fnmatch_line("*step timings*")
+
+    results = [json.loads(path.read_text()) for path in alluredir.glob("*-result.json")]
+    assert len(results) == 3
+    for test in results:
+        parameters = {parameter["name"]: parameter for parameter in test["parameters"]}
+        for name in ("scenario wall time (ms)", "step bodies (ms)", "framework overhead (ms)"):
+            assert parameters[name]["excluded"] is True
+        attachment, = [attachment for attachment in test["attachments"] if attachment["name"] == "step timings"]
+        assert attachment["type"] == "text/csv"
+        with open(alluredir / attachment["source"], newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == ["keyword", "step", "framework_ms", "body_ms", "failed"]
+        assert rows[0]["keyword"] == "Given"
+        assert [row["failed"] for row in rows][-1] == ("True" if test["status"] == "failed" else "False")
+
+
+def test_nothing_registered_without_options(widgets):
+    result = run(widgets)
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.no_fnmatch_line("*step timings*")